@@ -0,0 +1,15 @@
+"""
+.. module::  benchmarks
+   :synopsis:  contacts application benchmarks package.
+
+*contacts* application benchmarks package.
+
+Runs the contacts scenarios (list, detail, search, create with
+permissions, vCard import and export, admin changelist) against a
+synthetic address book in a scratch database, and reports the p50/p95
+latency, queries per operation and peak RSS growth of each as JSON.  The
+database is selected with the DB_ENGINE environment variable, see
+configs.common.database::
+
+    python -m benchmarks.run --contacts 10000 --output results.json
+"""
@@ -0,0 +1,52 @@
+"""
+.. module::  benchmarks.generator
+   :synopsis:  contacts benchmarks address book generator module.
+
+*contacts* benchmarks address book generator module.
+
+Creates contacts with the contacts test factories, each with a random,
+seeded number of emails, phones, addresses and related contacts.
+"""
+from __future__ import absolute_import
+import random
+
+import factory.random
+
+from contacts import models
+from contacts.tests import factories
+
+# Association factory classes with the mean number of instances per
+# contact.
+DEFAULT_FAN_OUT = (
+    (factories.ContactEmailModelFactory, 2),
+    (factories.ContactPhoneModelFactory, 2),
+    (factories.ContactAddressModelFactory, 1),
+)
+DEFAULT_RELATED = 1
+
+
+def _count(rng, mean):
+    """Return random count in [0, 2 * mean], of mean count."""
+    return rng.randint(0, 2 * mean)
+
+
+def generate(count, fan_out=DEFAULT_FAN_OUT, related=DEFAULT_RELATED,
+             seed=0):
+    """Create count contacts with associations, return their ids.
+
+    Related contacts are picked among the contacts created before.
+    """
+    rng = random.Random(seed)
+    factory.random.reseed_random(seed)
+    contact_ids = []
+    for _ in range(count):
+        contact = factories.ContactModelFactory()
+        for factory_class, mean in fan_out:
+            for _ in range(_count(rng, mean)):
+                factory_class(contact=contact)
+        for _ in range(_count(rng, related) if contact_ids else 0):
+            factories.RelatedContactModelFactory(
+                from_contact=contact,
+                to_contact=models.Contact(pk=rng.choice(contact_ids)))
+        contact_ids.append(contact.pk)
+    return contact_ids
@@ -0,0 +1,67 @@
+"""
+.. module::  benchmarks.measure
+   :synopsis:  contacts benchmarks measurement module.
+
+*contacts* benchmarks measurement module.
+"""
+from __future__ import absolute_import, division
+import collections
+import sys
+import timeit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+try:
+    import resource
+except ImportError:  # pragma: no cover, not available on Windows
+    resource = None
+
+
+def percentile(values, fraction):
+    """Return nearest rank percentile of values."""
+    ordered = sorted(values)
+    index = max(0, int(round(fraction * len(ordered))) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def peak_rss():
+    """Return the process peak resident set size in bytes, or None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(name, operation, iterations, cleanup=None):
+    """Run operation iterations times, return dict of its measures.
+
+    cleanup, if given, is called after each operation, outside the
+    measures.  The process peak RSS only grows, so its delta is the
+    growth of the peak during the scenario, zero if the scenario stayed
+    below the peak of the scenarios run before it; run a single scenario
+    per process for its absolute peak.
+    """
+    latencies = []
+    queries = []
+    rss_before = peak_rss()
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as context:
+            start = timeit.default_timer()
+            operation()
+            latencies.append(timeit.default_timer() - start)
+        queries.append(len(context))
+        if cleanup is not None:
+            cleanup()
+    rss_after = peak_rss()
+    return collections.OrderedDict([
+        ("scenario", name),
+        ("iterations", iterations),
+        ("p50_ms", percentile(latencies, 0.5) * 1000),
+        ("p95_ms", percentile(latencies, 0.95) * 1000),
+        ("queries_per_op", sum(queries) / len(queries)),
+        ("peak_rss_bytes", rss_after),
+        ("peak_rss_delta_bytes", (rss_after - rss_before
+                                  if rss_after is not None else None)),
+    ])
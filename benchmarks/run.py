@@ -0,0 +1,119 @@
+"""
+.. module::  benchmarks.run
+   :synopsis:  contacts benchmarks runner module.
+
+*contacts* benchmarks runner module.
+
+Creates a scratch test database, generates the address book, runs the
+scenarios and writes the results as JSON, see benchmarks package.
+"""
+from __future__ import absolute_import, print_function
+import argparse
+import collections
+import datetime
+import json
+import os
+import platform
+import sys
+import timeit
+
+DJANGO_SETTINGS_MODULE = "DJANGO_SETTINGS_MODULE"
+
+
+def parse_args(argv=None):
+    from .scenarios import SCENARIOS
+    parser = argparse.ArgumentParser(
+        description="Run the contacts benchmarks.")
+    parser.add_argument(
+        "--contacts", type=int, default=10000,
+        help="Number of contacts generated.")
+    parser.add_argument(
+        "--iterations", type=int, default=100,
+        help="Number of operations measured per scenario.")
+    parser.add_argument(
+        "--scenario", action="append", choices=SCENARIOS,
+        help="Scenario run, defaults to all.")
+    parser.add_argument(
+        "--generator", choices=("factories", "bulk"), default="factories",
+        help="Address book generator: the test factories, or the "
+             "contacts.generator bulk generator for large address books.")
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Address book generator random seed.")
+    parser.add_argument(
+        "--keepdb", action="store_true",
+        help="Keep the scratch database, and its contacts, between runs.")
+    parser.add_argument(
+        "--output",
+        help="Output file name, defaults to standard output.")
+    return parser.parse_args(argv)
+
+
+def run(args):
+    """Generate the address book, run the scenarios, return results."""
+    import django
+    from django.db import connection
+
+    from contacts import generator as bulk_generator
+    from contacts import models
+    from . import generator
+    from . import measure
+    from .scenarios import SCENARIOS, Scenarios, benchmark_user
+
+    start = timeit.default_timer()
+    contact_ids = list(models.Contact.objects.order_by(
+        "id").values_list("id", flat=True)[:args.contacts])
+    if len(contact_ids) < args.contacts:
+        generate = (bulk_generator.generate_contacts
+                    if args.generator == "bulk" else generator.generate)
+        contact_ids.extend(generate(
+            args.contacts - len(contact_ids), seed=args.seed))
+    generate_seconds = timeit.default_timer() - start
+
+    scenarios = Scenarios(contact_ids, benchmark_user(contact_ids),
+                          seed=args.seed)
+    results = []
+    for name in args.scenario or SCENARIOS:
+        operation = scenarios.operation(name)
+        results.append(measure.measure(
+            name, operation, args.iterations, scenarios.cleanup(name)))
+    return collections.OrderedDict([
+        ("timestamp", datetime.datetime.utcnow().isoformat()),
+        ("database", connection.vendor),
+        ("django", django.get_version()),
+        ("python", platform.python_version()),
+        ("contacts", len(contact_ids)),
+        ("generator", args.generator),
+        ("generate_seconds", generate_seconds),
+        ("results", results),
+    ])
+
+
+def main(argv=None):
+    os.environ.setdefault(DJANGO_SETTINGS_MODULE,
+                          "django_contacts.settings_test")
+    import django
+    django.setup()
+    from django.test.runner import DiscoverRunner
+    from django.test.utils import setup_test_environment
+
+    args = parse_args(argv)
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0, interactive=False,
+                            keepdb=args.keepdb)
+    old_config = runner.setup_databases()
+    try:
+        results = run(args)
+    finally:
+        runner.teardown_databases(old_config)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+.. module::  benchmarks.scenarios
+   :synopsis:  contacts benchmarks scenarios module.
+
+*contacts* benchmarks scenarios module.
+
+Each scenario method returns the operation measured, a callable without
+arguments, and may register a cleanup callable run after each operation,
+outside the measures.  API and admin requests are sent with the Django
+test client, authenticated as an ordinary staff user granted object
+permissions on the address book contacts, such that requests are
+filtered and authorized as in production.
+"""
+from __future__ import absolute_import
+import io
+import random
+import re
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import Client
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from contacts import models
+from contacts import vcard
+
+SCENARIOS = ("list", "detail", "search", "create_with_permissions",
+             "export_vcards", "import_vcards", "admin_changelist")
+
+EXPORT_SIZE = 1000
+USERNAME = "benchmark"
+
+_UID_PATTERN = re.compile(r"^UID[:;][^\n]*\n", re.IGNORECASE | re.MULTILINE)
+
+
+def benchmark_user(contact_ids):
+    """Return the benchmark user, granted permissions on the contacts.
+
+    The user is staff, granted the contact add, change and delete model
+    permissions and the read and write object permissions of contact ids.
+    """
+    user_model = get_user_model()
+    user = user_model.objects.filter(username=USERNAME).first() or (
+        user_model.objects.create_user(
+            USERNAME, "benchmark@example.com", "benchmark"))
+    user.is_staff, user.is_superuser = True, False
+    user.save()
+    user.user_permissions.add(*Permission.objects.filter(
+        content_type__app_label="contacts",
+        codename__in=[permission.split(".")[1] for permission in
+                      models.PERMISSIONS_CONTACT_FUNCTIONAL]))
+    granted = set(models.ContactObjectPermission.objects.filter(
+        user=user).values_list("content_object_id", "permission_id"))
+    models.ContactObjectPermission.objects.bulk_create(
+        models.ContactObjectPermission(
+            user=user, permission_id=permission_id,
+            content_object_id=contact_id)
+        for contact_id in contact_ids
+        for permission_id in models.permission_ids().values()
+        if (contact_id, permission_id) not in granted)
+    return user
+
+
+class Scenarios(object):
+    """Benchmark scenarios over the contacts with contact_ids."""
+
+    def __init__(self, contact_ids, user, seed=0):
+        self.contact_ids = contact_ids
+        self.user = user
+        self.rng = random.Random(seed)
+        self.cleanups = {}
+        self.api_client = APIClient()
+        self.api_client.force_authenticate(user)
+        self.client = Client()
+        self.client.force_login(user)
+
+    def operation(self, name):
+        return getattr(self, name)()
+
+    def cleanup(self, name):
+        """Return callable run after each name operation, or None."""
+        return self.cleanups.get(name)
+
+    def get(self, client, url, params=None):
+        """Return operation sending a get request."""
+        def operation():
+            response = client.get(url, params)
+            assert response.status_code == 200, response.status_code
+        return operation
+
+    def list(self):
+        return self.get(self.api_client, reverse("contact-list"),
+                        dict(limit=50))
+
+    def detail(self):
+        def operation():
+            url = reverse("contact-detail",
+                          kwargs=dict(pk=self.rng.choice(self.contact_ids)))
+            self.get(self.api_client, url)()
+        return operation
+
+    def search(self):
+        terms = [document.split()[0] for document in
+                 models.ContactSearchDocument.objects.filter(
+                     contact__in=self.contact_ids[:100]).values_list(
+                     "document", flat=True) if document]
+
+        def operation():
+            self.get(self.api_client, reverse("contact-search-list"),
+                     dict(q=self.rng.choice(terms)))()
+        return operation
+
+    def create_with_permissions(self):
+        names = list(models.Contact.objects.filter(
+            pk__in=self.contact_ids[:100]).values_list("name", flat=True))
+
+        def operation():
+            response = self.api_client.post(
+                reverse("contact-list"), dict(name=self.rng.choice(names)),
+                format="json")
+            assert response.status_code == 201, response.status_code
+        return operation
+
+    def export_vcards(self):
+        queryset = models.Contact.objects.filter(
+            pk__in=self.contact_ids[:EXPORT_SIZE])
+
+        def operation():
+            for _ in vcard.export_contacts(queryset):
+                pass
+        return operation
+
+    def import_vcards(self):
+        # without their uid, the exported cards import as new contacts
+        text = _UID_PATTERN.sub(u"", u"".join(vcard.export_contacts(
+            models.Contact.objects.filter(
+                pk__in=self.contact_ids[:EXPORT_SIZE]))))
+        last_id = models.Contact.objects.order_by("-id").values_list(
+            "id", flat=True).first() or 0
+
+        def operation():
+            vcard.import_contacts(io.StringIO(text), self.user)
+
+        def cleanup():
+            models.Contact.objects.filter(id__gt=last_id).delete()
+        self.cleanups["import_vcards"] = cleanup
+        return operation
+
+    def admin_changelist(self):
+        return self.get(self.client,
+                        reverse("admin:contacts_contact_changelist"))
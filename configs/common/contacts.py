@@ -0,0 +1,39 @@
+"""
+.. module::  configs.common.contacts
+   :synopsis:  Django contacts application settings file.
+
+Django contacts application settings file.
+
+"""
+from __future__ import unicode_literals
+
+# Django cache alias used as shared tier of the type cache, None for
+# process local caching only.
+CONTACTS_TYPE_CACHE = None
+# Seconds after which process local cached type instances are reloaded.
+CONTACTS_TYPE_CACHE_TIMEOUT = 60
+# Seconds change feed entries are held back so that concurrent
+# transactions commit before the feed cursor moves past their changes.
+CONTACTS_CHANGE_FEED_LAG = 5
+# Bearer token granting access to the request metrics endpoint, besides
+# staff users; None to restrict it to staff users.
+CONTACTS_METRICS_TOKEN = None
+# Django cache alias of the relationship adjacency cache, None to load
+# adjacencies from the database only.  The cache bounds memory by evicting
+# least recently used entries, see its MAX_ENTRIES option.  The local
+# memory cache below is per process, other processes see relationship
+# changes after TIMEOUT seconds: deployments running more than one
+# process should point it to a shared memcached or redis cache.
+CONTACTS_ADJACENCY_CACHE = "contacts-adjacency"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "contacts-adjacency": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "contacts-adjacency",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+}
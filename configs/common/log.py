@@ -22,6 +22,12 @@ LOG_LEVEL = (LOG_LEVEL_DEBUG
 
 mkdir(LOG_DIR)
 
+# Queries slower than CONTACTS_SLOW_QUERY_SECONDS, and SQL executed
+# CONTACTS_DUPLICATE_QUERY_COUNT or more times within a request, are logged
+# by the contacts.querylog logger; None disables the check.
+CONTACTS_SLOW_QUERY_SECONDS = 0.5
+CONTACTS_DUPLICATE_QUERY_COUNT = 10
+
 _verbose_format = ('%(levelname)s %(asctime)s' +
                    ' %(module)s %(process)d' +
                    ' %(thread)d %(message)s')
@@ -74,6 +80,11 @@ LOGGING = {
             'level': LOG_LEVEL_INFO,
             'propagate': True
         },
+        'contacts.querylog': {
+            'handlers': ['log_file'],
+            'level': LOG_LEVEL_INFO,
+            'propagate': False
+        },
         'django.request': {
             'handlers': ['mail_admins'],
             'level': LOG_LEVEL,
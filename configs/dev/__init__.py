@@ -12,6 +12,7 @@ from configs.common.log import *  # @UnusedWildImport
 from configs.common.database import *  # @UnusedWildImport
 from configs.common.permissions import *  # @UnusedWildImport
 from configs.common.rest_framework import *  # @UnusedWildImport
+from configs.common.contacts import *  # @UnusedWildImport
 
 # @TODO: revisit usage of django_extensions only in dev
 #  and not in the context of tox testing
@@ -0,0 +1,166 @@
+"""
+.. module::  contacts.adjacency
+   :synopsis:  contacts application relationship adjacency cache module.
+
+*contacts* application relationship adjacency cache module.
+
+The RelatedContact edges of a contact are kept in the Django cache named
+by CONTACTS_ADJACENCY_CACHE, as compact arrays of neighbor contact ids
+and their relationship type ids, out and in edges apart.  Entries missing
+from the cache are loaded from the database, for many contacts at once,
+and stored.  The RelatedContact signal handlers invalidate the entries of
+the contacts at both ends of a changed edge.
+
+Entries are keyed by a per contact generation token, replaced on
+invalidation, so that an entry loaded before a concurrent edge change
+and stored after its invalidation is never read.
+
+Memory is bounded by the cache backend eviction, least recently used
+entries first with memcached, redis or, since Django 2.1, the local
+memory cache MAX_ENTRIES option, and entries expire after the cache
+TIMEOUT.  A local memory cache is per process: other processes only see
+an edge change once their entries expire, use a shared cache with more
+than one process.  With CONTACTS_ADJACENCY_CACHE None, entries are
+always loaded from the database.
+"""
+from __future__ import absolute_import
+import array
+import collections
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import models
+from .graph import DIRECTION_BOTH, DIRECTION_IN, DIRECTION_OUT
+
+_KEY_PREFIX = "contacts.adjacency."
+_GENERATION_KEY_PREFIX = "contacts.adjacency.generation."
+
+# Contact edges, arrays of neighbor ids and of relationship type ids.
+Adjacency = collections.namedtuple(
+    "Adjacency", ["out_ids", "out_type_ids", "in_ids", "in_type_ids"])
+
+
+def _cache():
+    """Return adjacency cache, or None."""
+    alias = getattr(settings, "CONTACTS_ADJACENCY_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def _key(contact_id, generation):
+    return "%s%d.%s" % (_KEY_PREFIX, contact_id, generation)
+
+
+def _generation_key(contact_id):
+    return "%s%d" % (_GENERATION_KEY_PREFIX, contact_id)
+
+
+def _new_generation():
+    return uuid.uuid4().hex
+
+
+def _generations(cache, contact_ids):
+    """Return dict of contact id cache generation token."""
+    keys = dict((_generation_key(contact_id), contact_id)
+                for contact_id in contact_ids)
+    found = cache.get_many(list(keys))
+    generations = {}
+    for key, contact_id in keys.items():
+        if key not in found:
+            # another process may add the generation first
+            generation = _new_generation()
+            cache.add(key, generation, None)
+            found[key] = cache.get(key, generation)
+        generations[contact_id] = found[key]
+    return generations
+
+
+def _array():
+    return array.array("l")
+
+
+def load(contact_ids):
+    """Return dict of contact id Adjacency, loaded from the database."""
+    loaded = dict(
+        (contact_id, Adjacency(_array(), _array(), _array(), _array()))
+        for contact_id in contact_ids)
+    for chunk in models.chunked(loaded):
+        for from_id, to_id, type_id in (
+                models.RelatedContact.objects.filter(
+                    from_contact_id__in=chunk).order_by("id").values_list(
+                        "from_contact_id", "to_contact_id",
+                        "contact_relationship_type_id")):
+            loaded[from_id].out_ids.append(to_id)
+            loaded[from_id].out_type_ids.append(type_id)
+        for from_id, to_id, type_id in (
+                models.RelatedContact.objects.filter(
+                    to_contact_id__in=chunk).order_by("id").values_list(
+                        "from_contact_id", "to_contact_id",
+                        "contact_relationship_type_id")):
+            loaded[to_id].in_ids.append(from_id)
+            loaded[to_id].in_type_ids.append(type_id)
+    return loaded
+
+
+def adjacencies(contact_ids):
+    """Return dict of contact id Adjacency, from the cache on hit."""
+    contact_ids = set(contact_ids)
+    cache = _cache()
+    found = {}
+    if cache is not None:
+        generations = _generations(cache, contact_ids)
+        keys = dict((contact_id, _key(contact_id, generation))
+                    for contact_id, generation in generations.items())
+        cached = cache.get_many(list(keys.values()))
+        found = dict((contact_id, Adjacency(*cached[key]))
+                     for contact_id, key in keys.items() if key in cached)
+    missing = contact_ids.difference(found)
+    if missing:
+        loaded = load(missing)
+        if cache is not None:
+            # stored under the generations read before the load
+            cache.set_many(dict(
+                (keys[contact_id], tuple(adjacency))
+                for contact_id, adjacency in loaded.items()))
+        found.update(loaded)
+    return found
+
+
+def neighbor_ids(adjacency, direction=DIRECTION_BOTH, type_ids=None):
+    """Return set of adjacency neighbor ids.
+
+    Only neighbors along edges of type_ids relationship types are
+    returned, if given.
+    """
+    pairs = []
+    if direction in (DIRECTION_OUT, DIRECTION_BOTH):
+        pairs.append((adjacency.out_ids, adjacency.out_type_ids))
+    if direction in (DIRECTION_IN, DIRECTION_BOTH):
+        pairs.append((adjacency.in_ids, adjacency.in_type_ids))
+    return set(contact_id
+               for ids, edge_type_ids in pairs
+               for contact_id, type_id in zip(ids, edge_type_ids)
+               if not type_ids or type_id in type_ids)
+
+
+def mutual_ids(contact_id, other_id, direction=DIRECTION_BOTH,
+               type_ids=None):
+    """Return set of ids of the neighbors of both contacts."""
+    found = adjacencies([contact_id, other_id])
+    return (neighbor_ids(found[contact_id], direction, type_ids) &
+            neighbor_ids(found[other_id], direction, type_ids)) - set(
+                [contact_id, other_id])
+
+
+def invalidate(contact_ids):
+    """Invalidate the cached adjacency of contacts.
+
+    The contact generations are replaced, entries stored under former
+    generations expire unread.
+    """
+    cache = _cache()
+    if cache is not None:
+        cache.set_many(dict(
+            (_generation_key(contact_id), _new_generation())
+            for contact_id in contact_ids), None)
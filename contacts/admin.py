@@ -46,6 +46,17 @@ class OrderedFormSet(BaseInlineFormSet):
                      self).get_queryset().order_by(self.order_clause)
 
 
+def type_field_kwargs(db_field, kwargs):
+    """Return foreign key form field kwargs.
+
+    Type choices are read from the type cache, see cache module.
+    """
+    if (db_field.related_model in models.TYPE_MODEL_CLASSES and
+            "queryset" not in kwargs):
+        kwargs["form_class"] = forms.TypeModelChoiceField
+    return kwargs
+
+
 _contacts_inline_fields = ("id", "priority")
 
 
@@ -73,10 +84,12 @@ class ContactsInline(admin.TabularInline):
                     creation_user=self.parent_object.creation_user)
             else:
                 kwargs["queryset"] = manager.filter(creation_user=request.user)
-        return super(
-            ContactsInline, self).formfield_for_foreignkey(db_field,
-                                                           request,
-                                                           **kwargs)
+        return super(ContactsInline, self).formfield_for_foreignkey(
+            db_field, request, **type_field_kwargs(db_field, kwargs))
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        return super(ContactsInline, self).formfield_for_foreignkey(
+            db_field, request, **type_field_kwargs(db_field, kwargs))
 
 _address_fields = (
     _contacts_inline_fields + ("address", "address_type", ),)
@@ -438,12 +451,13 @@ class ContactAdmin(GuardedModelAdminMixin, PrioritizedModelAdmin):
 
         if (request.user.is_superuser or
                 self.user_can_access_owned_objects_only):
-            return super(ContactAdmin, self).get_queryset(request)
-
-        contacts_qs = get_objects_for_user(
-            request.user, 'contacts.read_contact', accept_global_perms=False)
+            contacts_qs = super(ContactAdmin, self).get_queryset(request)
+        else:
+            contacts_qs = get_objects_for_user(
+                request.user, 'contacts.read_contact',
+                accept_global_perms=False)
 
-        return contacts_qs
+        return contacts_qs.select_related(*models.CONTACT_LIST_RELATED)
 
     def obj_perms_manage_view(self, request, object_pk):
         """
@@ -562,7 +576,7 @@ class ContactAdmin(GuardedModelAdminMixin, PrioritizedModelAdmin):
 
         return super(
             ContactAdmin, self).formfield_for_foreignkey(
-                db_field, request, **kwargs)
+                db_field, request, **type_field_kwargs(db_field, kwargs))
 
     def get_inline_instances(self, request, obj):
         """Create, initialize, and return  the associated inline instances."""
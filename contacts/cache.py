@@ -0,0 +1,150 @@
+"""
+.. module::  contacts.cache
+   :synopsis:  contacts application type cache module.
+
+*contacts* application type cache module.
+
+Type tables (i.e. ContactType, EmailType) are small and rarely change.
+All instances of a type model class are loaded on first use and kept in
+process, invalidated by the model post_save and post_delete signals, and
+reloaded after CONTACTS_TYPE_CACHE_TIMEOUT seconds to pick up changes made
+by other processes.  Instances missing from the cache, such as created by
+another process since the load, are queried and added to it.
+
+When CONTACTS_TYPE_CACHE names a Django cache, it is used as a shared
+tier: processes load the instances from it rather than from the database,
+and invalidation deletes the shared entry.
+"""
+from __future__ import absolute_import
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULT_TIMEOUT = 60
+_KEY_PREFIX = "contacts.types."
+
+
+def _shared_cache():
+    """Return shared cache tier, or None."""
+    alias = getattr(settings, "CONTACTS_TYPE_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def _timeout():
+    return getattr(settings, "CONTACTS_TYPE_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+class TypeCache(object):
+    """Cache of all instances of a type model class.
+
+    The cached instances are shared, and should not be modified.
+    """
+    def __init__(self, model_class):
+        self.model_class = model_class
+        self.key = _KEY_PREFIX + model_class._meta.label_lower
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._instances = None
+        self._expires = 0
+
+    def invalidate(self):
+        """Clear the cached instances, in process and in the shared tier."""
+        with self._lock:
+            self._generation += 1
+            self._instances = None
+        shared = _shared_cache()
+        if shared is not None:
+            shared.delete(self.key)
+
+    def _load(self):
+        shared = _shared_cache()
+        instances = shared.get(self.key) if shared is not None else None
+        if instances is None:
+            instances = list(self.model_class.objects.all())
+            if shared is not None:
+                shared.set(self.key, instances)
+        return instances
+
+    def instances(self):
+        """Return list of all model class instances."""
+        now = time.time()
+        with self._lock:
+            instances, generation = self._instances, self._generation
+            if instances is not None and now < self._expires:
+                return instances
+        instances = self._load()
+        with self._lock:
+            # an invalidation during the load may have made it stale
+            if generation == self._generation:
+                self._instances = instances
+                self._expires = now + _timeout()
+        return instances
+
+    def _add(self, instances):
+        """Add instances missing from the cache, clear the shared tier."""
+        with self._lock:
+            if self._instances is not None:
+                pks = set(instance.pk for instance in self._instances)
+                self._instances = self._instances + [
+                    instance for instance in instances
+                    if instance.pk not in pks]
+        shared = _shared_cache()
+        if shared is not None:
+            shared.delete(self.key)
+
+    def get(self, **kwargs):
+        """Return the instance matching all kwargs field values.
+
+        On a cache miss, the instance is queried and added to the cache.
+        Raises the model class DoesNotExist or MultipleObjectsReturned
+        exception, as QuerySet get does.
+        """
+        if "pk" in kwargs:
+            kwargs[self.model_class._meta.pk.attname] = kwargs.pop("pk")
+        matches = [instance for instance in self.instances()
+                   if all(getattr(instance, field_name) == value
+                          for field_name, value in kwargs.items())]
+        if not matches:
+            matches = list(self.model_class.objects.filter(**kwargs)[:2])
+            self._add(matches)
+        if not matches:
+            raise self.model_class.DoesNotExist(
+                "%s matching %s does not exist" % (
+                    self.model_class._meta.object_name, kwargs))
+        if len(matches) > 1:
+            raise self.model_class.MultipleObjectsReturned(
+                "%d %s instances match %s" % (
+                    len(matches), self.model_class._meta.object_name, kwargs))
+        return matches[0]
+
+
+_type_caches = {}
+_type_caches_lock = threading.Lock()
+
+
+def type_cache(model_class):
+    """Return TypeCache instance of model class."""
+    try:
+        return _type_caches[model_class]
+    except KeyError:
+        with _type_caches_lock:
+            return _type_caches.setdefault(
+                model_class, TypeCache(model_class))
+
+
+def cached_get(model_class, **kwargs):
+    """Return cached model class instance matching kwargs."""
+    return type_cache(model_class).get(**kwargs)
+
+
+def invalidate(model_class):
+    """Invalidate model class cached instances."""
+    type_cache(model_class).invalidate()
+
+
+def clear():
+    """Invalidate all cached instances."""
+    for cache in list(_type_caches.values()):
+        cache.invalidate()
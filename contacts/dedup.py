@@ -0,0 +1,212 @@
+"""
+.. module::  contacts.dedup
+   :synopsis:  contacts application duplicate detection module.
+
+*contacts* application duplicate detection module.
+
+Finds candidate duplicate contacts without comparing all pairs:
+
+1. Blocking keys are computed per chunk of contacts, optionally in a
+   process pool, and stored in the DuplicateKey table: lower case email
+   addresses, the last 10 phone number digits, and the family and given
+   name soundex codes with the birth date, from the contact name and
+   ContactName associations.
+2. The database groups contacts by key.  Contacts are only compared
+   within a block of contacts sharing a key; blocks larger than
+   max_block_size, such as a shared office phone, are skipped.
+3. Pairs are scored by the kinds of keys they share and stored in the
+   DuplicateCandidate table.
+
+Each step is linear in the number of contacts, but for the database sort.
+"""
+from __future__ import absolute_import
+import itertools
+import multiprocessing
+import operator
+import unicodedata
+
+from django.db import connections, transaction
+from django.db.models import Count
+from django.utils.encoding import force_text
+
+from . import lookup
+from . import models
+
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_MAX_BLOCK_SIZE = 50
+MIN_PHONE_DIGITS = 7
+PHONE_DIGITS = 10
+
+# Probability two contacts sharing a kind of key are duplicates, combined
+# as independent evidence.
+KIND_WEIGHTS = {
+    models.DUPLICATE_EMAIL: 0.6,
+    models.DUPLICATE_PHONE: 0.4,
+    models.DUPLICATE_NAME: 0.5,
+}
+
+_KEY_LENGTH = 254
+_SOUNDEX_CODES = dict(
+    (letter, str(code))
+    for code, letters in enumerate((
+        "aehiouwy", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r"))
+    for letter in letters)
+
+
+def soundex(text):
+    """Return American soundex code of text, empty without letters."""
+    letters = [character for character in unicodedata.normalize(
+        "NFKD", force_text(text or "")).lower()
+        if character in _SOUNDEX_CODES]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES[letters[0]]
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES[letter]
+        if digit != "0" and digit != previous:
+            code += digit
+        if letter not in "hw":
+            previous = digit
+    return (code + "000")[:4]
+
+
+def _key(kind, value):
+    return ("%s:%s" % (kind, value))[:_KEY_LENGTH]
+
+
+def email_key(address):
+    address = lookup.normalize_email(address)
+    return _key(models.DUPLICATE_EMAIL, address) if address else None
+
+
+def phone_key(number):
+    digits = lookup.normalize_phone(number)
+    if len(digits) < MIN_PHONE_DIGITS:
+        return None
+    return _key(models.DUPLICATE_PHONE, digits[-PHONE_DIGITS:])
+
+
+def name_key(given_name, family_name, birth_date):
+    family_code = soundex(family_name)
+    if not family_code or birth_date is None:
+        return None
+    return _key(models.DUPLICATE_NAME, "%s%s:%s" % (
+        family_code, soundex(given_name), birth_date.isoformat()))
+
+
+def chunk_keys(bounds):
+    """Return set of (key, contact id) of contacts with ids within bounds.
+
+    bounds is a (first id, last id) tuple.
+    """
+    keys = set()
+
+    def add(key_function, rows):
+        for row in rows:
+            key = key_function(*row[1:])
+            if key:
+                keys.add((key, row[0]))
+
+    add(email_key, models.ContactEmail.objects.filter(
+        contact_id__range=bounds).values_list(
+            "contact_id", "email__address"))
+    add(phone_key, models.ContactPhone.objects.filter(
+        contact_id__range=bounds).values_list(
+            "contact_id", "phone__number"))
+    add(name_key, models.Contact.objects.filter(
+        id__range=bounds, birth_date__isnull=False).values_list(
+            "id", "name__given_name", "name__family_name", "birth_date"))
+    add(name_key, models.ContactName.objects.filter(
+        contact_id__range=bounds,
+        contact__birth_date__isnull=False).values_list(
+            "contact_id", "name__given_name", "name__family_name",
+            "contact__birth_date"))
+    return keys
+
+
+def chunk_bounds(chunk_size):
+    """Yield (first id, last id) of each chunk of chunk size contacts."""
+    last_id = None
+    while True:
+        queryset = models.Contact.objects.order_by("id")
+        if last_id is not None:
+            queryset = queryset.filter(id__gt=last_id)
+        ids = list(queryset.values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            return
+        last_id = ids[-1]
+        yield ids[0], last_id
+
+
+def compute_keys(chunk_size=DEFAULT_CHUNK_SIZE, processes=1):
+    """Replace the blocking keys of all contacts, return their number.
+
+    With more than one process, chunks are computed in a process pool,
+    the keys are stored by the calling process.
+    """
+    models.DuplicateKey.objects.all().delete()
+    bounds = list(chunk_bounds(chunk_size))
+    pool = None
+    if processes > 1:
+        # forked processes must not share the database connections
+        connections.close_all()
+        pool = multiprocessing.Pool(processes)
+        results = pool.imap(chunk_keys, bounds)
+    else:
+        results = (chunk_keys(chunk) for chunk in bounds)
+    count = 0
+    try:
+        for keys in results:
+            models.DuplicateKey.objects.bulk_create(
+                models.DuplicateKey(key=key, contact_id=contact_id)
+                for key, contact_id in sorted(keys))
+            count += len(keys)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return count
+
+
+def block_pairs(max_block_size=DEFAULT_MAX_BLOCK_SIZE):
+    """Return dict of (contact id, duplicate id) pair shared key kinds.
+
+    Only contacts in blocks of at most max block size are paired.
+    """
+    blocks = models.DuplicateKey.objects.values("key").annotate(
+        size=Count("id")).filter(
+            size__gt=1, size__lte=max_block_size).values("key")
+    rows = models.DuplicateKey.objects.filter(key__in=blocks).order_by(
+        "key", "contact_id").values_list("key", "contact_id").iterator()
+    pairs = {}
+    for key, block in itertools.groupby(rows, key=operator.itemgetter(0)):
+        kind = key.split(":", 1)[0]
+        contact_ids = [contact_id for _, contact_id in block]
+        for pair in itertools.combinations(contact_ids, 2):
+            pairs.setdefault(pair, set()).add(kind)
+    return pairs
+
+
+def score(kinds):
+    """Return duplicate score of a pair sharing kinds of keys."""
+    unlikely = 1.0
+    for kind in kinds:
+        unlikely *= 1.0 - KIND_WEIGHTS[kind]
+    return round(1.0 - unlikely, 4)
+
+
+def find_duplicates(chunk_size=DEFAULT_CHUNK_SIZE, processes=1,
+                    max_block_size=DEFAULT_MAX_BLOCK_SIZE):
+    """Replace the duplicate candidates, return their number."""
+    compute_keys(chunk_size, processes)
+    pairs = block_pairs(max_block_size)
+    with transaction.atomic():
+        models.DuplicateCandidate.objects.all().delete()
+        for chunk in models.chunked(sorted(pairs.items())):
+            models.DuplicateCandidate.objects.bulk_create(
+                models.DuplicateCandidate(
+                    contact_id=contact_id, duplicate_id=duplicate_id,
+                    score=score(kinds), reasons=",".join(sorted(kinds)))
+                for (contact_id, duplicate_id), kinds in chunk)
+    return len(pairs)
@@ -0,0 +1,88 @@
+"""
+..  module:: contacts.filters
+    :synopsis: contacts application filters module.
+
+*contacts*  application filters module.
+"""
+from __future__ import absolute_import
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.filters import BaseFilterBackend
+
+from guardian.utils import get_anonymous_user
+
+from . import models
+
+
+def contact_field_name(model_class):
+    """Return name of model class field referencing the contact.
+
+    The primary key of contact denormalized data models is the contact.
+    """
+    pk = model_class._meta.pk
+    if (issubclass(model_class, models.Contact) or
+            pk.is_relation and pk.related_model is models.Contact):
+        return "pk"
+    return models.association_fields(model_class)[0].name
+
+
+def readable_contacts(user, field_name="pk"):
+    """Return filter of contacts the user is granted read permission.
+
+    The permission tables are probed on their (user or group, permission,
+    content object) unique index, instead of the content type and object
+    primary key lookup built by guardian get_objects_for_user.
+    """
+    if user.is_anonymous:
+        user = get_anonymous_user()
+    permission_id = models.permission_ids()[models.PERMISSION_READ]
+    user_contacts = models.ContactObjectPermission.objects.filter(
+        user=user, permission_id=permission_id).values("content_object")
+    group_contacts = models.ContactGroupObjectPermission.objects.filter(
+        group__in=user.groups.values("pk"),
+        permission_id=permission_id).values("content_object")
+    lookup = field_name + "__in"
+    return Q(**{lookup: user_contacts}) | Q(**{lookup: group_contacts})
+
+
+class ContactPermissionFilter(BaseFilterBackend):
+    """Filter restricting instances to contacts readable by the user.
+
+    Applies to Contact and contact association instances, unless object
+    permissions are disabled or the user is a superuser.
+    """
+
+    def restricts(self, request):
+        """Return True if instances are filtered for the request user."""
+        return (settings.USE_OBJECT_PERMISSIONS and
+                not request.user.is_superuser)
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.restricts(request):
+            return queryset
+        return queryset.filter(self.readable(request.user, queryset.model))
+
+    def readable(self, user, model_class):
+        """Return filter of model class instances readable by the user."""
+        return readable_contacts(user, contact_field_name(model_class))
+
+
+class ContactChangeFilter(ContactPermissionFilter):
+    """Filter restricting changes to contacts readable by the user.
+
+    Deleted contact permissions are deleted with the contact, so the
+    tombstones of deleted contacts, and of their associations, are
+    restricted to the users and groups recorded as their readers, see
+    models.DeletedContactReader.
+    """
+
+    def readable(self, user, model_class):
+        if user.is_anonymous:
+            user = get_anonymous_user()
+        readers = models.DeletedContactReader.objects.filter(
+            Q(user=user) | Q(group__in=user.groups.values("pk")))
+        deleted_contacts = Q(
+            action=models.CHANGE_DELETED,
+            contact_id__in=readers.values("contact_id"))
+        return readable_contacts(user, "contact_id") | deleted_contacts
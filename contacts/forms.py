@@ -6,16 +6,70 @@ Django contacts application forms  module.
 
 """
 from __future__ import absolute_import
-from django.forms import ModelForm
+from django.forms import ModelChoiceField, ModelForm
+from django.forms.models import ModelChoiceIterator
 from django.core.exceptions import ValidationError
 from django_core_utils import forms
 from guardian.core import ObjectPermissionChecker
 from python_core_utils.core import dict_merge
 
+from . import cache
 from . import models
 from . import text
 
 
+class TypeModelChoiceIterator(ModelChoiceIterator):
+    """Choice iterator over cached type model instances."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for instance in self.field.cached_instances():
+            yield self.choice(instance)
+
+    def __len__(self):
+        return (len(self.field.cached_instances()) +
+                (1 if self.field.empty_label is not None else 0))
+
+    def __bool__(self):
+        return (self.field.empty_label is not None or
+                bool(self.field.cached_instances()))
+
+    __nonzero__ = __bool__
+
+
+class TypeModelChoiceField(ModelChoiceField):
+    """Type model choice field.
+
+    Choices are listed and validated from the type cache, see cache
+    module, rather than queried for each form.
+    """
+    iterator = TypeModelChoiceIterator
+
+    def cached_instances(self):
+        """Return list of cached type instances."""
+        return cache.type_cache(self.queryset.model).instances()
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        model_class = self.queryset.model
+        if self.to_field_name:
+            key, field = self.to_field_name, model_class._meta.get_field(
+                self.to_field_name)
+        else:
+            key, field = "pk", model_class._meta.pk
+        if isinstance(value, model_class):
+            value = getattr(value, field.attname)
+        try:
+            return cache.cached_get(model_class,
+                                    **{key: field.to_python(value)})
+        except (TypeError, ValueError, ValidationError,
+                model_class.DoesNotExist):
+            raise ValidationError(self.error_messages["invalid_choice"],
+                                  code="invalid_choice")
+
+
 class ContactAdminForm(forms.PrioritizedModelAdminForm):
     """Contact model admin form  class.
     """
@@ -0,0 +1,251 @@
+"""
+.. module::  contacts.generator
+   :synopsis:  contacts application bulk data generator module.
+
+*contacts* application bulk data generator module.
+
+Generates large, reproducible datasets for load tests and benchmarks.
+Instances are created with bulk_create in dependency order: users, type
+rows, then per batch of contacts the names, contacts (and their object
+permissions), email, phone and address rows, and associations.  All
+values, including the instance uuids, are drawn from a random generator
+seeded with the seed argument.
+"""
+from __future__ import absolute_import
+import collections
+import datetime
+import random
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from django_core_utils.utils import current_site
+
+from . import models
+from . import search
+from . import summary
+from . import vcard
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_USERS = 10
+
+# Association mean number of instances per contact.
+DEFAULT_FAN_OUT = collections.OrderedDict([
+    ("emails", 2),
+    ("phones", 1),
+    ("addresses", 1),
+    ("related_contacts", 1),
+])
+
+_GIVEN_NAMES = (
+    "Ada", "Alan", "Barbara", "Claude", "Donald", "Edsger", "Frances",
+    "Grace", "John", "Ken", "Leslie", "Margaret", "Niklaus", "Radia",
+    "Shafi", "Tim")
+_FAMILY_NAMES = (
+    "Allen", "Backus", "Cerf", "Dijkstra", "Hamilton", "Hopper", "Kahn",
+    "Knuth", "Lamport", "Liskov", "Lovelace", "McCarthy", "Perlman",
+    "Ritchie", "Thompson", "Turing", "Wirth")
+_LOCALITIES = (
+    ("Boston", "MA", "02110"), ("Chicago", "IL", "60601"),
+    ("Denver", "CO", "80202"), ("Seattle", "WA", "98101"),
+    ("New York", "NY", "10001"), ("Austin", "TX", "73301"))
+_STREETS = ("Main St", "Oak Ave", "Pine St", "Maple Dr", "Cedar Ln")
+_TYPE_NAMES = ("home", "work")
+_RELATIONSHIP_NAMES = ("friend", "colleague", "family")
+
+# Generated contact, with its audit params, name values and number.
+Row = collections.namedtuple(
+    "Row", ["contact", "params", "given_name", "family_name", "number"])
+
+
+class Generator(object):
+    """Bulk contacts generator.
+
+    Each contact is owned by one of the generated users, picked at random.
+    """
+    def __init__(self, users=DEFAULT_USERS, fan_out=None, seed=0,
+                 site=None):
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.fan_out = dict(DEFAULT_FAN_OUT, **(fan_out or {}))
+        self.site = site or current_site()
+        self.users = self._create_users(users)
+        self.params = [self._params(user) for user in self.users]
+        self.types = dict(
+            (type_class, self._type_ids(type_class, names))
+            for type_class, names in (
+                (models.EmailType, _TYPE_NAMES),
+                (models.PhoneType, _TYPE_NAMES),
+                (models.AddressType, _TYPE_NAMES),
+                (models.ContactRelationshipType, _RELATIONSHIP_NAMES)))
+        self.contact_ids = []
+        self.count = 0
+
+    def _type_ids(self, type_class, names):
+        """Return sorted ids of type names, creating missing types."""
+        ids = vcard.TypeResolver(type_class, self.params[0]).resolve(names)
+        return sorted(ids[name.lower()] for name in names)
+
+    def _params(self, user):
+        return dict(creation_user=user, effective_user=user,
+                    update_user=user, site=self.site)
+
+    def _create_users(self, count):
+        """Return generated users, creating missing ones in bulk."""
+        user_model = get_user_model()
+        usernames = ["generated-%d-%d" % (self.seed, index)
+                     for index in range(count)]
+        existing = set(user_model.objects.filter(
+            username__in=usernames).values_list("username", flat=True))
+        users = []
+        for username in usernames:
+            if username not in existing:
+                user = user_model(username=username)
+                user.set_unusable_password()
+                users.append(user)
+        user_model.objects.bulk_create(users)
+        users = list(user_model.objects.filter(
+            username__in=usernames).order_by("id"))
+        if settings.USE_OBJECT_PERMISSIONS:
+            profiled = set(models.UserProfile.objects.filter(
+                user__in=users).values_list("user_id", flat=True))
+            models.UserProfile.objects.bulk_create(
+                models.UserProfile(user=user)
+                for user in users if user.pk not in profiled)
+        return users
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _count(self, attr_name):
+        """Return random count of attr name instances for a contact."""
+        return self.rng.randint(0, 2 * self.fan_out[attr_name])
+
+    def _type_id(self, type_class):
+        return self.rng.choice(self.types[type_class])
+
+    def _bulk_create(self, model_class, instances):
+        """Create instances in bulk, return their ids."""
+        model_class.objects.bulk_create(instances)
+        return models.uuid_ids(model_class, instances)
+
+    def _references(self, model_class, type_class, attr_name, contact_rows,
+                    values):
+        """Create reference instances and contact associations."""
+        association_class, field_name, type_field_name = {
+            models.Email: (models.ContactEmail, "email", "email_type"),
+            models.Phone: (models.ContactPhone, "phone", "phone_type"),
+            models.Address: (
+                models.ContactAddress, "address", "address_type"),
+        }[model_class]
+        rows = []
+        for row in contact_rows:
+            for index in range(self._count(attr_name)):
+                rows.append((row, model_class(
+                    uuid=self._uuid(), **dict(
+                        values(row, index), **row.params))))
+        ids = self._bulk_create(
+            model_class, [instance for _, instance in rows])
+        return association_class, [
+            association_class(**dict({
+                "uuid": self._uuid(),
+                "contact_id": row.contact.pk,
+                field_name + "_id": reference_id,
+                type_field_name + "_id": self._type_id(type_class)},
+                **row.params))
+            for (row, _), reference_id in zip(rows, ids)]
+
+    def _email(self, row, index):
+        return dict(address="%s.%s.%d.%d@example.com" % (
+            row.given_name.lower(), row.family_name.lower(),
+            row.number, index))
+
+    def _phone(self, row, index):
+        return dict(number="+1%010d" % self.rng.randint(2000000000,
+                                                        9999999999))
+
+    def _address(self, row, index):
+        locality, region, postal_code = self.rng.choice(_LOCALITIES)
+        return dict(
+            street_address="%d %s" % (self.rng.randint(1, 9999),
+                                      self.rng.choice(_STREETS)),
+            locality=locality, region=region, postal_code=postal_code)
+
+    def _related_contacts(self, contact_rows):
+        relationship_type_ids = self.types[models.ContactRelationshipType]
+        keys = set()
+        associations = []
+        for row in contact_rows:
+            for _ in range(self._count("related_contacts")):
+                key = (row.contact.pk, self.rng.choice(self.contact_ids),
+                       self.rng.choice(relationship_type_ids))
+                if key[0] == key[1] or key in keys:
+                    continue
+                keys.add(key)
+                associations.append(models.RelatedContact(
+                    uuid=self._uuid(), from_contact_id=key[0],
+                    to_contact_id=key[1], contact_relationship_type_id=key[2],
+                    **row.params))
+        return associations
+
+    def generate_batch(self, count):
+        """Generate count contacts within a transaction."""
+        with transaction.atomic(), search.deferred_updates(), (
+                summary.deferred_updates()):
+            rows = []
+            for _ in range(count):
+                self.count += 1
+                params = self.rng.choice(self.params)
+                rows.append(Row(
+                    models.Contact(
+                        uuid=self._uuid(),
+                        birth_date=datetime.date(1940, 1, 1) +
+                        datetime.timedelta(days=self.rng.randint(0, 25000)),
+                        **params),
+                    params, self.rng.choice(_GIVEN_NAMES),
+                    self.rng.choice(_FAMILY_NAMES), self.count))
+            name_ids = self._bulk_create(models.Name, [
+                models.Name(uuid=self._uuid(), given_name=row.given_name,
+                            family_name=row.family_name, **row.params)
+                for row in rows])
+            for row, name_id in zip(rows, name_ids):
+                row.contact.name_id = name_id
+            contacts = models.Contact.objects.bulk_create_with_permissions(
+                [row.contact for row in rows])
+            self.contact_ids.extend(contact.pk for contact in contacts)
+
+            associations = collections.OrderedDict()
+            for model_class, type_class, attr_name, values in (
+                    (models.Email, models.EmailType, "emails",
+                     self._email),
+                    (models.Phone, models.PhoneType, "phones",
+                     self._phone),
+                    (models.Address, models.AddressType, "addresses",
+                     self._address)):
+                association_class, instances = self._references(
+                    model_class, type_class, attr_name, rows, values)
+                associations[association_class] = instances
+            associations[models.RelatedContact] = self._related_contacts(
+                rows)
+            for association_class, instances in associations.items():
+                association_class.objects.bulk_create(instances)
+                models.post_bulk_create.send(
+                    sender=association_class, instances=instances)
+        return contacts
+
+    def generate(self, count, batch_size=DEFAULT_BATCH_SIZE):
+        """Generate count contacts, return their ids."""
+        start = len(self.contact_ids)
+        while count > 0:
+            self.generate_batch(min(count, batch_size))
+            count -= batch_size
+        return self.contact_ids[start:]
+
+
+def generate_contacts(count, batch_size=DEFAULT_BATCH_SIZE,
+                      users=DEFAULT_USERS, fan_out=None, seed=0, site=None):
+    """Generate count contacts, return their ids."""
+    return Generator(users=users, fan_out=fan_out, seed=seed,
+                     site=site).generate(count, batch_size)
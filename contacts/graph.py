@@ -0,0 +1,263 @@
+"""
+.. module::  contacts.graph
+   :synopsis:  contacts application relationship graph module.
+
+*contacts* application relationship graph module.
+
+RelatedContact instances are the edges of a directed graph of contacts,
+from_contact -> to_contact.  The graph is traversed, optionally along
+edges of some relationship types only, to find:
+
+* the k-hop neighborhood of a contact.
+* the shortest path between two contacts.
+* the connected component of a contact, edge direction ignored.
+
+Neighborhood and component traversals are a single recursive common
+table expression query on PostgreSQL and SQLite, and a breadth first
+search issuing one batched query per hop on other databases, or when
+only readable contacts are traversed.  Shortest paths are always found
+by breadth first search, stopping at the target.
+
+Traversals are bounded by depth and result size; contacts with more than
+fan_out edges (hubs, such as a colleague of everyone) are reached but not
+traversed.  Both databases evaluate the recursive query as its rows are
+fetched, breadth first: the LIMIT of the outer select, without sort or
+grouping, stops the recursion itself.  When the result is truncated, the
+contacts returned at the last depth are not ordered by id.
+"""
+from __future__ import absolute_import
+import collections
+
+from django.db import connection
+
+from . import models
+
+DIRECTION_OUT = "out"
+DIRECTION_IN = "in"
+DIRECTION_BOTH = "both"
+DIRECTIONS = (DIRECTION_OUT, DIRECTION_IN, DIRECTION_BOTH)
+
+DEFAULT_DEPTH = 2
+MAX_DEPTH = 6
+DEFAULT_FAN_OUT = 100
+DEFAULT_MAX_NODES = 1000
+
+# Traversal result: contact ids and whether max nodes was reached.
+Nodes = collections.namedtuple("Nodes", ["contacts", "truncated"])
+
+_RECURSIVE_CTE_VENDORS = ("postgresql", "sqlite")
+
+
+def recursive_cte_supported():
+    """Return True if traversals use a recursive query."""
+    return connection.vendor in _RECURSIVE_CTE_VENDORS
+
+
+def _columns():
+    meta = models.RelatedContact._meta
+    return (meta.db_table,
+            meta.get_field("from_contact").column,
+            meta.get_field("to_contact").column,
+            meta.get_field("contact_relationship_type").column)
+
+
+def _edge_sql(direction, type_ids):
+    """Return edge(src, dst) select statement and its params."""
+    table, from_column, to_column, type_column = _columns()
+    where, params = "", []
+    if type_ids:
+        where = " WHERE %s IN (%s)" % (
+            type_column, ", ".join(["%s"] * len(type_ids)))
+        params = list(type_ids)
+    selects = []
+    if direction in (DIRECTION_OUT, DIRECTION_BOTH):
+        selects.append("SELECT %s AS src, %s AS dst FROM %s%s" % (
+            from_column, to_column, table, where))
+    if direction in (DIRECTION_IN, DIRECTION_BOTH):
+        selects.append("SELECT %s AS src, %s AS dst FROM %s%s" % (
+            to_column, from_column, table, where))
+    return " UNION ALL ".join(selects), params * len(selects)
+
+
+def _fan_out_sql(direction, type_ids):
+    """Return recursive step condition and its params.
+
+    Contacts with more than fan out edges other than the start contact
+    are not traversed.  Edges are counted on the edge table contact
+    column indexes, for each contact walked.  The params are the start
+    contact id, the type ids if any, and the fan out.
+    """
+    table, from_column, to_column, type_column = _columns()
+    where, params = "", []
+    if type_ids:
+        where = " AND %s IN (%s)" % (
+            type_column, ", ".join(["%s"] * len(type_ids)))
+        params = list(type_ids)
+    counts = []
+    if direction in (DIRECTION_OUT, DIRECTION_BOTH):
+        counts.append("(SELECT COUNT(*) FROM %s WHERE %s = walk.contact_id"
+                      "%s)" % (table, from_column, where))
+    if direction in (DIRECTION_IN, DIRECTION_BOTH):
+        counts.append("(SELECT COUNT(*) FROM %s WHERE %s = walk.contact_id"
+                      "%s)" % (table, to_column, where))
+    return ("(walk.contact_id = %%s OR %s <= %%s)" % " + ".join(counts),
+            params * len(counts))
+
+
+def _fetch(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _edges(contact_ids, direction, type_ids):
+    """Return dict of contact id edge destination ids, one query per chunk.
+    """
+    edges = collections.defaultdict(list)
+    columns = []
+    if direction in (DIRECTION_OUT, DIRECTION_BOTH):
+        columns.append(("from_contact_id", "to_contact_id"))
+    if direction in (DIRECTION_IN, DIRECTION_BOTH):
+        columns.append(("to_contact_id", "from_contact_id"))
+    for chunk in models.chunked(contact_ids):
+        for src_column, dst_column in columns:
+            queryset = models.RelatedContact.objects.filter(
+                **{src_column + "__in": chunk})
+            if type_ids:
+                queryset = queryset.filter(
+                    contact_relationship_type_id__in=type_ids)
+            for src, dst in queryset.values_list(src_column, dst_column):
+                edges[src].append(dst)
+    return edges
+
+
+def _search(contact_id, depth, direction, type_ids, fan_out, max_nodes,
+            target_id=None, readable=None):
+    """Breadth first search from contact id.
+
+    Only contacts in the set returned by readable(contact ids) are
+    reached, if given.  Return dict of reached contact id depths and dict
+    of their parent contact ids.
+    """
+    depths = {contact_id: 0}
+    parents = {}
+    frontier = [contact_id]
+    level = 0
+    while (frontier and (depth is None or level < depth) and
+           len(depths) <= max_nodes and target_id not in depths):
+        level += 1
+        edges = _edges(frontier, direction, type_ids)
+        reached = collections.OrderedDict()
+        for src in frontier:
+            destinations = edges.get(src, ())
+            if src != contact_id and len(destinations) > fan_out:
+                continue
+            for dst in destinations:
+                if dst not in depths and dst not in reached:
+                    reached[dst] = src
+        if readable is not None and reached:
+            allowed = readable(list(reached))
+            for dst in [dst for dst in reached if dst not in allowed]:
+                del reached[dst]
+        for dst, src in reached.items():
+            depths[dst] = level
+            parents[dst] = src
+        frontier = list(reached)
+    return depths, parents
+
+
+def _truncate(contacts, max_nodes):
+    return Nodes(contacts[:max_nodes], len(contacts) > max_nodes)
+
+
+def neighborhood(contact_id, depth=DEFAULT_DEPTH, direction=DIRECTION_BOTH,
+                 type_ids=None, fan_out=DEFAULT_FAN_OUT,
+                 max_nodes=DEFAULT_MAX_NODES, readable=None):
+    """Return contacts within depth hops of contact id.
+
+    The Nodes contacts are (contact id, depth) tuples, ordered by depth
+    and id, contact id excluded.  Only contacts in the set returned by
+    readable(contact ids) are reached and traversed, if given.
+    """
+    if readable is None and recursive_cte_supported():
+        edge_sql, params = _edge_sql(direction, type_ids)
+        fan_out_sql, fan_out_params = _fan_out_sql(direction, type_ids)
+        # a contact is walked at most once per depth, the limit holds more
+        # than max nodes contacts
+        rows = _fetch(
+            "WITH RECURSIVE edge(src, dst) AS (%s), "
+            "walk(contact_id, depth) AS ("
+            "SELECT %%s, 0 "
+            "UNION "
+            "SELECT edge.dst, walk.depth + 1 FROM walk "
+            "JOIN edge ON edge.src = walk.contact_id "
+            "WHERE walk.depth < %%s AND %s) "
+            "SELECT contact_id, depth FROM walk "
+            "WHERE contact_id <> %%s LIMIT %%s" % (edge_sql, fan_out_sql),
+            params + [contact_id, depth, contact_id] + fan_out_params +
+            [fan_out, contact_id, (max_nodes + 1) * depth])
+        depths = {}
+        for reached_id, reached_depth in rows:
+            depths[reached_id] = min(
+                depths.get(reached_id, reached_depth), reached_depth)
+    else:
+        depths, _ = _search(contact_id, depth, direction, type_ids,
+                            fan_out, max_nodes, readable=readable)
+        del depths[contact_id]
+    contacts = sorted(depths.items(), key=lambda item: (item[1], item[0]))
+    return _truncate(contacts, max_nodes)
+
+
+def shortest_path(from_contact_id, to_contact_id, max_depth=MAX_DEPTH,
+                  direction=DIRECTION_OUT, type_ids=None,
+                  fan_out=DEFAULT_FAN_OUT, max_nodes=DEFAULT_MAX_NODES,
+                  readable=None):
+    """Return contact ids of a shortest path, None if there is none.
+
+    The path starts with from contact id and ends with to contact id.
+    The search stops after reaching max nodes contacts; it only goes
+    through contacts in the set returned by readable(contact ids), if
+    given.
+    """
+    if from_contact_id == to_contact_id:
+        return [from_contact_id]
+    depths, parents = _search(
+        from_contact_id, max_depth, direction, type_ids, fan_out,
+        max_nodes, target_id=to_contact_id, readable=readable)
+    if to_contact_id not in depths:
+        return None
+    path = [to_contact_id]
+    while path[-1] != from_contact_id:
+        path.append(parents[path[-1]])
+    return list(reversed(path))
+
+
+def component(contact_id, type_ids=None, fan_out=DEFAULT_FAN_OUT,
+              max_nodes=DEFAULT_MAX_NODES, readable=None):
+    """Return contacts connected to contact id, edge direction ignored.
+
+    The Nodes contacts are ids, ordered, contact id included.  Only
+    contacts in the set returned by readable(contact ids) are reached and
+    traversed, if given.
+    """
+    if readable is None and recursive_cte_supported():
+        edge_sql, params = _edge_sql(DIRECTION_BOTH, type_ids)
+        fan_out_sql, fan_out_params = _fan_out_sql(DIRECTION_BOTH, type_ids)
+        rows = _fetch(
+            "WITH RECURSIVE edge(src, dst) AS (%s), "
+            "walk(contact_id) AS ("
+            "SELECT %%s "
+            "UNION "
+            "SELECT edge.dst FROM walk "
+            "JOIN edge ON edge.src = walk.contact_id WHERE %s) "
+            "SELECT contact_id FROM walk LIMIT %%s" % (
+                edge_sql, fan_out_sql),
+            params + [contact_id, contact_id] + fan_out_params +
+            [fan_out, max_nodes + 1])
+        contacts = [row[0] for row in rows]
+    else:
+        depths, _ = _search(contact_id, None, DIRECTION_BOTH, type_ids,
+                            fan_out, max_nodes, readable=readable)
+        contacts = list(depths)
+    nodes = _truncate(contacts, max_nodes)
+    return Nodes(sorted(nodes.contacts), nodes.truncated)
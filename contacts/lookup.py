@@ -0,0 +1,102 @@
+"""
+.. module::  contacts.lookup
+   :synopsis:  contacts application reverse lookup module.
+
+*contacts* application reverse lookup module.
+
+Answers "who is calling?": the contacts associated with a phone number or
+email address.  Normalized phone number digits and lower case email
+addresses are kept in the ContactLookup table, current with the
+ContactPhone and ContactEmail signal handlers, and probed on its
+(kind, value, contact) unique index.
+"""
+from __future__ import absolute_import
+import re
+
+from django.db.models import Q
+from django.utils.encoding import force_text
+
+from . import models
+
+_NON_DIGITS = re.compile(r"\D+")
+
+
+def normalize_phone(number):
+    """Return phone number digits.
+
+    The E.164 '+' prefix and formatting characters are dropped.
+    """
+    return _NON_DIGITS.sub("", force_text(number or ""))
+
+
+def normalize_email(address):
+    """Return lower case email address."""
+    return force_text(address or "").strip().lower()
+
+
+# Lookup kind source association class, value field and normalizer.
+_SOURCES = {
+    models.LOOKUP_EMAIL: (
+        models.ContactEmail, "email__address", normalize_email),
+    models.LOOKUP_PHONE: (
+        models.ContactPhone, "phone__number", normalize_phone),
+}
+
+LOOKUP_CLASSES = tuple(
+    association_class for association_class, _, _ in _SOURCES.values())
+
+
+def _kind(association_class):
+    for kind, (source_class, _, _) in _SOURCES.items():
+        if source_class is association_class:
+            return kind
+    raise ValueError("%s is not a lookup association class" % (
+        association_class.__name__))
+
+
+def update_lookups(association_class, contact_ids):
+    """Rebuild lookup values of contacts from association class instances.
+
+    Lookup values are deleted and recreated, values of associations which
+    moved to another contact or whose email or phone changed are dropped.
+    Deleted contacts are skipped, their lookup values are deleted with
+    them.
+    """
+    kind = _kind(association_class)
+    _, value_field, normalize = _SOURCES[kind]
+    contact_ids = set(contact_ids) - models.deleting_contact_ids()
+    for chunk in models.chunked(contact_ids):
+        rows = set(
+            (contact_id, normalize(value))
+            for contact_id, value in association_class.objects.filter(
+                contact__in=chunk).values_list("contact_id", value_field))
+        models.ContactLookup.objects.filter(
+            kind=kind, contact__in=chunk).delete()
+        models.ContactLookup.objects.bulk_create(
+            models.ContactLookup(kind=kind, value=value, contact_id=contact_id)
+            for contact_id, value in rows if value)
+
+
+def update_referencing_lookups(association_class, field_name, instance):
+    """Rebuild lookup values of contacts associated with email or phone."""
+    update_lookups(association_class, association_class.objects.filter(
+        **{field_name: instance}).values_list("contact_id", flat=True))
+
+
+def lookup_contact_ids(phone=None, email=None):
+    """Return query of the ids of contacts matching phone or email.
+
+    Returns None if neither normalizes to a lookup value.
+    """
+    values = [(kind, normalize(value))
+              for kind, value, normalize in (
+                  (models.LOOKUP_PHONE, phone, normalize_phone),
+                  (models.LOOKUP_EMAIL, email, normalize_email))
+              if value]
+    values = [(kind, value) for kind, value in values if value]
+    if not values:
+        return None
+    condition = Q()
+    for kind, value in values:
+        condition |= Q(kind=kind, value=value)
+    return models.ContactLookup.objects.filter(condition).values("contact")
@@ -0,0 +1,45 @@
+"""
+.. module::  contacts.management.commands.export_vcards
+   :synopsis:  contacts application vCard export command module.
+
+*contacts* application vCard export command module.
+"""
+from __future__ import absolute_import
+import io
+
+from django.core.management.base import BaseCommand
+
+from ... import models
+from ... import vcard
+
+
+class Command(BaseCommand):
+    """Export contacts in vCard format."""
+    help = "Export contacts in vCard 4.0 format."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "output", nargs="?",
+            help="Output file name, defaults to standard output.")
+        parser.add_argument(
+            "--chunk-size", type=int, default=vcard.DEFAULT_CHUNK_SIZE,
+            help="Number of contacts read per query.")
+        parser.add_argument(
+            "--user",
+            help="Export only contacts created by user name.")
+
+    def handle(self, *args, **options):
+        queryset = models.Contact.objects.all()
+        if options["user"]:
+            queryset = queryset.filter(
+                creation_user__username=options["user"])
+        chunks = vcard.export_contacts(
+            queryset, chunk_size=options["chunk_size"])
+        if options["output"]:
+            with io.open(options["output"], "w", encoding="utf-8",
+                         newline="") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
@@ -0,0 +1,36 @@
+"""
+.. module::  contacts.management.commands.find_duplicate_contacts
+   :synopsis:  contacts application duplicate detection command module.
+
+*contacts* application duplicate detection command module.
+"""
+from __future__ import absolute_import
+
+from django.core.management.base import BaseCommand
+
+from ... import dedup
+
+
+class Command(BaseCommand):
+    """Find duplicate contact candidates."""
+    help = ("Compute the contact blocking keys and store the scored "
+            "duplicate candidate pairs.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=dedup.DEFAULT_CHUNK_SIZE,
+            help="Number of contacts per blocking keys chunk.")
+        parser.add_argument(
+            "--processes", type=int, default=1,
+            help="Number of processes computing blocking keys.")
+        parser.add_argument(
+            "--max-block-size", type=int,
+            default=dedup.DEFAULT_MAX_BLOCK_SIZE,
+            help="Contacts sharing a key more often are not compared.")
+
+    def handle(self, *args, **options):
+        count = dedup.find_duplicates(
+            chunk_size=options["chunk_size"],
+            processes=options["processes"],
+            max_block_size=options["max_block_size"])
+        self.stdout.write("Found %d duplicate candidate pairs." % count)
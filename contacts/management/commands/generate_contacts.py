@@ -0,0 +1,53 @@
+"""
+.. module::  contacts.management.commands.generate_contacts
+   :synopsis:  contacts application bulk data generator command module.
+
+*contacts* application bulk data generator command module.
+"""
+from __future__ import absolute_import
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import generator
+from ... import models
+
+
+class Command(BaseCommand):
+    """Generate contacts in bulk."""
+    help = "Generate contacts, with associations, for load tests."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "count", type=int, help="Number of contacts generated.")
+        parser.add_argument(
+            "--batch-size", type=int, default=generator.DEFAULT_BATCH_SIZE,
+            help="Number of contacts generated per transaction.")
+        parser.add_argument(
+            "--users", type=int, default=generator.DEFAULT_USERS,
+            help="Number of users owning the contacts.")
+        parser.add_argument(
+            "--seed", type=int, default=0,
+            help="Random seed, the same seed generates the same contacts.")
+        for attr_name, mean in generator.DEFAULT_FAN_OUT.items():
+            parser.add_argument(
+                "--%s" % attr_name.replace("_", "-"), type=int,
+                default=mean, dest=attr_name,
+                help="Mean number of %s per contact." % (
+                    attr_name.replace("_", " ")))
+
+    def handle(self, *args, **options):
+        contacts_generator = generator.Generator(
+            users=options["users"], seed=options["seed"],
+            fan_out=dict((attr_name, options[attr_name])
+                         for attr_name in generator.DEFAULT_FAN_OUT))
+        if models.Contact.objects.filter(
+                creation_user__in=contacts_generator.users).exists():
+            raise CommandError(
+                "Contacts of seed %d exist, use another seed." % (
+                    options["seed"]))
+        start = timeit.default_timer()
+        contact_ids = contacts_generator.generate(
+            options["count"], options["batch_size"])
+        self.stdout.write("Generated %d contacts in %.1f seconds." % (
+            len(contact_ids), timeit.default_timer() - start))
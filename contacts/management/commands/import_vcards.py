@@ -0,0 +1,43 @@
+"""
+.. module::  contacts.management.commands.import_vcards
+   :synopsis:  contacts application vCard import command module.
+
+*contacts* application vCard import command module.
+"""
+from __future__ import absolute_import
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import vcard
+
+
+class Command(BaseCommand):
+    """Import contacts from vCard files."""
+    help = "Import contacts from vCard files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "files", nargs="+", help="vCard file names.")
+        parser.add_argument(
+            "--user", required=True,
+            help="User name of the owner of the imported contacts.")
+        parser.add_argument(
+            "--batch-size", type=int, default=vcard.DEFAULT_BATCH_SIZE,
+            help="Number of contacts imported per transaction.")
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        try:
+            user = user_model.objects.get(
+                **{user_model.USERNAME_FIELD: options["user"]})
+        except user_model.DoesNotExist:
+            raise CommandError("User %s not found" % options["user"])
+
+        for file_name in options["files"]:
+            with io.open(file_name, encoding="utf-8", newline="") as lines:
+                count = vcard.import_contacts(
+                    lines, user, batch_size=options["batch_size"])
+            self.stdout.write("Imported %d contacts from %s" % (
+                count, file_name))
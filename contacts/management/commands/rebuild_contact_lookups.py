@@ -0,0 +1,31 @@
+"""
+.. module::  contacts.management.commands.rebuild_contact_lookups
+   :synopsis:  contacts application reverse lookup rebuild command module.
+
+*contacts* application reverse lookup rebuild command module.
+"""
+from __future__ import absolute_import
+
+from django.core.management.base import BaseCommand
+
+from ... import lookup
+from ... import models
+
+
+class Command(BaseCommand):
+    """Rebuild contact reverse lookup values."""
+    help = "Rebuild the phone and email reverse lookup values of all contacts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=models.LOOKUP_SIZE,
+            help="Number of contacts rebuilt per query.")
+
+    def handle(self, *args, **options):
+        count = 0
+        for chunk in models.id_chunks(
+                models.Contact.objects.all(), options["chunk_size"]):
+            for association_class in lookup.LOOKUP_CLASSES:
+                lookup.update_lookups(association_class, chunk)
+            count += len(chunk)
+        self.stdout.write("Rebuilt lookup values of %d contacts." % count)
@@ -0,0 +1,30 @@
+"""
+.. module::  contacts.management.commands.rebuild_contact_summaries
+   :synopsis:  contacts application contact summary rebuild command module.
+
+*contacts* application contact summary rebuild command module.
+"""
+from __future__ import absolute_import
+
+from django.core.management.base import BaseCommand
+
+from ... import models
+from ... import summary
+
+
+class Command(BaseCommand):
+    """Rebuild contact summaries."""
+    help = "Rebuild the summaries of all contacts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=models.LOOKUP_SIZE,
+            help="Number of contacts rebuilt per query.")
+
+    def handle(self, *args, **options):
+        count = 0
+        for chunk in models.id_chunks(
+                models.Contact.objects.all(), options["chunk_size"]):
+            summary.update_summaries(chunk)
+            count += len(chunk)
+        self.stdout.write("Rebuilt %d contact summaries." % count)
@@ -0,0 +1,30 @@
+"""
+.. module::  contacts.management.commands.rebuild_search_documents
+   :synopsis:  contacts application search document rebuild command module.
+
+*contacts* application search document rebuild command module.
+"""
+from __future__ import absolute_import
+
+from django.core.management.base import BaseCommand
+
+from ... import models
+from ... import search
+
+
+class Command(BaseCommand):
+    """Rebuild contact search documents."""
+    help = "Rebuild the full text search documents of all contacts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=models.LOOKUP_SIZE,
+            help="Number of contacts rebuilt per query.")
+
+    def handle(self, *args, **options):
+        count = 0
+        for chunk in models.id_chunks(
+                models.Contact.objects.all(), options["chunk_size"]):
+            search.update_documents(chunk)
+            count += len(chunk)
+        self.stdout.write("Rebuilt %d search documents." % count)
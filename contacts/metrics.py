@@ -0,0 +1,193 @@
+"""
+.. module::  contacts.metrics
+   :synopsis:  contacts application request metrics module.
+
+*contacts* application request metrics module.
+
+MetricsMiddleware records per request the query count, total SQL time,
+serializer time (for views using MetricsMixin), response size and
+duration.  They are returned in a Server-Timing header, and aggregated in
+process per url name, method and status class for the metrics endpoint,
+in Prometheus text format.  Enable by adding the middleware to the
+MIDDLEWARE setting::
+
+    MIDDLEWARE += ["contacts.metrics.MetricsMiddleware"]
+
+The metrics endpoint is restricted to staff users, and to scrapers
+sending the CONTACTS_METRICS_TOKEN setting value as bearer token::
+
+    Authorization: Bearer <CONTACTS_METRICS_TOKEN>
+
+Query count and SQL time use connection.execute_wrapper, and are not
+recorded with Django versions without it.
+"""
+from __future__ import absolute_import
+import collections
+import threading
+import timeit
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_METRIC_PREFIX = "contacts_request_"
+
+# Methods recorded by name, others are recorded as "other" so that clients
+# cannot add registry entries.
+_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE",
+                      "OPTIONS", "TRACE"))
+
+# Aggregated measures, with their Prometheus name and help text.
+_MEASURES = (
+    ("duration", "duration_seconds", "Request duration"),
+    ("queries", "queries", "Request database queries"),
+    ("sql_time", "sql_seconds", "Request database query time"),
+    ("serializer_time", "serializer_seconds", "Request serializer time"),
+    ("response_size", "response_bytes", "Request response size"),
+)
+
+
+class RequestMetrics(object):
+    """Measures of a request."""
+    def __init__(self):
+        self.start = timeit.default_timer()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.response_size = 0
+        self.duration = 0.0
+
+    def execute(self, execute, sql, params, many, context):
+        """Database execute wrapper counting queries and their time."""
+        start = timeit.default_timer()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += timeit.default_timer() - start
+
+    def server_timing(self):
+        """Return Server-Timing header value."""
+        return ", ".join((
+            'db;dur=%.1f;desc="%d queries"' % (
+                self.sql_time * 1000, self.queries),
+            "serialize;dur=%.1f" % (self.serializer_time * 1000),
+            "total;dur=%.1f" % (self.duration * 1000)))
+
+
+class Registry(object):
+    """In process aggregate of request metrics."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = collections.defaultdict(lambda: dict.fromkeys(
+            ["count"] + [name for name, _, _ in _MEASURES], 0))
+
+    def record(self, labels, metrics):
+        """Add metrics of request with labels tuple."""
+        with self._lock:
+            totals = self._totals[labels]
+            totals["count"] += 1
+            for name, _, _ in _MEASURES:
+                totals[name] += getattr(metrics, name)
+
+    def clear(self):
+        with self._lock:
+            self._totals.clear()
+
+    def prometheus(self):
+        """Return aggregates in Prometheus text format, as summaries."""
+        with self._lock:
+            totals = sorted(
+                (labels, dict(values))
+                for labels, values in self._totals.items())
+        lines = []
+        for name, metric_name, help_text in _MEASURES:
+            metric_name = _METRIC_PREFIX + metric_name
+            lines.append("# HELP %s %s." % (metric_name, help_text))
+            lines.append("# TYPE %s summary" % metric_name)
+            for (view, method, status), values in totals:
+                labels = 'view="%s",method="%s",status="%s"' % (
+                    view, method, status)
+                lines.append("%s_sum{%s} %s" % (
+                    metric_name, labels, repr(float(values[name]))))
+                lines.append("%s_count{%s} %d" % (
+                    metric_name, labels, values["count"]))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return (match.url_name or match.view_name) if match else "unresolved"
+
+
+class MetricsMiddleware(object):
+    """Middleware recording request metrics."""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request.contacts_metrics = RequestMetrics()
+        if hasattr(connection, "execute_wrapper"):
+            with connection.execute_wrapper(metrics.execute):
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+        if not response.streaming:
+            metrics.response_size = len(response.content)
+        metrics.duration = timeit.default_timer() - metrics.start
+        response["Server-Timing"] = metrics.server_timing()
+        method = request.method if request.method in _METHODS else "other"
+        registry.record((_view_name(request), method,
+                         "%dxx" % (response.status_code // 100)), metrics)
+        return response
+
+
+class MetricsMixin(object):
+    """API view mixin recording serializer time.
+
+    The time spent in the serializer to_representation, when the
+    response data is built, is added to the request metrics.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super(MetricsMixin, self).get_serializer(
+            *args, **kwargs)
+        metrics = getattr(self.request, "contacts_metrics", None)
+        if metrics is not None:
+            to_representation = serializer.to_representation
+
+            def timed_to_representation(instance):
+                start = timeit.default_timer()
+                try:
+                    return to_representation(instance)
+                finally:
+                    metrics.serializer_time += (
+                        timeit.default_timer() - start)
+            serializer.to_representation = timed_to_representation
+        return serializer
+
+
+def metrics_allowed(request):
+    """Return True if request is from a staff user or bears the token."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_active and user.is_staff:
+        return True
+    token = getattr(settings, "CONTACTS_METRICS_TOKEN", None)
+    scheme, _, value = request.META.get(
+        "HTTP_AUTHORIZATION", "").partition(" ")
+    return bool(token and scheme.lower() == "bearer" and
+                constant_time_compare(value.strip(), token))
+
+
+def metrics_view(request):
+    """Return the aggregated request metrics, in Prometheus text format."""
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.prometheus(),
+                        content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 09:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['priority', 'id'], name='contacts_contact_prio_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['update_time', 'id'], name='contacts_contact_upd_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactemail',
+            index=models.Index(fields=['priority', 'id'], name='contacts_email_prio_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactemail',
+            index=models.Index(fields=['update_time', 'id'], name='contacts_email_upd_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactphone',
+            index=models.Index(fields=['priority', 'id'], name='contacts_phone_prio_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactphone',
+            index=models.Index(fields=['update_time', 'id'], name='contacts_phone_upd_id_idx'),
+        ),
+    ]
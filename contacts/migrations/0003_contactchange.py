@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 10:41
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model_name', models.CharField(max_length=100)),
+                ('object_uuid', models.UUIDField()),
+                ('contact_id', models.IntegerField(blank=True, null=True)),
+                ('action', models.CharField(choices=[('created', 'created'), ('updated', 'updated'), ('deleted', 'deleted')], max_length=10)),
+                ('version', models.IntegerField(blank=True, null=True)),
+                ('change_time', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'sl_contacts_contact_change',
+                'verbose_name': 'Contact change',
+                'verbose_name_plural': 'Contact changes',
+                'get_latest_by': 'id',
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 13:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.utils import DatabaseError
+import django.db.models.deletion
+
+_TABLE = 'sl_contacts_contact_search_document'
+_FTS_TABLE = 'sl_contacts_contact_search_fts'
+_GIN_INDEX = 'sl_contacts_contact_search_gin'
+
+# SQLite FTS5 external content table, maintained by triggers.
+_SQLITE_FTS_SQL = (
+    "CREATE VIRTUAL TABLE {fts} USING fts5("
+    "document, content='{table}', content_rowid='contact_id')",
+    "CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+    "INSERT INTO {fts}(rowid, document) "
+    "VALUES (new.contact_id, new.document); END",
+    "CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+    "INSERT INTO {fts}({fts}, rowid, document) "
+    "VALUES ('delete', old.contact_id, old.document); END",
+    "CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN "
+    "INSERT INTO {fts}({fts}, rowid, document) "
+    "VALUES ('delete', old.contact_id, old.document); "
+    "INSERT INTO {fts}(rowid, document) "
+    "VALUES (new.contact_id, new.document); END",
+)
+
+
+def create_search_index(apps, schema_editor):
+    """Create the database specific search document index."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX %s ON %s USING GIN "
+            "(to_tsvector('simple', document))" % (_GIN_INDEX, _TABLE))
+    elif vendor == 'sqlite':
+        try:
+            with schema_editor.connection.cursor() as cursor:
+                cursor.execute(
+                    "CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+                cursor.execute("DROP TABLE temp.fts5_probe")
+        except DatabaseError:
+            # sqlite built without FTS5, use the fallback search
+            return
+        for sql in _SQLITE_FTS_SQL:
+            schema_editor.execute(sql.format(fts=_FTS_TABLE, table=_TABLE))
+
+
+def drop_search_index(apps, schema_editor):
+    """Drop the database specific search document index."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS %s" % _GIN_INDEX)
+    elif vendor == 'sqlite':
+        for suffix in ('_ai', '_ad', '_au'):
+            schema_editor.execute(
+                "DROP TRIGGER IF EXISTS %s%s" % (_FTS_TABLE, suffix))
+        schema_editor.execute("DROP TABLE IF EXISTS %s" % _FTS_TABLE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0003_contactchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactSearchDocument',
+            fields=[
+                ('contact', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='contacts.Contact')),
+                ('document', models.TextField(blank=True)),
+            ],
+            options={
+                'db_table': _TABLE,
+                'verbose_name': 'Contact search document',
+                'verbose_name_plural': 'Contact search documents',
+                'get_latest_by': 'contact',
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 14:20
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0004_contactsearchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactLookup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('email', 'email'), ('phone', 'phone')], max_length=10)),
+                ('value', models.CharField(max_length=254)),
+                ('contact', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contacts.Contact')),
+            ],
+            options={
+                'db_table': 'sl_contacts_contact_lookup',
+                'verbose_name': 'Contact lookup',
+                'verbose_name_plural': 'Contact lookups',
+                'get_latest_by': 'id',
+                'abstract': False,
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='contactlookup',
+            unique_together=set([('kind', 'value', 'contact')]),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 15:10
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0005_contactlookup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactSummary',
+            fields=[
+                ('contact', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='contacts.Contact')),
+                ('display_name', models.CharField(blank=True, max_length=255)),
+                ('contact_type', models.CharField(blank=True, max_length=255)),
+                ('primary_email', models.CharField(blank=True, max_length=254)),
+                ('primary_phone', models.CharField(blank=True, max_length=50)),
+                ('organization', models.CharField(blank=True, max_length=255)),
+                ('address_count', models.IntegerField(default=0)),
+                ('email_count', models.IntegerField(default=0)),
+                ('phone_count', models.IntegerField(default=0)),
+                ('organization_count', models.IntegerField(default=0)),
+                ('priority', models.IntegerField(default=0)),
+                ('version', models.IntegerField(default=0)),
+                ('update_time', models.DateTimeField(blank=True, null=True)),
+                ('update_user', models.CharField(blank=True, max_length=150)),
+            ],
+            options={
+                'db_table': 'sl_contacts_contact_summary',
+                'verbose_name': 'Contact summary',
+                'verbose_name_plural': 'Contact summaries',
+                'get_latest_by': 'contact',
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='contactsummary',
+            index=models.Index(fields=['priority', 'contact'], name='contacts_summary_prio_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactsummary',
+            index=models.Index(fields=['update_time', 'contact'], name='contacts_summary_upd_id_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 17:40
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0006_contactsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicateCandidate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('reasons', models.CharField(max_length=50)),
+                ('contact', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contacts_duplicatecandidate_contact', to='contacts.Contact')),
+                ('duplicate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contacts_duplicatecandidate_duplicate', to='contacts.Contact')),
+            ],
+            options={
+                'db_table': 'sl_contacts_duplicate_candidate',
+                'verbose_name': 'Duplicate candidate',
+                'verbose_name_plural': 'Duplicate candidates',
+                'get_latest_by': 'id',
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DuplicateKey',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=254)),
+                ('contact', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contacts.Contact')),
+            ],
+            options={
+                'db_table': 'sl_contacts_duplicate_key',
+                'verbose_name': 'Duplicate key',
+                'verbose_name_plural': 'Duplicate keys',
+                'get_latest_by': 'id',
+                'abstract': False,
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='duplicatecandidate',
+            unique_together=set([('contact', 'duplicate')]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='duplicatekey',
+            unique_together=set([('key', 'contact')]),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-18 21:12
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0007_alter_validators_add_error_messages'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contacts', '0007_duplicates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedContactReader',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contact_id', models.IntegerField(db_index=True)),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='auth.Group')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'sl_contacts_deleted_contact_reader',
+                'verbose_name': 'Deleted contact reader',
+                'verbose_name_plural': 'Deleted contact readers',
+                'get_latest_by': 'id',
+                'abstract': False,
+            },
+        ),
+        migrations.AlterField(
+            model_name='contactchange',
+            name='contact_id',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+    ]
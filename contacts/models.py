@@ -47,13 +47,28 @@ from __future__ import absolute_import
 
 # @TODO: review class field layout
 # @TODO: review each of the types, determine which should be optional
+import collections
+import contextlib
+import itertools
 import logging
+import threading
 from inflection import humanize, pluralize, underscore
 
 from django.conf import settings
 import django.contrib.auth.models
+from django.db import transaction
 from django.db.models import Model
 from django.db.models import CASCADE
+from django.db.models import Exists
+from django.db.models import F
+from django.db.models import Index
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import (BigAutoField, CharField, DateTimeField,
+                              FloatField, IntegerField, OneToOneField,
+                              TextField, UUIDField)
+from django.dispatch import Signal
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 from guardian.models import UserObjectPermissionBase
@@ -88,11 +103,131 @@ from django_core_utils.models import (NamedModel, PrioritizedModel,
                                       db_table, related_name_base)
 
 
+from . import cache
 from . import validation
 
 logger = logging.getLogger(__name__)
 _app_label = 'contacts'
 
+# Sent with the instances created in bulk, for which post_save is not sent.
+post_bulk_create = Signal(providing_args=["instances"])
+# Sent after contacts are merged, with the ids of the contacts whose
+# associations changed.
+post_merge = Signal(providing_args=["survivor", "victim_ids", "contact_ids"])
+
+_local = threading.local()
+
+
+def deleting_contact_ids():
+    """Return set of ids of contacts being deleted by this thread.
+
+    Association instances are deleted, and their post_delete sent, before
+    the contact itself is deleted: denormalized contact data is not rebuilt
+    for these contacts.
+    """
+    if not hasattr(_local, "deleting"):
+        _local.deleting = set()
+    return _local.deleting
+
+
+class DeferredUpdates(object):
+    """Denormalized contact data updates, deferrable per thread.
+
+    update_function(contact ids) rebuilds the data of contacts.  Within
+    deferred, the contacts to update are collected, and rebuilt once on
+    exit; used when contacts and several association classes are created
+    in bulk.
+    """
+    def __init__(self, update_function):
+        self.update_function = update_function
+        self._local = threading.local()
+
+    def update(self, contact_ids):
+        """Rebuild the data of contacts, skipping deleted contacts."""
+        contact_ids = set(contact_ids) - deleting_contact_ids()
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.update(contact_ids)
+        else:
+            self.update_function(contact_ids)
+
+    @contextlib.contextmanager
+    def deferred(self):
+        """Context manager rebuilding the updated contacts once, on exit."""
+        if getattr(self._local, "pending", None) is not None:
+            yield
+            return
+        self._local.pending = set()
+        try:
+            yield
+            contact_ids = self._local.pending
+        finally:
+            self._local.pending = None
+        self.update_function(contact_ids)
+
+
+def referencing_contact_ids(instance, reference_fields):
+    """Return set of ids of contacts referencing instance.
+
+    reference_fields are (Contact or association class, field name)
+    tuples, fields not referencing the instance class are skipped.
+    """
+    contact_ids = set()
+    for model_class, field_name in reference_fields:
+        field = model_class._meta.get_field(field_name)
+        if isinstance(instance, field.related_model):
+            contact_ids.update(model_class.objects.filter(
+                **{field_name: instance}).values_list(
+                    "pk" if model_class is Contact else "contact_id",
+                    flat=True))
+    return contact_ids
+
+
+# Contact related instances listed with contacts, displayed by
+# Contact.__str__ and the admin changelist.
+CONTACT_LIST_RELATED = (
+    "name", "formatted_name", "contact_type", "update_user")
+
+# Maximum number of values in an 'in' lookup, kept below the sqlite
+# default limit of host parameters.
+LOOKUP_SIZE = 500
+
+
+def chunked(values, size=LOOKUP_SIZE):
+    """Yield lists of at most size values."""
+    iterator = iter(values)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def id_chunks(queryset, size=LOOKUP_SIZE):
+    """Yield lists of at most size queryset instance ids, in id order.
+
+    Each list is queried after the last id of the previous one, rather
+    than loading all ids at once.
+    """
+    last_id = None
+    while True:
+        chunk_queryset = queryset.order_by("pk")
+        if last_id is not None:
+            chunk_queryset = chunk_queryset.filter(pk__gt=last_id)
+        chunk = list(chunk_queryset.values_list("pk", flat=True)[:size])
+        if not chunk:
+            return
+        last_id = chunk[-1]
+        yield chunk
+
+
+def keyset_indexes(name, pk_name="id"):
+    """Return composite indexes supporting keyset pagination."""
+    return [Index(fields=["priority", pk_name],
+                  name="%s_%s_prio_id_idx" % (_app_label, name)),
+            Index(fields=["update_time", pk_name],
+                  name="%s_%s_upd_id_idx" % (_app_label, name))]
+
 
 def create_fields(instance, **kwargs):
     """Return dict of fields to be used as create params."""
@@ -107,6 +242,78 @@ def create_fields(instance, **kwargs):
     return params
 
 
+def uuid_ids(model_class, instances):
+    """Return ids of instances created in bulk, in instances order.
+
+    Not all databases return the primary key of instances created in bulk,
+    the ids are retrieved using the instances uuid.
+    """
+    ids = {}
+    uuids = [instance.uuid for instance in instances]
+    for values in chunked(uuids):
+        ids.update(model_class.objects.filter(
+            uuid__in=values).values_list("uuid", "id"))
+    return [ids[instance_uuid] for instance_uuid in uuids]
+
+
+def _merge_rows(model_class, contact_attnames, key_attnames, survivor_id,
+                victim_ids, loaded_fields=None, **values):
+    """Re-point model class rows from victim contacts to the survivor.
+
+    contact_attnames are the contact foreign key attnames, key_attnames
+    the unique together attnames.  Victim rows which would duplicate a
+    survivor row or an older victim row, or relate the survivor to
+    itself, are deleted without signals: nothing references them, and
+    the caller records their changes.  The other victim rows are moved
+    with one UPDATE per contact foreign key, setting values.  Return
+    lists of the moved and the deleted rows, with loaded_fields only,
+    empty if loaded_fields is not given.
+    """
+    merged_ids = [survivor_id] + list(victim_ids)
+    moving, dropped_ids = [], set()
+    for attname in contact_attnames:
+        # rows moving along attname, other contacts left unchanged
+        rows = model_class.objects.filter(**{attname + "__in": victim_ids})
+        for other in contact_attnames:
+            if other != attname:
+                rows = rows.exclude(**{other + "__in": merged_ids})
+        duplicates = model_class.objects.filter(
+            Q(**{attname: survivor_id}) | Q(pk__lt=OuterRef("pk")),
+            **dict([(attname + "__in", merged_ids)] + [
+                (key, OuterRef(key)) for key in key_attnames
+                if key != attname]))
+        dropped_ids.update(rows.annotate(
+            duplicate=Exists(duplicates)).filter(
+                duplicate=True).values_list("pk", flat=True))
+        moving.append((attname, rows))
+    if len(contact_attnames) > 1:
+        # rows relating merged contacts would relate the survivor to itself
+        query = Q()
+        for attname in contact_attnames:
+            query |= Q(**{attname + "__in": victim_ids})
+        dropped_ids.update(model_class.objects.filter(query).filter(
+            **dict((attname + "__in", merged_ids)
+                   for attname in contact_attnames)).values_list(
+                       "pk", flat=True))
+    dropped = []
+    for chunk in chunked(sorted(dropped_ids)):
+        queryset = model_class.objects.filter(pk__in=chunk)
+        if loaded_fields is not None:
+            dropped.extend(queryset.only(*loaded_fields))
+        queryset._raw_delete(queryset.db)
+    moved = []
+    for attname, rows in moving:
+        if loaded_fields is not None:
+            moved.extend(rows.only(*loaded_fields))
+        rows.update(**dict(values, **{attname: survivor_id}))
+    victim_ids = set(victim_ids)
+    for row in moved:
+        for attname in contact_attnames:
+            if getattr(row, attname) in victim_ids:
+                setattr(row, attname, survivor_id)
+    return moved, dropped
+
+
 def delete_association(association_class, **kwargs):
     """Remove an association.
 
@@ -128,6 +335,79 @@ def create_association(association_class, **kwargs):
     """Create association instance."""
     return association_class.objects.create(**kwargs)
 
+
+def association_fields(association_class):
+    """Return association class unique fields.
+
+    The first field is the contact, followed by the associated instance,
+    and optionally its type.
+    """
+    return [association_class._meta.get_field(field_name)
+            for field_name in association_class._meta.unique_together[0]]
+
+
+def _association_key(row, size):
+    """Return tuple of primary keys of association row instances."""
+    key = [getattr(instance, "pk", instance) for instance in row]
+    return tuple(key + [None] * (size - len(key)))
+
+
+def create_associations(association_class, rows,
+                        ignore_conflicts=False, **params):
+    """Create association instances in bulk.
+
+    Each row is a tuple of instances matching the association unique fields.
+    Duplicate rows are created once.  Rows matching existing associations
+    are skipped when ignore_conflicts is set, at the cost of one query per
+    chunk of contacts.
+    """
+    fields = association_fields(association_class)
+    keys = collections.OrderedDict(
+        (_association_key(row, len(fields)), None) for row in rows)
+    if ignore_conflicts and keys:
+        contact_ids = set(key[0] for key in keys)
+        for chunk in chunked(contact_ids):
+            existing = association_class.objects.filter(
+                **{fields[0].name + "__in": chunk}).values_list(
+                *[field.attname for field in fields])
+            for key in existing:
+                keys.pop(tuple(key), None)
+    instances = [
+        association_class(**dict(
+            zip([field.attname for field in fields], key), **params))
+        for key in keys]
+    association_class.objects.bulk_create(instances)
+    post_bulk_create.send(sender=association_class, instances=instances)
+    return instances
+
+
+def delete_associations(association_class, rows):
+    """Delete association instances in bulk, return the number deleted.
+
+    Each row is a tuple of instances matching the association unique fields.
+    When the row excludes the type, associations of any type are deleted.
+    """
+    fields = association_fields(association_class)
+    count = 0
+    for chunk in chunked(rows, LOOKUP_SIZE // len(fields)):
+        query = Q()
+        for row in chunk:
+            query |= Q(**dict(zip([field.name for field in fields], row)))
+        count += association_class.objects.filter(query).delete()[0]
+    return count
+
+
+class TypeManager(VersionedModelManager):
+    """Type model manager class, providing cached instance access."""
+
+    def cached_get(self, **kwargs):
+        """Return cached instance matching kwargs field values."""
+        return cache.cached_get(self.model, **kwargs)
+
+    def cached_all(self):
+        """Return list of all cached instances."""
+        return cache.type_cache(self.model).instances()
+
 _contact_type = "ContactType"
 _contact_type_vebose = humanize(underscore(_contact_type))
 
@@ -139,6 +419,8 @@ class ContactType(NamedModel):
     Values may include individual, organization, unknown.
     """
     # @TODO: is this duplicate of category?
+    objects = TypeManager()
+
     class Meta(NamedModel.Meta):
         """Model meta class declaration."""
         app_label = _app_label
@@ -158,6 +440,8 @@ class ContactRelationshipType(NamedModel):
     Sample values may include "unknown",
     "acquaintance", "parent", "child", "co-worker",  "friend"
     """
+    objects = TypeManager()
+
     class Meta(NamedModel.Meta):
         app_label = _app_label
         db_table = db_table(_app_label, _related_contact_type)
@@ -418,6 +702,147 @@ class ContactManager(VersionedModelManager):
         return delete_association(
             ContactUrl, contact=contact, url=url)
 
+    def associate_many(self, association_class, rows,
+                       ignore_conflicts=False, **kwargs):
+        """Add many contact associations of association class.
+
+        Each row is a (contact, instance[, type]) tuple.  The audit fields
+        are taken from the first row contact unless provided as kwargs.
+        Returns the list of association instances created.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+        params = create_fields(rows[0][0], **kwargs)
+        return create_associations(
+            association_class, rows, ignore_conflicts, **params)
+
+    def dissociate_many(self, association_class, rows):
+        """Remove many contact associations of association class.
+
+        Each row is a (contact, instance[, type]) tuple.
+        Returns the number of association instances removed.
+        """
+        return delete_associations(association_class, rows)
+
+    def bulk_create_with_permissions(self, contacts, batch_size=None):
+        """Create contacts in bulk, granting contact object permissions.
+
+        bulk_create does not send post_save, the permissions otherwise
+        granted by the contact post_save handler are assigned in bulk,
+        and post_bulk_create is sent.
+        """
+        with transaction.atomic(using=self.db):
+            contacts = self.bulk_create(contacts, batch_size=batch_size)
+            if any(contact.pk is None for contact in contacts):
+                for contact, pk in zip(
+                        contacts, uuid_ids(self.model, contacts)):
+                    contact.pk = pk
+            assign_contact_permissions(contacts)
+            post_bulk_create.send(sender=self.model, instances=contacts)
+        return contacts
+
+    def with_associations(self):
+        """Return queryset prefetching all contact associations.
+
+        Issues one query per association class, independent of the
+        number of association instances.
+        """
+        return self.get_queryset().prefetch_related(*association_accessors())
+
+    def with_list_related(self):
+        """Return queryset selecting the contact list related instances."""
+        return self.get_queryset().select_related(*CONTACT_LIST_RELATED)
+
+    def merge(self, survivor, victims):
+        """Merge victim contacts into survivor, delete the victims.
+
+        Within a transaction, the survivor and victims are locked in id
+        order, and the victims association rows, related contacts in both
+        directions and object permissions are re-pointed to the survivor
+        with set based updates.  Rows duplicating a survivor row, by their
+        unique fields, are deleted without signals.  The survivor and moved
+        rows versions are bumped, changes are recorded in bulk and
+        post_merge is sent.  Issues a number of queries independent of the
+        number of rows moved or deleted.
+        """
+        victim_ids = sorted(set(victim.pk for victim in victims))
+        if not victim_ids or survivor.pk in victim_ids:
+            raise ValueError(
+                "Victims must be given, and exclude the survivor.")
+        with transaction.atomic(using=self.db):
+            list(self.select_for_update().filter(
+                pk__in=[survivor.pk] + victim_ids).order_by(
+                    "pk").values_list("pk"))
+            now = timezone.now()
+            contact_ids = set([survivor.pk])
+            moved, dropped = [], []
+            for association_class in CONTACT_ASSOCIATION_CLASSES + (
+                    RelatedContact,):
+                attnames = [field.attname for field in
+                            association_fields(association_class)]
+                contact_attnames = (
+                    ("from_contact_id", "to_contact_id")
+                    if association_class is RelatedContact
+                    else attnames[:1])
+                loaded_fields = [
+                    field.name for field in
+                    association_class._meta.concrete_fields
+                    if field.attname in contact_attnames or
+                    field.name in ("uuid", "version", "deleted")]
+                class_moved, class_dropped = _merge_rows(
+                    association_class, contact_attnames, attnames,
+                    survivor.pk, victim_ids, loaded_fields,
+                    version=F("version") + 1, update_time=now)
+                for row in class_moved:
+                    row.version += 1
+                for row in class_moved + class_dropped:
+                    contact_ids.update(getattr(row, attname)
+                                       for attname in contact_attnames)
+                moved.extend(class_moved)
+                dropped.extend(class_dropped)
+            for permission_class, attnames in (
+                    (ContactObjectPermission,
+                     ["user_id", "permission_id", "content_object_id"]),
+                    (ContactGroupObjectPermission,
+                     ["group_id", "permission_id", "content_object_id"])):
+                _merge_rows(permission_class, ["content_object_id"],
+                            attnames, survivor.pk, victim_ids)
+            self.filter(pk=survivor.pk).update(
+                version=F("version") + 1, update_time=now)
+            survivor.refresh_from_db(fields=["version", "update_time"])
+            ContactChange.objects.bulk_create(
+                [_change(row, CHANGE_UPDATED) for row in moved] +
+                [_change(row, CHANGE_DELETED) for row in dropped] +
+                [_change(survivor, CHANGE_UPDATED)])
+            self.filter(pk__in=victim_ids).delete()
+            contact_ids.difference_update(victim_ids)
+            post_merge.send(sender=self.model, survivor=survivor,
+                            victim_ids=victim_ids, contact_ids=contact_ids)
+        return survivor
+
+    def neighbors(self, contact, direction="both", type_ids=None):
+        """Return queryset of contacts related to contact.
+
+        Related contacts are read from the adjacency cache, along edges
+        in direction, one of out, in or both, of type_ids relationship
+        types if given.
+        """
+        from . import adjacency
+        found = adjacency.adjacencies([contact.pk])[contact.pk]
+        return self.get_queryset().filter(pk__in=adjacency.neighbor_ids(
+            found, direction, type_ids))
+
+    def mutual_connections(self, contact, other, direction="both",
+                           type_ids=None):
+        """Return queryset of contacts related to both contacts.
+
+        Related contacts are read from the adjacency cache.
+        """
+        from . import adjacency
+        return self.get_queryset().filter(pk__in=adjacency.mutual_ids(
+            contact.pk, other.pk, direction, type_ids))
+
 _contact = "Contact"
 _contact_verbose = humanize(underscore(_contact))
 
@@ -483,6 +908,7 @@ class Contact(ContactsModel):
         db_table = db_table(_app_label, _contact)
         verbose_name = _(_contact_verbose)
         verbose_name_plural = _(pluralize(_contact_verbose))
+        indexes = keyset_indexes("contact")
         permissions = (
             ("read_contact", "Can read contacts"),
             ("write_contact", "Can write contacts"),
@@ -587,6 +1013,7 @@ class ContactEmail(ContactAssociation):
         verbose_name = _(_contact_email_verbose)
         verbose_name_plural = _(pluralize(_contact_email_verbose))
         unique_together = ("contact", "email", "email_type", )
+        indexes = keyset_indexes("email")
 
 _formatted_name = "FormattedName"
 _formatted_name_verbose = humanize(underscore(_formatted_name))
@@ -837,6 +1264,7 @@ class ContactPhone(ContactAssociation):
         verbose_name = _(_contact_phone_verbose)
         verbose_name_plural = _(pluralize(_contact_phone_verbose))
         unique_together = ("contact", "phone", "phone_type")
+        indexes = keyset_indexes("phone")
 
 _contact_photo = "ContactPhoto"
 _contact_photo_verbose = humanize(underscore(_contact_photo))
@@ -987,6 +1415,32 @@ class RelatedContact(ContactAssociation):
         validation.related_contact_validation(self)
 
 
+# Association classes having a 'contact' foreign key, in the order
+# exposed by the api.
+CONTACT_ASSOCIATION_CLASSES = (
+    ContactAddress, ContactAnnotation, ContactCategory, ContactEmail,
+    ContactFormattedName, ContactGeographicLocation, ContactGroup,
+    ContactInstantMessaging, ContactLanguage, ContactLogo,
+    ContactName, ContactNickname, ContactOrganization,
+    ContactPhone, ContactPhoto, ContactRole,
+    ContactTimezone, ContactTitle, ContactUrl)
+
+
+def association_accessor(association_class, field_name="contact"):
+    """Return Contact attribute name used to access association instances."""
+    field = association_class._meta.get_field(field_name)
+    return field.remote_field.get_accessor_name()
+
+
+def association_accessors():
+    """Return Contact attribute names for all association instances."""
+    accessors = [association_accessor(association_class)
+                 for association_class in CONTACT_ASSOCIATION_CLASSES]
+    accessors.append(association_accessor(RelatedContact, "from_contact"))
+    accessors.append(association_accessor(RelatedContact, "to_contact"))
+    return accessors
+
+
 PERMISSION_ADD = "contacts.add_contact"
 PERMISSION_CHANGE = "contacts.change_contact"
 PERMISSION_DELETE = "contacts.delete_contact"
@@ -1050,3 +1504,387 @@ class UserProfile(Model):
         db_table = db_table(_app_label, _contacts_user_profile)
         verbose_name = _(_contacts_user_profile_verbose)
         verbose_name_plural = _(pluralize(_contacts_user_profile_verbose))
+
+
+_permission_ids = {}
+
+
+def permission_ids():
+    """Return dict of contact object permission to Permission id.
+
+    The Permission rows are resolved once and cached;
+    clear_permission_ids resets the cache.
+    """
+    if not _permission_ids:
+        codenames = dict(
+            (permission.split(".")[1], permission)
+            for permission in PERMISSIONS_CONTACT_OBJECT)
+        queryset = django.contrib.auth.models.Permission.objects.filter(
+            content_type__app_label=_app_label,
+            codename__in=list(codenames)).values_list("codename", "id")
+        _permission_ids.update(
+            (codenames[codename], pk) for codename, pk in queryset)
+    return _permission_ids
+
+
+def clear_permission_ids():
+    """Clear cached Permission ids."""
+    _permission_ids.clear()
+
+
+def _profile_targets(profile_ids, field_name):
+    """Return dict of profile id to target ids of profile m2m field."""
+    field = UserProfile._meta.get_field(field_name)
+    source_name = field.m2m_field_name()
+    target_name = field.m2m_reverse_field_name()
+    targets = collections.defaultdict(list)
+    queryset = field.remote_field.through.objects.filter(
+        **{source_name + "__in": profile_ids}).values_list(
+        source_name, target_name)
+    for profile_id, target_id in queryset:
+        targets[profile_id].append(target_id)
+    return targets
+
+
+def assign_contact_permissions(contacts):
+    """Grant object permissions on newly created contacts.
+
+    The contact creation user is granted all contact object permissions,
+    and the users and groups of the creation user profile are granted
+    read or write permission.  Equivalent to guardian assign_perm for each
+    permission and target, using one bulk insert per permission table.
+    """
+    if not settings.USE_OBJECT_PERMISSIONS:
+        return
+    owners = collections.OrderedDict()
+    for contact in contacts:
+        user = contact.creation_user
+        if user.username != settings.ANONYMOUS_USER_NAME:
+            owners.setdefault(user.pk, []).append(contact)
+    if not owners:
+        return
+
+    profiles = dict(UserProfile.objects.filter(
+        user__in=list(owners)).values_list("user", "id"))
+    for user_id in owners:
+        if user_id not in profiles:
+            logger.error("expected profile for user %s missing", user_id)
+            raise UserProfile.DoesNotExist(
+                "UserProfile for user %s does not exist" % user_id)
+
+    ids = permission_ids()
+    read, write = ids[PERMISSION_READ], ids[PERMISSION_WRITE]
+    profile_ids = list(profiles.values())
+    targets = [
+        (_profile_targets(profile_ids, field_name), permission_id, is_group)
+        for field_name, permission_id, is_group in (
+            (_users_read, read, False), (_users_write, write, False),
+            (_groups_read, read, True), (_groups_write, write, True))]
+
+    user_rows, group_rows = set(), set()
+    for user_id, owned in owners.items():
+        profile_id = profiles[user_id]
+        user_grants = set((user_id, permission_id)
+                          for permission_id in ids.values())
+        group_grants = set()
+        for profile_targets, permission_id, is_group in targets:
+            grants = group_grants if is_group else user_grants
+            grants.update((target_id, permission_id)
+                          for target_id in profile_targets[profile_id])
+        for contact in owned:
+            user_rows.update(
+                (target_id, permission_id, contact.pk)
+                for target_id, permission_id in user_grants)
+            group_rows.update(
+                (target_id, permission_id, contact.pk)
+                for target_id, permission_id in group_grants)
+
+    ContactObjectPermission.objects.bulk_create(
+        ContactObjectPermission(
+            user_id=user_id, permission_id=permission_id,
+            content_object_id=contact_id)
+        for user_id, permission_id, contact_id in sorted(user_rows))
+    ContactGroupObjectPermission.objects.bulk_create(
+        ContactGroupObjectPermission(
+            group_id=group_id, permission_id=permission_id,
+            content_object_id=contact_id)
+        for group_id, permission_id, contact_id in sorted(group_rows))
+
+
+# Type model classes whose instances are cached, see cache module.
+TYPE_MODEL_CLASSES = (
+    ContactType, ContactRelationshipType, AddressType, EmailType,
+    GeographicLocationType, InstantMessagingType, LanguageType, LogoType,
+    NicknameType, PhoneType, PhotoType, TimezoneType, UrlType)
+
+CHANGE_CREATED = "created"
+CHANGE_UPDATED = "updated"
+CHANGE_DELETED = "deleted"
+CHANGE_ACTIONS = (CHANGE_CREATED, CHANGE_UPDATED, CHANGE_DELETED)
+CHANGE_LOG_CLASSES = (Contact,) + CONTACT_ASSOCIATION_CLASSES + (
+    RelatedContact,)
+
+_contact_change = "ContactChange"
+_contact_change_verbose = humanize(underscore(_contact_change))
+
+
+class ContactChange(Model):
+    """Contact change log model class.
+
+    Records each create, update and delete of contact and contact
+    association instances, in change order.  Deleted instances, and those
+    flagged as deleted, are recorded as tombstones.  The change id is the
+    change feed cursor.
+    """
+    id = BigAutoField(primary_key=True)
+    model_name = CharField(max_length=100)
+    object_uuid = UUIDField()
+    contact_id = IntegerField(null=True, blank=True, db_index=True)
+    action = CharField(
+        max_length=10, choices=[(action, action) for action in CHANGE_ACTIONS])
+    version = IntegerField(null=True, blank=True)
+    change_time = DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta(ContactsModel.Meta):
+        db_table = db_table(_app_label, _contact_change)
+        verbose_name = _(_contact_change_verbose)
+        verbose_name_plural = _(pluralize(_contact_change_verbose))
+        get_latest_by = "id"
+
+
+_deleted_contact_reader = "DeletedContactReader"
+_deleted_contact_reader_verbose = humanize(underscore(_deleted_contact_reader))
+
+
+class DeletedContactReader(Model):
+    """Deleted contact reader model class.
+
+    Records the users and groups granted read permission on a contact
+    when it is deleted, since its object permissions are deleted with it.
+    The change log tombstones of the contact remain readable by them only.
+    """
+    contact_id = IntegerField(db_index=True)
+    user = fields.foreign_key_field(
+        settings.AUTH_USER_MODEL, on_delete=CASCADE, null=True, blank=True)
+    group = fields.foreign_key_field(
+        django.contrib.auth.models.Group, on_delete=CASCADE,
+        null=True, blank=True)
+
+    class Meta(ContactsModel.Meta):
+        db_table = db_table(_app_label, _deleted_contact_reader)
+        verbose_name = _(_deleted_contact_reader_verbose)
+        verbose_name_plural = _(pluralize(_deleted_contact_reader_verbose))
+        get_latest_by = "id"
+
+
+def record_contact_readers(contact_ids):
+    """Record the readers of contacts about to be deleted."""
+    if not settings.USE_OBJECT_PERMISSIONS:
+        return
+    permission_id = permission_ids()[PERMISSION_READ]
+    readers = [
+        DeletedContactReader(contact_id=contact_id, user_id=user_id)
+        for contact_id, user_id in ContactObjectPermission.objects.filter(
+            content_object__in=contact_ids,
+            permission_id=permission_id).values_list(
+            "content_object", "user")]
+    readers.extend(
+        DeletedContactReader(contact_id=contact_id, group_id=group_id)
+        for contact_id, group_id in
+        ContactGroupObjectPermission.objects.filter(
+            content_object__in=contact_ids,
+            permission_id=permission_id).values_list(
+            "content_object", "group"))
+    DeletedContactReader.objects.bulk_create(readers)
+
+
+def _change_contact_id(instance):
+    """Return id of the contact changed with instance."""
+    if isinstance(instance, Contact):
+        return instance.pk
+    field = association_fields(type(instance))[0]
+    return getattr(instance, field.attname)
+
+
+def _change(instance, action):
+    """Return ContactChange instance for changed instance."""
+    if action != CHANGE_DELETED and getattr(instance, "deleted", False):
+        action = CHANGE_DELETED
+    return ContactChange(
+        model_name=instance._meta.model_name, object_uuid=instance.uuid,
+        contact_id=_change_contact_id(instance), action=action,
+        version=getattr(instance, "version", None))
+
+
+def record_change(instance, action):
+    """Record change of a contact or contact association instance."""
+    return _change(instance, action).save()
+
+
+def record_changes(instances, action):
+    """Record changes of instances created or updated in bulk."""
+    ContactChange.objects.bulk_create(
+        _change(instance, action) for instance in instances)
+
+
+def changed_instances(changes):
+    """Return dict of (model name, uuid) to instances of changes.
+
+    Issues one query per changed model class; deleted instances
+    are not included.
+    """
+    model_classes = dict((model_class._meta.model_name, model_class)
+                         for model_class in CHANGE_LOG_CLASSES)
+    uuids = collections.defaultdict(set)
+    for change in changes:
+        if change.action != CHANGE_DELETED:
+            uuids[change.model_name].add(change.object_uuid)
+    instances = {}
+    for model_name, values in uuids.items():
+        for chunk in chunked(values):
+            for instance in model_classes[model_name].objects.filter(
+                    uuid__in=chunk):
+                instances[(model_name, instance.uuid)] = instance
+    return instances
+
+
+# Association classes whose instances are included in the search document.
+SEARCH_ASSOCIATION_CLASSES = (
+    ContactEmail, ContactFormattedName, ContactName, ContactNickname,
+    ContactOrganization, ContactPhone)
+
+_contact_search_document = "ContactSearchDocument"
+_contact_search_document_verbose = humanize(
+    underscore(_contact_search_document))
+
+
+class ContactSearchDocument(Model):
+    """Contact search document model class.
+
+    Denormalized, lower case text of the contact names, nicknames, emails,
+    phones and organizations, indexed for full text search, see search
+    module.
+    """
+    contact = OneToOneField(
+        Contact, on_delete=CASCADE, primary_key=True,
+        related_name="search_document")
+    document = TextField(blank=True)
+
+    class Meta(ContactsModel.Meta):
+        db_table = db_table(_app_label, _contact_search_document)
+        verbose_name = _(_contact_search_document_verbose)
+        verbose_name_plural = _(pluralize(_contact_search_document_verbose))
+        get_latest_by = "contact"
+
+LOOKUP_EMAIL = "email"
+LOOKUP_PHONE = "phone"
+LOOKUP_KINDS = (LOOKUP_EMAIL, LOOKUP_PHONE)
+
+_contact_lookup = "ContactLookup"
+_contact_lookup_verbose = humanize(underscore(_contact_lookup))
+
+
+class ContactLookup(Model):
+    """Contact reverse lookup model class.
+
+    Maps normalized email addresses and phone numbers to the contacts
+    they are associated with, see lookup module.
+    """
+    kind = CharField(
+        max_length=10, choices=[(kind, kind) for kind in LOOKUP_KINDS])
+    value = CharField(max_length=254)
+    contact = fields.foreign_key_field(Contact, on_delete=CASCADE)
+
+    class Meta(ContactsModel.Meta):
+        db_table = db_table(_app_label, _contact_lookup)
+        verbose_name = _(_contact_lookup_verbose)
+        verbose_name_plural = _(pluralize(_contact_lookup_verbose))
+        unique_together = ("kind", "value", "contact")
+        get_latest_by = "id"
+
+_contact_summary = "ContactSummary"
+_contact_summary_verbose = humanize(underscore(_contact_summary))
+
+
+class ContactSummary(Model):
+    """Contact summary model class.
+
+    Denormalized contact list data: the display name, type, primary email,
+    phone and organization, and association counts of the contact, such
+    that contacts are listed from a single table, see summary module.
+    """
+    contact = OneToOneField(
+        Contact, on_delete=CASCADE, primary_key=True, related_name="summary")
+    display_name = CharField(max_length=255, blank=True)
+    contact_type = CharField(max_length=255, blank=True)
+    primary_email = CharField(max_length=254, blank=True)
+    primary_phone = CharField(max_length=50, blank=True)
+    organization = CharField(max_length=255, blank=True)
+    address_count = IntegerField(default=0)
+    email_count = IntegerField(default=0)
+    phone_count = IntegerField(default=0)
+    organization_count = IntegerField(default=0)
+    priority = IntegerField(default=0)
+    version = IntegerField(default=0)
+    update_time = DateTimeField(null=True, blank=True)
+    update_user = CharField(max_length=150, blank=True)
+
+    class Meta(ContactsModel.Meta):
+        db_table = db_table(_app_label, _contact_summary)
+        verbose_name = _(_contact_summary_verbose)
+        verbose_name_plural = _(pluralize(_contact_summary_verbose))
+        indexes = keyset_indexes("summary", "contact")
+        get_latest_by = "contact"
+
+DUPLICATE_EMAIL = "email"
+DUPLICATE_PHONE = "phone"
+DUPLICATE_NAME = "name"
+DUPLICATE_KINDS = (DUPLICATE_EMAIL, DUPLICATE_PHONE, DUPLICATE_NAME)
+
+_duplicate_key = "DuplicateKey"
+_duplicate_key_verbose = humanize(underscore(_duplicate_key))
+
+
+class DuplicateKey(Model):
+    """Contact duplicate blocking key model class.
+
+    Contacts sharing a blocking key are compared by the duplicate
+    detection job, see dedup module.
+    """
+    key = CharField(max_length=254)
+    contact = fields.foreign_key_field(Contact, on_delete=CASCADE)
+
+    class Meta(ContactsModel.Meta):
+        db_table = db_table(_app_label, _duplicate_key)
+        verbose_name = _(_duplicate_key_verbose)
+        verbose_name_plural = _(pluralize(_duplicate_key_verbose))
+        unique_together = ("key", "contact")
+        get_latest_by = "id"
+
+_duplicate_candidate = "DuplicateCandidate"
+_duplicate_candidate_verbose = humanize(underscore(_duplicate_candidate))
+
+
+class DuplicateCandidate(Model):
+    """Contact duplicate candidate model class.
+
+    A pair of contacts sharing blocking keys, contact id lower than
+    duplicate id, scored from 0 to 1 by the kinds of keys shared.
+    """
+    contact = fields.foreign_key_field(
+        Contact,
+        on_delete=CASCADE,
+        related_name="%(app_label)s_%(class)s_contact")
+    duplicate = fields.foreign_key_field(
+        Contact,
+        on_delete=CASCADE,
+        related_name="%(app_label)s_%(class)s_duplicate")
+    score = FloatField()
+    reasons = CharField(max_length=50)
+
+    class Meta(ContactsModel.Meta):
+        db_table = db_table(_app_label, _duplicate_candidate)
+        verbose_name = _(_duplicate_candidate_verbose)
+        verbose_name_plural = _(pluralize(_duplicate_candidate_verbose))
+        unique_together = ("contact", "duplicate")
+        get_latest_by = "id"
@@ -0,0 +1,274 @@
+"""
+..  module:: contacts.pagination
+    :synopsis: contacts application pagination module.
+
+*contacts*  application pagination module.
+
+List endpoints default to limit/offset pagination.  Clients walking large
+result sets select keyset pagination with the 'pagination=cursor' query
+parameter, and follow the returned 'next' links.  Keyset pages are ordered
+on ('priority', 'id') or ('update_time', 'id'), selected with the
+'ordering' query parameter, and are retrieved using the matching composite
+index whatever the page depth.
+"""
+from __future__ import absolute_import
+
+import base64
+import collections
+import datetime
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def get_limit(request, query_param, default_limit, max_limit):
+    """Return request page size."""
+    try:
+        limit = int(request.query_params[query_param])
+    except (KeyError, ValueError):
+        return default_limit
+    return max(1, min(limit, max_limit))
+
+
+Cursor = collections.namedtuple(
+    "Cursor", ["ordering", "value", "pk", "reverse"])
+
+
+class KeysetPagination(BasePagination):
+    """Keyset pagination class.
+
+    The cursor holds the ordering field value and id of the page boundary
+    instance, the next page is filtered on values past the boundary.
+    """
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    limit_query_param = "limit"
+    orderings = ("priority", "-priority", "update_time", "-update_time")
+    default_ordering = "priority"
+    default_limit = api_settings.PAGE_SIZE
+    max_limit = 1000
+    invalid_cursor_message = _("Invalid cursor")
+    invalid_ordering_message = _("Invalid ordering")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            self.cursor = Cursor(
+                self.get_ordering(request), None, None, False)
+        ordering, value, pk, reverse = self.cursor
+        self.field_name = ordering.lstrip("-")
+        descending = ordering.startswith("-") != reverse
+
+        if pk is not None:
+            lookup = "__lt" if descending else "__gt"
+            queryset = queryset.filter(
+                Q(**{self.field_name + lookup: value}) |
+                Q(**{self.field_name: value, "pk" + lookup: pk}))
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(
+            prefix + self.field_name, prefix + "pk")
+
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = pk is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, pk is not None
+        self.results = results
+        return results
+
+    def get_limit(self, request):
+        return get_limit(request, self.limit_query_param,
+                         self.default_limit, self.max_limit)
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(
+            self.ordering_query_param, self.default_ordering)
+        if ordering not in self.orderings:
+            raise NotFound(self.invalid_ordering_message)
+        return ordering
+
+    def decode_cursor(self, request):
+        """Return request Cursor instance, or None."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            ordering, value, pk, reverse = json.loads(
+                base64.urlsafe_b64decode(
+                    encoded.encode("ascii")).decode("utf-8"))
+            if ordering not in self.orderings:
+                raise ValueError(ordering)
+            if ordering.lstrip("-") == "update_time":
+                value = parse_datetime(value)
+                if value is None:
+                    raise ValueError(value)
+            return Cursor(ordering, value, int(pk), bool(reverse))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse):
+        """Return url with cursor on (value, pk) position."""
+        value, pk = position
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        encoded = base64.urlsafe_b64encode(json.dumps(
+            [self.cursor.ordering, value, pk, reverse]).encode(
+            "utf-8")).decode("ascii")
+        return replace_query_param(
+            remove_query_param(self.base_url, self.ordering_query_param),
+            self.cursor_query_param, encoded)
+
+    def position(self, index):
+        """Return (value, pk) position of result instance at index.
+
+        An empty page keeps the current cursor position.
+        """
+        if not self.results:
+            return self.cursor.value, self.cursor.pk
+        instance = self.results[index]
+        return getattr(instance, self.field_name), instance.pk
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.position(-1), False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.position(0), True)
+
+    def get_paginated_response(self, data):
+        return Response(collections.OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data)
+        ]))
+
+
+class ContactsPagination(LimitOffsetPagination):
+    """Contacts list pagination class.
+
+    Uses limit/offset pagination, unless keyset pagination is
+    selected by the client.
+    """
+    mode_query_param = "pagination"
+    keyset_mode = "cursor"
+    keyset_class = KeysetPagination
+
+    def is_keyset(self, request):
+        """Return True if the request selects keyset pagination."""
+        params = request.query_params
+        return (params.get(self.mode_query_param) == self.keyset_mode or
+                self.keyset_class.cursor_query_param in params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.is_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super(ContactsPagination, self).paginate_queryset(
+            queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super(ContactsPagination, self).get_paginated_response(data)
+
+
+class ChangePagination(BasePagination):
+    """Change feed pagination class.
+
+    Changes are listed in change id order, after the change id passed as
+    'cursor', or from the 'since' time on the first request.  The
+    response 'cursor' is the watermark to pass on the next request.
+
+    Change ids are allocated on insert but become visible on commit, so a
+    transaction committing after a concurrent one may add changes below
+    the watermark.  Changes younger than CONTACTS_CHANGE_FEED_LAG seconds
+    are held back until they settle; transactions running for longer than
+    the lag may still be missed.
+    """
+    cursor_query_param = "cursor"
+    since_query_param = "since"
+    limit_query_param = "limit"
+    default_limit = api_settings.PAGE_SIZE
+    max_limit = 1000
+    invalid_cursor_message = _("Invalid cursor")
+    invalid_since_message = _("Invalid since time")
+    default_lag = 5
+
+    def get_lag(self):
+        """Return change settling time delta."""
+        return datetime.timedelta(seconds=getattr(
+            settings, "CONTACTS_CHANGE_FEED_LAG", self.default_lag))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        limit = get_limit(request, self.limit_query_param,
+                          self.default_limit, self.max_limit)
+        queryset = queryset.filter(
+            change_time__lte=timezone.now() - self.get_lag())
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(id__gt=cursor)
+        else:
+            since = self.decode_since(request)
+            if since is not None:
+                queryset = queryset.filter(change_time__gte=since)
+        results = list(queryset.order_by("id")[:limit + 1])
+        self.has_next = len(results) > limit
+        self.results = results[:limit]
+        self.cursor = self.results[-1].id if self.results else cursor
+        return self.results
+
+    def decode_cursor(self, request):
+        """Return request cursor change id, or None."""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is None:
+            return None
+        try:
+            return int(cursor)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def decode_since(self, request):
+        """Return request since time, or None."""
+        since = request.query_params.get(self.since_query_param)
+        if since is None:
+            return None
+        try:
+            value = parse_datetime(since)
+        except ValueError:
+            value = None
+        if value is None:
+            raise NotFound(self.invalid_since_message)
+        return value
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            remove_query_param(self.base_url, self.since_query_param),
+            self.cursor_query_param, self.cursor)
+
+    def get_paginated_response(self, data):
+        return Response(collections.OrderedDict([
+            ("next", self.get_next_link()),
+            ("cursor", self.cursor),
+            ("results", data)
+        ]))
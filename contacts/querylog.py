@@ -0,0 +1,114 @@
+"""
+.. module::  contacts.querylog
+   :synopsis:  contacts application slow and duplicate query log module.
+
+*contacts* application slow and duplicate query log module.
+
+A database execute wrapper, installed on each new connection, logs:
+
+* queries slower than CONTACTS_SLOW_QUERY_SECONDS.
+* SQL executed CONTACTS_DUPLICATE_QUERY_COUNT or more times within one
+  request, the N+1 query signature, once at the end of the request.
+
+Records are logged to the 'contacts.querylog' logger as space separated
+key=value fields, with a sample of the contacts application stack frames
+which executed the query.  Either check is disabled by setting its
+threshold to None.  Requires Django connection.execute_wrapper, not
+available before Django 2.0.
+"""
+from __future__ import absolute_import
+import logging
+import os
+import threading
+import timeit
+import traceback
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_SECONDS = 0.5
+DEFAULT_DUPLICATE_QUERY_COUNT = 10
+STACK_SAMPLE_SIZE = 3
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_MODULE_PATH = os.path.splitext(os.path.abspath(__file__))[0]
+_state = threading.local()
+
+
+def _slow_query_seconds():
+    return getattr(settings, "CONTACTS_SLOW_QUERY_SECONDS",
+                   DEFAULT_SLOW_QUERY_SECONDS)
+
+
+def _duplicate_query_count():
+    return getattr(settings, "CONTACTS_DUPLICATE_QUERY_COUNT",
+                   DEFAULT_DUPLICATE_QUERY_COUNT)
+
+
+def stack_sample(size=STACK_SAMPLE_SIZE):
+    """Return the innermost contacts application frames, as text."""
+    frames = [frame for frame in traceback.extract_stack()[:-1]
+              if frame[0].startswith(_PACKAGE_DIR) and
+              not frame[0].startswith(_MODULE_PATH)]
+    return " < ".join(
+        "%s:%d:%s" % (os.path.relpath(file_name, _PACKAGE_DIR), line, name)
+        for file_name, line, name, _ in reversed(frames[-size:])) or "-"
+
+
+def _one_line(sql):
+    return " ".join(sql.split())
+
+
+def execute(execute, sql, params, many, context):
+    """Database execute wrapper logging slow and counting queries."""
+    start = timeit.default_timer()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = timeit.default_timer() - start
+        threshold = _slow_query_seconds()
+        if threshold is not None and duration >= threshold:
+            logger.warning(
+                "slow_query duration_ms=%.1f path=%s location=%s sql=%s",
+                duration * 1000, getattr(_state, "path", "-"),
+                stack_sample(), _one_line(sql))
+        counts = getattr(_state, "counts", None)
+        if counts is not None:
+            count, location = counts.get(sql, (0, None))
+            count += 1
+            if count == _duplicate_query_count():
+                location = stack_sample()
+            counts[sql] = (count, location)
+
+
+def install(connection):
+    """Install the execute wrapper on connection, once.
+
+    The wrapper is installed first, outermost: connections are opened
+    within connection.execute_wrapper blocks, which remove the last
+    wrapper on exit.
+    """
+    wrappers = getattr(connection, "execute_wrappers", None)
+    if wrappers is not None and execute not in wrappers:
+        wrappers.insert(0, execute)
+
+
+def request_started(path):
+    """Start counting the queries of request on path."""
+    _state.path = path
+    _state.counts = {} if _duplicate_query_count() is not None else None
+
+
+def request_finished():
+    """Log the SQL repeated within the request, stop counting."""
+    counts = getattr(_state, "counts", None)
+    threshold = _duplicate_query_count()
+    if counts and threshold is not None:
+        for sql, (count, location) in counts.items():
+            if count >= threshold:
+                logger.warning(
+                    "duplicate_query count=%d path=%s location=%s sql=%s",
+                    count, _state.path, location, _one_line(sql))
+    _state.counts = None
+    _state.path = None
@@ -0,0 +1,189 @@
+"""
+.. module::  contacts.search
+   :synopsis:  contacts application full text search module.
+
+*contacts* application full text search module.
+
+The searchable text of a contact (names, formatted names, nicknames,
+emails, phones and organizations) is denormalized into a
+ContactSearchDocument, kept current by the contact, association and
+referenced name, email, phone and organization signal handlers.
+Documents are indexed by:
+
+* Postgres: a GIN index on the document 'simple' configuration tsvector.
+* SQLite: an FTS5 external content table, maintained by triggers.
+
+Both are created by the ContactSearchDocument migration.  Search terms
+match as prefixes of the document words, and all terms must match.
+Other databases, or SQLite builds without FTS5, fall back to substring
+matching on the document: terms match anywhere within words.
+"""
+from __future__ import absolute_import
+import collections
+import re
+import threading
+
+from django.db import connection
+from django.db.models import Prefetch
+from django.utils.encoding import force_text
+
+from . import models
+
+FTS_TABLE = "sl_contacts_contact_search_fts"
+
+# Name components included in the search document.
+_NAME_COMPONENTS = (
+    "given_name", "additional_name", "family_name",
+    "honorific_prefix", "honorific_suffix")
+
+# Search association classes with the attributes of their instances
+# included in the search document.
+_ASSOCIATION_ATTRIBUTES = (
+    (models.ContactName, ("name",), _NAME_COMPONENTS),
+    (models.ContactFormattedName, ("name",), ("name",)),
+    (models.ContactNickname, ("name",), ("name",)),
+    (models.ContactEmail, ("email",), ("address",)),
+    (models.ContactPhone, ("phone",), ("number",)),
+    (models.ContactOrganization, ("organization", "unit"), ("name",)),
+)
+
+# Contact and association fields referencing the instances included in
+# the search document.
+_REFERENCE_FIELDS = ((models.Contact, "name"),
+                     (models.Contact, "formatted_name")) + tuple(
+    (association_class, field_name)
+    for association_class, field_names, _ in _ASSOCIATION_ATTRIBUTES
+    for field_name in field_names)
+
+# Model classes of the instances included in the search document.
+REFERENCED_CLASSES = tuple(collections.OrderedDict(
+    (model_class._meta.get_field(field_name).related_model, None)
+    for model_class, field_name in _REFERENCE_FIELDS))
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_state = threading.local()
+
+
+def _values(instance, attr_names):
+    """Return text values of instance attributes, defaulting to its text."""
+    if instance is None:
+        return []
+    values = [force_text(getattr(instance, attr_name))
+              for attr_name in attr_names
+              if getattr(instance, attr_name, None)]
+    return values or [force_text(instance)]
+
+
+def document_queryset(queryset=None):
+    """Return contact queryset prefetching the search document data."""
+    queryset = (models.Contact.objects.all()
+                if queryset is None else queryset)
+    return queryset.select_related("name", "formatted_name").prefetch_related(
+        *[Prefetch(models.association_accessor(association_class),
+                   queryset=association_class.objects.select_related(
+                       *field_names))
+          for association_class, field_names, _ in _ASSOCIATION_ATTRIBUTES])
+
+
+def document_text(contact, associations=True):
+    """Return search document text of contact.
+
+    Associations are excluded for newly created contacts, which have none.
+    """
+    values = _values(contact.name, _NAME_COMPONENTS)
+    values.extend(_values(contact.formatted_name, ("name",)))
+    for association_class, field_names, attr_names in (
+            _ASSOCIATION_ATTRIBUTES if associations else ()):
+        accessor = models.association_accessor(association_class)
+        for association in getattr(contact, accessor).all():
+            for field_name in field_names:
+                values.extend(_values(
+                    getattr(association, field_name), attr_names))
+    return " ".join(values).lower()
+
+
+def create_document(contact):
+    """Create search document of newly created contact."""
+    models.ContactSearchDocument.objects.create(
+        contact=contact, document=document_text(contact, False))
+
+
+def _update_documents(contact_ids):
+    for chunk in models.chunked(contact_ids):
+        documents = [
+            models.ContactSearchDocument(
+                contact=contact, document=document_text(contact))
+            for contact in document_queryset().filter(pk__in=chunk)]
+        models.ContactSearchDocument.objects.filter(
+            contact__in=chunk).delete()
+        models.ContactSearchDocument.objects.bulk_create(documents)
+
+
+_updates = models.DeferredUpdates(_update_documents)
+
+# Context manager rebuilding search documents once, on exit.
+deferred_updates = _updates.deferred
+
+
+def update_documents(contact_ids):
+    """Rebuild search documents of contacts, skipping deleted contacts.
+
+    Within deferred_updates, the documents are rebuilt on exit.
+    """
+    _updates.update(contact_ids)
+
+
+def update_referencing_documents(instance):
+    """Rebuild search documents of contacts including changed instance.
+
+    instance is a name, email, phone or other referenced class instance.
+    """
+    update_documents(
+        models.referencing_contact_ids(instance, _REFERENCE_FIELDS))
+
+
+def search_terms(text):
+    """Return lower case search terms of text."""
+    return _TERM_PATTERN.findall(force_text(text).lower())
+
+
+def _fts_available():
+    """Return True if the sqlite FTS5 table exists."""
+    if not hasattr(_state, "fts_available"):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name = %s",
+                [FTS_TABLE])
+            _state.fts_available = bool(cursor.fetchone()[0])
+    return _state.fts_available
+
+
+def matching_documents(terms):
+    """Return ContactSearchDocument queryset matching all terms."""
+    queryset = models.ContactSearchDocument.objects.all()
+    if connection.vendor == "postgresql":
+        return queryset.extra(
+            where=["to_tsvector('simple', document) @@ "
+                   "to_tsquery('simple', %s)"],
+            params=[" & ".join("%s:*" % term for term in terms)])
+    if connection.vendor == "sqlite" and _fts_available():
+        return queryset.extra(
+            where=["contact_id IN (SELECT rowid FROM %s WHERE %s MATCH %%s)"
+                   % (FTS_TABLE, FTS_TABLE)],
+            params=[" ".join('"%s"*' % term for term in terms)])
+    for term in terms:
+        queryset = queryset.filter(document__contains=term)
+    return queryset
+
+
+def search_contacts(text, queryset=None):
+    """Return contacts queryset filtered on contacts matching text."""
+    queryset = (models.Contact.objects.all()
+                if queryset is None else queryset)
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none()
+    return queryset.filter(
+        pk__in=matching_documents(terms).values("contact"))
+
@@ -6,12 +6,40 @@
 """
 from __future__ import absolute_import
 
+from django.core.exceptions import ValidationError
+from rest_framework.serializers import (ModelSerializer,
+                                        PrimaryKeyRelatedField,
+                                        SerializerMethodField)
+
 from django_core_utils.serializers import (NamedModelSerializer,
                                            PrioritizedModelSerializer)
 
+from . import cache
 from . import models
 
 
+class TypeRelatedField(PrimaryKeyRelatedField):
+    """Primary key related field, validating type references from cache.
+
+    Type model instances are looked up in the type cache, see cache
+    module, other related instances in the field queryset.
+    """
+
+    def to_internal_value(self, data):
+        model_class = self.get_queryset().model
+        if model_class not in models.TYPE_MODEL_CLASSES:
+            return super(TypeRelatedField, self).to_internal_value(data)
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        try:
+            return cache.cached_get(
+                model_class, pk=model_class._meta.pk.to_python(data))
+        except model_class.DoesNotExist:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError, ValidationError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
 class ContactRelationshipTypeSerializer(NamedModelSerializer):
     """ContactRelationshipType model serializer class."""
 
@@ -30,6 +58,8 @@ class ContactTypeSerializer(NamedModelSerializer):
 
 class ContactsModelSerializer(PrioritizedModelSerializer):
     """ContactsModel serializer class."""
+    serializer_related_field = TypeRelatedField
+
     class Meta(PrioritizedModelSerializer.Meta):
         """Meta class definition."""
         model = models.ContactsModel
@@ -264,3 +294,121 @@ class RelatedContactSerializer(PrioritizedModelSerializer):
         model = models.RelatedContact
         fields = PrioritizedModelSerializer.Meta.fields + (
             "from_contact", "to_contact", "contact_relationship_type")
+
+
+def _associations(serializer_class, association_class, field_name="contact"):
+    """Return read only nested serializer for contact association instances."""
+    return serializer_class(
+        source=models.association_accessor(association_class, field_name),
+        many=True, read_only=True)
+
+
+class ContactFullSerializer(ContactSerializer):
+    """Contact model serializer class including all contact associations.
+
+    Expects the instance to be retrieved using
+    ContactManager.with_associations to avoid a query per association.
+    """
+    addresses = _associations(
+        ContactAddressSerializer, models.ContactAddress)
+    annotations = _associations(
+        ContactAnnotationSerializer, models.ContactAnnotation)
+    categories = _associations(
+        ContactCategorySerializer, models.ContactCategory)
+    emails = _associations(
+        ContactEmailSerializer, models.ContactEmail)
+    formatted_names = _associations(
+        ContactFormattedNameSerializer, models.ContactFormattedName)
+    geographic_locations = _associations(
+        ContactGeographicLocationSerializer, models.ContactGeographicLocation)
+    groups = _associations(
+        ContactGroupSerializer, models.ContactGroup)
+    instant_messaging = _associations(
+        ContactInstantMessagingSerializer, models.ContactInstantMessaging)
+    languages = _associations(
+        ContactLanguageSerializer, models.ContactLanguage)
+    logos = _associations(
+        ContactLogoSerializer, models.ContactLogo)
+    names = _associations(
+        ContactNameSerializer, models.ContactName)
+    nicknames = _associations(
+        ContactNicknameSerializer, models.ContactNickname)
+    organizations = _associations(
+        ContactOrganizationSerializer, models.ContactOrganization)
+    phones = _associations(
+        ContactPhoneSerializer, models.ContactPhone)
+    photos = _associations(
+        ContactPhotoSerializer, models.ContactPhoto)
+    roles = _associations(
+        ContactRoleSerializer, models.ContactRole)
+    timezones = _associations(
+        ContactTimezoneSerializer, models.ContactTimezone)
+    titles = _associations(
+        ContactTitleSerializer, models.ContactTitle)
+    urls = _associations(
+        ContactUrlSerializer, models.ContactUrl)
+    related_contacts = _associations(
+        RelatedContactSerializer, models.RelatedContact, "from_contact")
+    related_by_contacts = _associations(
+        RelatedContactSerializer, models.RelatedContact, "to_contact")
+
+    class Meta(ContactSerializer.Meta):
+        """Meta class definition."""
+        fields = ContactSerializer.Meta.fields + (
+            "addresses", "annotations", "categories", "emails",
+            "formatted_names", "geographic_locations", "groups",
+            "instant_messaging", "languages", "logos", "names",
+            "nicknames", "organizations", "phones", "photos", "roles",
+            "timezones", "titles", "urls",
+            "related_contacts", "related_by_contacts")
+
+
+CHANGE_SERIALIZER_CLASSES = dict(
+    (serializer_class.Meta.model._meta.model_name, serializer_class)
+    for serializer_class in (
+        ContactSerializer, ContactAddressSerializer,
+        ContactAnnotationSerializer, ContactCategorySerializer,
+        ContactEmailSerializer, ContactFormattedNameSerializer,
+        ContactGeographicLocationSerializer, ContactGroupSerializer,
+        ContactInstantMessagingSerializer, ContactLanguageSerializer,
+        ContactLogoSerializer, ContactNameSerializer,
+        ContactNicknameSerializer, ContactOrganizationSerializer,
+        ContactPhoneSerializer, ContactPhotoSerializer,
+        ContactRoleSerializer, ContactTimezoneSerializer,
+        ContactTitleSerializer, ContactUrlSerializer,
+        RelatedContactSerializer))
+
+
+class ContactChangeSerializer(ModelSerializer):
+    """ContactChange model serializer class.
+
+    The changed instance data is serialized from the context 'instances',
+    see models.changed_instances; it is None for deleted instances.
+    """
+    data = SerializerMethodField()
+
+    class Meta(object):
+        """Meta class definition."""
+        model = models.ContactChange
+        fields = ("id", "model_name", "object_uuid", "contact_id",
+                  "action", "version", "change_time", "data")
+
+    def get_data(self, change):
+        instance = self.context.get("instances", {}).get(
+            (change.model_name, change.object_uuid))
+        if instance is None:
+            return None
+        serializer_class = CHANGE_SERIALIZER_CLASSES[change.model_name]
+        return serializer_class(instance, context=self.context).data
+
+
+class ContactSummarySerializer(ModelSerializer):
+    """ContactSummary model serializer class."""
+
+    class Meta(object):
+        """Meta class definition."""
+        model = models.ContactSummary
+        fields = ("contact", "display_name", "contact_type", "primary_email",
+                  "primary_phone", "organization", "address_count",
+                  "email_count", "phone_count", "organization_count",
+                  "priority", "version", "update_time", "update_user")
@@ -7,15 +7,23 @@ Django contacts application configuration  module.
 """
 from __future__ import absolute_import
 import logging
-from django.db.models.signals import post_save
+from django.db.models.signals import (post_delete, post_migrate, post_save,
+                                      pre_delete, pre_save)
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+from django.db.backends.signals import connection_created
 from django.dispatch import receiver
 from django_core_utils.utils import current_site
 
-from guardian.shortcuts import assign_perm
-
+from . import adjacency
+from . import cache
+from . import lookup
 from . import models
+from . import querylog
+from . import search
+from . import summary
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +41,6 @@ def _create_params(user, **kwargs):
     return params
 
 
-def _assign_permissions(contact, permission, targets):
-    """Grant contact permission to collection of users or groups"""
-    for target in targets:
-        assign_perm(permission, target, contact)
-
-
 @receiver(post_save, sender=models.Contact)
 def contact_post_save(sender, **kwargs):
     """
@@ -46,24 +48,273 @@ def contact_post_save(sender, **kwargs):
     """
     contact, created = kwargs["instance"], kwargs["created"]
     if created:
-        user = contact.creation_user
-        if (user.username != settings.ANONYMOUS_USER_NAME and
-                settings.USE_OBJECT_PERMISSIONS):
-            # assign owner permissions
-            for permission in models.PERMISSIONS_CONTACT_OBJECT:
-                assign_perm(permission, user, contact)
-            # assign permissions from user profile
-            try:
-                profile = models.UserProfile.objects.get(user=user)
-            except models.UserProfile.DoesNotExist:
-                logger.exception("expected profile for user %s missing", user)
-                raise
-            permissions = [models.PERMISSION_READ, models.PERMISSION_WRITE] * 2
-            permission_targets = [
-                profile.users_read.all(), profile.users_write.all(),
-                profile.groups_read.all(), profile.groups_write.all()]
-            for permission, target in zip(permissions, permission_targets):
-                _assign_permissions(contact, permission, target)
+        models.assign_contact_permissions([contact])
+
+
+@receiver(pre_delete, sender=models.Contact)
+def contact_pre_delete(sender, **kwargs):
+    """
+    Skip denormalized data updates while the contact is deleted,
+    and record its readers before its permissions are deleted.
+    """
+    contact_id = kwargs["instance"].pk
+    models.deleting_contact_ids().add(contact_id)
+    models.record_contact_readers([contact_id])
+
+
+@receiver(post_delete, sender=models.Contact)
+def contact_post_delete(sender, **kwargs):
+    models.deleting_contact_ids().discard(kwargs["instance"].pk)
+
+
+def change_post_save(sender, **kwargs):
+    """
+    Record contact and contact association instance create or update.
+    """
+    action = (models.CHANGE_CREATED if kwargs["created"]
+              else models.CHANGE_UPDATED)
+    models.record_change(kwargs["instance"], action)
+
+
+def change_post_delete(sender, **kwargs):
+    """
+    Record contact and contact association instance delete.
+    """
+    models.record_change(kwargs["instance"], models.CHANGE_DELETED)
+
+
+@receiver(models.post_bulk_create)
+def change_post_bulk_create(sender, **kwargs):
+    """
+    Record contact and contact association instances created in bulk.
+    """
+    if sender in models.CHANGE_LOG_CLASSES:
+        models.record_changes(kwargs["instances"], models.CHANGE_CREATED)
+
+
+for _model_class in models.CHANGE_LOG_CLASSES:
+    post_save.connect(change_post_save, sender=_model_class)
+    post_delete.connect(change_post_delete, sender=_model_class)
+
+
+def _contact_id(instance):
+    return instance.pk if isinstance(instance, models.Contact) else (
+        instance.contact_id)
+
+
+def search_post_change(sender, **kwargs):
+    """
+    Update the search document of the changed contact.
+    """
+    instance = kwargs["instance"]
+    if sender is models.Contact and kwargs.get("created"):
+        search.create_document(instance)
+    else:
+        search.update_documents([_contact_id(instance)])
+
+
+@receiver(models.post_bulk_create)
+def search_post_bulk_create(sender, **kwargs):
+    """
+    Update the search documents of contacts changed in bulk.
+    """
+    if sender is models.Contact or sender in models.SEARCH_ASSOCIATION_CLASSES:
+        search.update_documents(
+            _contact_id(instance) for instance in kwargs["instances"])
+
+
+def search_referenced_post_save(sender, **kwargs):
+    """
+    Update the search documents of contacts including the changed instance.
+    """
+    if not kwargs["created"]:
+        search.update_referencing_documents(kwargs["instance"])
+
+
+post_save.connect(search_post_change, sender=models.Contact)
+for _model_class in models.SEARCH_ASSOCIATION_CLASSES:
+    post_save.connect(search_post_change, sender=_model_class)
+    post_delete.connect(search_post_change, sender=_model_class)
+for _model_class in search.REFERENCED_CLASSES:
+    post_save.connect(search_referenced_post_save, sender=_model_class)
+
+
+def summary_post_change(sender, **kwargs):
+    """
+    Update the summary of the changed contact.
+    """
+    instance = kwargs["instance"]
+    if sender is models.Contact and kwargs.get("created"):
+        summary.create_summary(instance)
+    else:
+        summary.update_summaries([_contact_id(instance)])
+
+
+@receiver(models.post_bulk_create)
+def summary_post_bulk_create(sender, **kwargs):
+    """
+    Update the summaries of contacts changed in bulk.
+    """
+    if (sender is models.Contact or
+            sender in summary.SUMMARY_ASSOCIATION_CLASSES):
+        summary.update_summaries(
+            _contact_id(instance) for instance in kwargs["instances"])
+
+
+def summary_referenced_post_save(sender, **kwargs):
+    """
+    Update the summaries of contacts referencing the changed instance.
+    """
+    if not kwargs["created"]:
+        summary.update_referencing_summaries(kwargs["instance"])
+
+
+post_save.connect(summary_post_change, sender=models.Contact)
+for _model_class in summary.SUMMARY_ASSOCIATION_CLASSES:
+    post_save.connect(summary_post_change, sender=_model_class)
+    post_delete.connect(summary_post_change, sender=_model_class)
+for _model_class in summary.REFERENCED_CLASSES:
+    post_save.connect(summary_referenced_post_save, sender=_model_class)
+
+
+def lookup_post_change(sender, **kwargs):
+    """
+    Update the reverse lookup values of the changed contact.
+    """
+    lookup.update_lookups(sender, [kwargs["instance"].contact_id])
+
+
+@receiver(models.post_bulk_create)
+def lookup_post_bulk_create(sender, **kwargs):
+    """
+    Update the reverse lookup values of contacts changed in bulk.
+    """
+    if sender in lookup.LOOKUP_CLASSES:
+        lookup.update_lookups(
+            sender, (instance.contact_id for instance in kwargs["instances"]))
+
+
+@receiver(post_save, sender=models.Email)
+def lookup_email_post_save(sender, **kwargs):
+    """
+    Update the reverse lookup values of contacts with the changed email.
+    """
+    if not kwargs["created"]:
+        lookup.update_referencing_lookups(
+            models.ContactEmail, "email", kwargs["instance"])
+
+
+@receiver(post_save, sender=models.Phone)
+def lookup_phone_post_save(sender, **kwargs):
+    """
+    Update the reverse lookup values of contacts with the changed phone.
+    """
+    if not kwargs["created"]:
+        lookup.update_referencing_lookups(
+            models.ContactPhone, "phone", kwargs["instance"])
+
+
+for _model_class in lookup.LOOKUP_CLASSES:
+    post_save.connect(lookup_post_change, sender=_model_class)
+    post_delete.connect(lookup_post_change, sender=_model_class)
+
+
+def type_post_change(sender, **kwargs):
+    """
+    Invalidate type model cached instances, now and on commit.
+    """
+    cache.invalidate(sender)
+    transaction.on_commit(lambda: cache.invalidate(sender))
+
+
+for _model_class in models.TYPE_MODEL_CLASSES:
+    post_save.connect(type_post_change, sender=_model_class)
+    post_delete.connect(type_post_change, sender=_model_class)
+
+
+def _invalidate_adjacencies(contact_ids):
+    adjacency.invalidate(contact_ids)
+    transaction.on_commit(lambda: adjacency.invalidate(contact_ids))
+
+
+@receiver(pre_save, sender=models.RelatedContact)
+def adjacency_pre_save(sender, **kwargs):
+    """
+    Invalidate adjacencies of the contacts an updated edge is moved from.
+    """
+    instance = kwargs["instance"]
+    if instance.pk is not None:
+        _invalidate_adjacencies(
+            sender.objects.filter(pk=instance.pk).values_list(
+                "from_contact_id", "to_contact_id").first() or ())
+
+
+@receiver(post_save, sender=models.RelatedContact)
+@receiver(post_delete, sender=models.RelatedContact)
+def adjacency_post_change(sender, **kwargs):
+    """
+    Invalidate cached adjacencies of the related contacts, now and on
+    commit.
+    """
+    instance = kwargs["instance"]
+    _invalidate_adjacencies(
+        [instance.from_contact_id, instance.to_contact_id])
+
+
+@receiver(models.post_bulk_create)
+def adjacency_post_bulk_create(sender, **kwargs):
+    """
+    Invalidate cached adjacencies of contacts related in bulk.
+    """
+    if sender is models.RelatedContact:
+        _invalidate_adjacencies(set(
+            contact_id for instance in kwargs["instances"]
+            for contact_id in (instance.from_contact_id,
+                               instance.to_contact_id)))
+
+
+@receiver(models.post_merge)
+def merge_post_merge(sender, **kwargs):
+    """
+    Rebuild the denormalized data of the merged survivor contact, and
+    invalidate the adjacencies of contacts whose relations moved.
+    """
+    survivor_ids = [kwargs["survivor"].pk]
+    search.update_documents(survivor_ids)
+    summary.update_summaries(survivor_ids)
+    for association_class in lookup.LOOKUP_CLASSES:
+        lookup.update_lookups(association_class, survivor_ids)
+    _invalidate_adjacencies(
+        set(kwargs["contact_ids"]) | set(kwargs["victim_ids"]))
+
+
+@receiver(connection_created)
+def querylog_connection_created(sender, **kwargs):
+    """
+    Install the slow and duplicate query log on new connections.
+    """
+    querylog.install(kwargs["connection"])
+
+
+@receiver(request_started)
+def querylog_request_started(sender, **kwargs):
+    environ = kwargs.get("environ") or {}
+    querylog.request_started(environ.get("PATH_INFO", "-"))
+
+
+@receiver(request_finished)
+def querylog_request_finished(sender, **kwargs):
+    querylog.request_finished()
+
+
+@receiver(post_migrate)
+def permissions_post_migrate(sender, **kwargs):
+    """
+    Clear cached Permission ids and type instances, which may be recreated
+    by migrate or flush.
+    """
+    models.clear_permission_ids()
+    cache.clear()
 
 
 @receiver(post_save, sender=User)
@@ -0,0 +1,150 @@
+"""
+.. module::  contacts.summary
+   :synopsis:  contacts application contact summary module.
+
+*contacts* application contact summary module.
+
+The contact list data (display name, type, primary email, phone and
+organization, and association counts) is denormalized into a
+ContactSummary row per contact, kept current by the contact, association
+and referenced name, type, email, phone and organization signal handlers,
+such that contacts are listed from a single table.  Primary associations
+are those of lowest priority, then id.
+"""
+from __future__ import absolute_import
+import collections
+
+from django.db.models import CharField, Count, Prefetch
+from django.utils.encoding import force_text
+
+from . import models
+
+# Association classes whose instances are counted, with the summary
+# count field name.
+_COUNTED_CLASSES = (
+    (models.ContactAddress, "address_count"),
+    (models.ContactEmail, "email_count"),
+    (models.ContactOrganization, "organization_count"),
+    (models.ContactPhone, "phone_count"),
+)
+
+# Association classes whose primary instance is summarized, with the
+# related field name, summary field name and related instance attribute.
+_PRIMARY_CLASSES = (
+    (models.ContactEmail, "email", "primary_email", "address"),
+    (models.ContactOrganization, "organization", "organization", "name"),
+    (models.ContactPhone, "phone", "primary_phone", "number"),
+)
+
+SUMMARY_ASSOCIATION_CLASSES = tuple(
+    association_class for association_class, _ in _COUNTED_CLASSES)
+
+
+# Contact and association fields referencing the instances summarized.
+_REFERENCE_FIELDS = (
+    (models.Contact, "name"), (models.Contact, "formatted_name"),
+    (models.Contact, "contact_type")) + tuple(
+    (association_class, field_name)
+    for association_class, field_name, _, _ in _PRIMARY_CLASSES)
+
+# Model classes of the instances summarized.
+REFERENCED_CLASSES = tuple(collections.OrderedDict(
+    (model_class._meta.get_field(field_name).related_model, None)
+    for model_class, field_name in _REFERENCE_FIELDS))
+
+
+def _text(instance, attr_name=None):
+    if instance is None:
+        return ""
+    value = getattr(instance, attr_name) if attr_name else instance
+    return force_text(value) if value else ""
+
+
+def summary_queryset(queryset=None):
+    """Return contact queryset prefetching the summary data."""
+    queryset = (models.Contact.objects.all()
+                if queryset is None else queryset)
+    return queryset.select_related(
+        "name", "formatted_name", "contact_type",
+        "update_user").prefetch_related(
+        *[Prefetch(models.association_accessor(association_class),
+                   queryset=association_class.objects.select_related(
+                       field_name).order_by("priority", "id"))
+          for association_class, field_name, _, _ in _PRIMARY_CLASSES])
+
+
+def _counts(contact_ids):
+    """Return dict of association counts, keyed by contact id."""
+    counts = {}
+    for association_class, count_field in _COUNTED_CLASSES:
+        for contact_id, count in association_class.objects.filter(
+                contact__in=contact_ids).values_list("contact").annotate(
+                count=Count("id")).order_by():
+            counts.setdefault(contact_id, {})[count_field] = count
+    return counts
+
+
+def summary(contact, counts=None, associations=True):
+    """Return ContactSummary instance of contact.
+
+    Associations are excluded for newly created contacts, which have none.
+    """
+    instance = models.ContactSummary(
+        contact=contact,
+        display_name=_text(contact.display_name),
+        contact_type=_text(contact.contact_type, "name"),
+        priority=contact.priority,
+        version=contact.version,
+        update_time=contact.update_time,
+        update_user=_text(contact.update_user, "username"),
+        **(counts or {}))
+    for association_class, field_name, summary_field, attr_name in (
+            _PRIMARY_CLASSES if associations else ()):
+        accessor = models.association_accessor(association_class)
+        primary = next(iter(getattr(contact, accessor).all()), None)
+        if primary is not None:
+            setattr(instance, summary_field, _text(
+                getattr(primary, field_name), attr_name))
+    for field in instance._meta.fields:
+        if isinstance(field, CharField):
+            setattr(instance, field.attname,
+                    getattr(instance, field.attname)[:field.max_length])
+    return instance
+
+
+def create_summary(contact):
+    """Create summary of newly created contact."""
+    summary(contact, associations=False).save(force_insert=True)
+
+
+def _update_summaries(contact_ids):
+    for chunk in models.chunked(contact_ids):
+        counts = _counts(chunk)
+        summaries = [
+            summary(contact, counts.get(contact.pk))
+            for contact in summary_queryset().filter(pk__in=chunk)]
+        models.ContactSummary.objects.filter(contact__in=chunk).delete()
+        models.ContactSummary.objects.bulk_create(summaries)
+
+
+_updates = models.DeferredUpdates(_update_summaries)
+
+# Context manager rebuilding summaries once, on exit.
+deferred_updates = _updates.deferred
+
+
+def update_summaries(contact_ids):
+    """Rebuild summaries of contacts, skipping deleted contacts.
+
+    Within deferred_updates, the summaries are rebuilt on exit.
+    """
+    _updates.update(contact_ids)
+
+
+def update_referencing_summaries(instance):
+    """Rebuild summaries of contacts referencing changed instance.
+
+    instance is a name, contact type, email, phone or organization.
+    """
+    update_summaries(
+        models.referencing_contact_ids(instance, _REFERENCE_FIELDS))
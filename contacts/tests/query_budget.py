@@ -0,0 +1,176 @@
+"""
+.. module::  contacts.tests.query_budget
+   :synopsis: contacts application query budget unit test module.
+
+*contacts* application query budget unit test module.
+
+QueryBudgetMixin asserts an API test case endpoint list, detail, create
+and update requests issue the same number of queries whatever the number
+of rows seeded with the test case factory_class.  Detail and update
+requests are also measured with a growing number of associations of the
+requested instance contact.  The failure message is a diff of the SQL
+captured with the fewest and most rows.  NamedQueryBudgetMixin applies
+the same to named type API test cases.
+"""
+from __future__ import absolute_import, print_function
+import difflib
+import json
+
+from django.db import connection
+from django.db.models import ForeignKey
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import models
+
+_AUDIT_FIELDS = ("creation_user", "effective_user", "update_user", "site")
+
+
+class QueryBudgetMixin(object):
+    """API test case mixin asserting constant request query counts.
+
+    Applies to test cases defining factory_class, url_list and url_detail,
+    the tests are skipped otherwise.  Association instances are seeded
+    for the requested contact with related_factory_classes, defaulting to
+    the factory_class of association test cases.
+    """
+    budget_sizes = (1, 5)
+    related_factory_classes = ()
+
+    def budget_applies(self):
+        if not all(getattr(self, attr, None) for attr in (
+                "factory_class", "url_list", "url_detail")):
+            self.skipTest("no factory_class, url_list or url_detail")
+
+    def budget_seed(self, count):
+        """Create count instances."""
+        for _ in range(count):
+            self.factory_class()
+
+    def budget_seed_related(self, instance, count):
+        """Create count instances and instance contact associations.
+
+        count associations are created with each related factory class.
+        """
+        self.budget_seed(count)
+        if isinstance(instance, models.Contact):
+            contact = instance
+        else:
+            contact = getattr(instance, models.association_fields(
+                type(instance))[0].name)
+        for factory_class in (self.related_factory_classes or
+                              (self.factory_class,)):
+            field_name = models.association_fields(
+                factory_class._meta.model)[0].name
+            for _ in range(count):
+                factory_class(**{field_name: contact})
+
+    def budget_data(self):
+        """Return create request data.
+
+        The data are the foreign key ids of a factory instance, deleted
+        to allow creating the same association.
+        """
+        instance = self.factory_class()
+        data = {}
+        for field_name in self.serializer_class.Meta.fields:
+            if field_name in _AUDIT_FIELDS:
+                continue
+            field = instance._meta.get_field(field_name)
+            if isinstance(field, ForeignKey):
+                value = getattr(instance, field.attname)
+                if value is not None:
+                    data[field_name] = value
+        instance.delete()
+        return data
+
+    def budget_update_data(self):
+        """Return update request data."""
+        return dict(priority=5)
+
+    def budget_request(self, method, url, data=None):
+        """Send request, return list of the SQL captured."""
+        if data is not None:
+            data = json.dumps(data)
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(
+                url, data, content_type="application/json")
+        self.assertLess(response.status_code, 300, response.content)
+        return [query["sql"] for query in context.captured_queries]
+
+    def assert_query_budget(self, request, seed=None):
+        """Assert request issues the same queries with more rows seeded.
+
+        request is called without arguments after each seeding, and
+        returns the SQL captured.  seed is called with the number of rows
+        to add, defaulting to budget_seed.
+        """
+        seed = seed or self.budget_seed
+        captured = []
+        seeded = 0
+        for size in self.budget_sizes:
+            seed(size - seeded)
+            seeded = size
+            captured.append(request())
+        fewest, most = captured[0], captured[-1]
+        if len(fewest) != len(most):
+            self.fail("%d queries with %d rows, %d with %d rows:\n%s" % (
+                len(fewest), self.budget_sizes[0],
+                len(most), self.budget_sizes[-1],
+                "\n".join(difflib.unified_diff(
+                    fewest, most, lineterm=""))))
+
+    def test_list_query_budget(self):
+        self.budget_applies()
+        url = reverse(self.url_list)
+        self.assert_query_budget(lambda: self.budget_request("get", url))
+
+    def test_detail_query_budget(self):
+        self.budget_applies()
+        instance = self.factory_class()
+        url = reverse(self.url_detail, kwargs=dict(pk=instance.pk))
+        self.assert_query_budget(
+            lambda: self.budget_request("get", url),
+            lambda count: self.budget_seed_related(instance, count))
+
+    def test_create_query_budget(self):
+        self.budget_applies()
+        url = reverse(self.url_list)
+        self.assert_query_budget(
+            lambda: self.budget_request("post", url, self.budget_data()))
+
+    def test_update_query_budget(self):
+        self.budget_applies()
+        instance = self.factory_class()
+        url = reverse(self.url_detail, kwargs=dict(pk=instance.pk))
+        self.assert_query_budget(
+            lambda: self.budget_request(
+                "patch", url, self.budget_update_data()),
+            lambda count: self.budget_seed_related(instance, count))
+
+
+class NamedQueryBudgetMixin(QueryBudgetMixin):
+    """Named type API test case mixin asserting constant query counts.
+
+    Types are seeded, created and updated with unique names, and have no
+    contact associations to seed.
+    """
+    budget_names = 0
+
+    def budget_name(self):
+        """Return a unique type name."""
+        self.budget_names += 1
+        return "budget %d" % self.budget_names
+
+    def budget_seed(self, count):
+        for _ in range(count):
+            self.factory_class(name=self.budget_name())
+
+    def budget_seed_related(self, instance, count):
+        self.budget_seed(count)
+
+    def budget_data(self):
+        return dict(name=self.budget_name())
+
+    def budget_update_data(self):
+        return dict(name=self.budget_name())
@@ -0,0 +1,116 @@
+"""
+.. module::  contacts.tests.test_adjacency
+   :synopsis: contacts application adjacency cache unit test module.
+
+*contacts* application adjacency cache unit test module.
+"""
+from __future__ import absolute_import, print_function
+import mock
+from django.core.cache import caches
+from django.test import override_settings
+
+from . import factories
+from . import test_models
+from .. import adjacency
+from .. import models
+
+
+@override_settings(CONTACTS_ADJACENCY_CACHE="default")
+class AdjacencyTestCase(test_models.ContactsVersionedModelTestCase):
+    """Relationship adjacency cache unit test class."""
+
+    def setUp(self):
+        super(AdjacencyTestCase, self).setUp()
+        caches["default"].clear()
+        self.friend = factories.ContactRelationshipTypeModelFactory(
+            name="friend")
+        self.colleague = factories.ContactRelationshipTypeModelFactory(
+            name="colleague")
+        self.a, self.b, self.c, self.d = [
+            factories.ContactModelFactory() for _ in range(4)]
+        self.relate(self.a, self.b, self.friend)
+        self.relate(self.c, self.a, self.colleague)
+        self.relate(self.d, self.b, self.friend)
+
+    def relate(self, from_contact, to_contact, relationship_type):
+        return factories.RelatedContactModelFactory(
+            from_contact=from_contact, to_contact=to_contact,
+            contact_relationship_type=relationship_type)
+
+    def neighbors(self, contact, **kwargs):
+        return set(models.Contact.objects.neighbors(contact, **kwargs))
+
+    def test_neighbors(self):
+        self.assertEqual(self.neighbors(self.a), set([self.b, self.c]))
+        self.assertEqual(self.neighbors(self.a, direction="out"),
+                         set([self.b]))
+        self.assertEqual(self.neighbors(self.a, direction="in"),
+                         set([self.c]))
+        self.assertEqual(
+            self.neighbors(self.a, type_ids=[self.colleague.id]),
+            set([self.c]))
+
+    def test_neighbors_cached(self):
+        self.neighbors(self.a)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.neighbors(self.a), set([self.b, self.c]))
+
+    def test_mutual_connections(self):
+        self.assertEqual(
+            set(models.Contact.objects.mutual_connections(self.a, self.d)),
+            set([self.b]))
+        self.assertEqual(
+            set(models.Contact.objects.mutual_connections(
+                self.a, self.d, type_ids=[self.colleague.id])),
+            set())
+
+    def test_invalidated(self):
+        self.neighbors(self.a)
+        self.neighbors(self.b)
+        related = self.relate(self.a, self.d, self.friend)
+        self.assertEqual(self.neighbors(self.a),
+                         set([self.b, self.c, self.d]))
+        related.delete()
+        self.assertEqual(self.neighbors(self.a), set([self.b, self.c]))
+
+        related = models.RelatedContact.objects.get(
+            from_contact=self.a, to_contact=self.b)
+        related.to_contact = self.d
+        related.save()
+        self.assertEqual(self.neighbors(self.b), set([self.d]))
+        self.assertEqual(self.neighbors(self.a), set([self.c, self.d]))
+
+    def test_invalidated_bulk_create(self):
+        self.neighbors(self.c)
+        related = models.RelatedContact(
+            from_contact=self.c, to_contact=self.d,
+            contact_relationship_type=self.friend,
+            **dict((field_name, getattr(self.a, field_name)) for field_name in
+                   ("creation_user", "effective_user", "update_user",
+                    "site")))
+        models.RelatedContact.objects.bulk_create([related])
+        models.post_bulk_create.send(
+            sender=models.RelatedContact, instances=[related])
+        self.assertEqual(self.neighbors(self.c), set([self.a, self.d]))
+
+    def test_invalidated_during_load(self):
+        load = adjacency.load
+
+        def racing_load(contact_ids):
+            loaded = load(contact_ids)
+            # an edge change is committed after the load
+            adjacency.invalidate(contact_ids)
+            return loaded
+
+        with mock.patch.object(adjacency, "load", side_effect=racing_load):
+            adjacency.adjacencies([self.a.id])
+        with self.assertNumQueries(2):
+            adjacency.adjacencies([self.a.id])
+        with self.assertNumQueries(0):
+            adjacency.adjacencies([self.a.id])
+
+    @override_settings(CONTACTS_ADJACENCY_CACHE=None)
+    def test_neighbors_not_cached(self):
+        self.neighbors(self.a)
+        with self.assertNumQueries(3):
+            self.assertEqual(self.neighbors(self.a), set([self.b, self.c]))
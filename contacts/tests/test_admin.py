@@ -0,0 +1,62 @@
+"""
+.. module::  contacts.tests.test_admin
+   :synopsis: contacts application admin unit test module.
+
+*contacts* application admin unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from guardian.shortcuts import assign_perm
+
+from django_core_utils.tests.factories import UserFactory
+
+from . import factories
+from . import test_models
+from .. import models
+
+
+class ContactAdminTestCase(test_models.ContactsVersionedModelTestCase):
+    """Contact admin changelist unit test class."""
+    url_changelist = "admin:contacts_contact_changelist"
+
+    def create_contacts(self, count, user=None):
+        for _ in range(count):
+            contact = factories.ContactModelFactory(
+                contact_type=factories.ContactTypeModelFactory())
+            if user is not None:
+                assign_perm(models.PERMISSION_READ, user, contact)
+
+    def changelist_queries(self, user):
+        """Render the changelist, return the number of queries."""
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(self.url_changelist))
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def verify_constant_queries(self, user, grantee=None):
+        self.create_contacts(10, grantee)
+        expected = self.changelist_queries(user)
+        self.create_contacts(90, grantee)
+        self.assertEqual(self.changelist_queries(user), expected)
+
+    def test_changelist_superuser(self):
+        user = UserFactory(is_staff=True, is_superuser=True)
+        self.verify_constant_queries(user)
+
+    def test_changelist_object_permissions(self):
+        user = UserFactory(is_staff=True)
+        user.user_permissions.add(Permission.objects.get(
+            content_type__app_label="contacts", codename="change_contact"))
+        self.verify_constant_queries(user, user)
+
+    def test_contact_str(self):
+        self.create_contacts(3)
+        contacts = list(models.Contact.objects.with_list_related())
+        with self.assertNumQueries(0):
+            for contact in contacts:
+                str(contact)
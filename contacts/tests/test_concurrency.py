@@ -0,0 +1,117 @@
+"""
+.. module::  contacts.tests.test_concurrency
+   :synopsis: contacts application optimistic concurrency unit test module.
+
+*contacts* application optimistic concurrency unit test module.
+"""
+from __future__ import absolute_import, print_function
+import json
+
+import mock
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from . import factories
+from . import test_views
+from .. import models
+from .. import views
+
+
+def _etag(version):
+    return '"%d"' % version
+
+
+class ConditionalUpdateApiTestCase(test_views.ContactAssociationApiTestCase):
+    """Conditional update API unit test class."""
+
+    def patch(self, url, **extra):
+        return self.client.patch(url, json.dumps(dict(priority=5)),
+                                 content_type="application/json", **extra)
+
+    def verify_conditional_update(self, url_name, instance):
+        url = reverse(url_name, kwargs=dict(pk=instance.pk))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertEqual(etag, _etag(instance.version))
+
+        response = self.patch(url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], _etag(instance.version + 1))
+        instance = type(instance).objects.get(pk=instance.pk)
+        self.assertEqual(instance.priority, 5)
+
+        response = self.patch(url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code,
+                         status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(type(instance).objects.get(
+            pk=instance.pk).version, instance.version)
+
+        response = self.patch(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], _etag(instance.version + 1))
+
+    def test_contact(self):
+        self.verify_conditional_update("contact-detail", self.contact)
+
+    def test_contact_email(self):
+        self.verify_conditional_update(
+            "contact-email-detail",
+            factories.ContactEmailModelFactory(contact=self.contact))
+
+    def test_related_contact(self):
+        self.verify_conditional_update(
+            "related-contact-detail",
+            factories.RelatedContactModelFactory(from_contact=self.contact))
+
+    def test_conditional_update_query(self):
+        url = reverse("contact-detail", kwargs=dict(pk=self.contact.pk))
+        with CaptureQueriesContext(connection) as context:
+            response = self.patch(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        table = connection.ops.quote_name(models.Contact._meta.db_table)
+        updates = [query["sql"] for query in context.captured_queries
+                   if query["sql"].startswith("UPDATE") and
+                   table in query["sql"].split("SET")[0]]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("version", updates[0].split("WHERE")[1])
+        self.assertEqual(models.Contact.objects.get(
+            pk=self.contact.pk).version, self.contact.version + 1)
+
+    def stale(self):
+        """Return patch of the detail views changing the instance read."""
+        def change(instance):
+            type(instance).objects.filter(pk=instance.pk).update(
+                version=F("version") + 1)
+        return mock.patch.object(
+            views.ContactsDetailView, "check_if_match", side_effect=change)
+
+    def test_update_conflict(self):
+        url = reverse("contact-detail", kwargs=dict(pk=self.contact.pk))
+        with self.stale():
+            response = self.patch(url)
+        self.assertEqual(response.status_code,
+                         status.HTTP_412_PRECONDITION_FAILED)
+        self.assertNotEqual(models.Contact.objects.get(
+            pk=self.contact.pk).priority, 5)
+
+    def test_delete_conflict(self):
+        url = reverse("contact-detail", kwargs=dict(pk=self.contact.pk))
+        with self.stale():
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code,
+                         status.HTTP_412_PRECONDITION_FAILED)
+        self.assertTrue(models.Contact.objects.filter(
+            pk=self.contact.pk).exists())
+
+    def test_delete_precondition_failed(self):
+        url = reverse("contact-detail", kwargs=dict(pk=self.contact.pk))
+        response = self.client.delete(
+            url, HTTP_IF_MATCH=_etag(self.contact.version + 1))
+        self.assertEqual(response.status_code,
+                         status.HTTP_412_PRECONDITION_FAILED)
+        self.assertTrue(models.Contact.objects.filter(
+            pk=self.contact.pk).exists())
@@ -0,0 +1,86 @@
+"""
+.. module::  contacts.tests.test_dedup
+   :synopsis: contacts application duplicate detection unit test module.
+
+*contacts* application duplicate detection unit test module.
+"""
+from __future__ import absolute_import, print_function
+import datetime
+
+from django.core.management import call_command
+from django.utils.six import StringIO
+
+from django_core_models.social_media.tests.factories import (
+    EmailModelFactory, NameModelFactory, PhoneModelFactory)
+
+from . import factories
+from . import test_models
+from .. import dedup
+from .. import models
+
+_BIRTH_DATE = datetime.date(1970, 5, 17)
+
+
+class SoundexTestCase(test_models.ContactsVersionedModelTestCase):
+    """Soundex unit test class."""
+
+    def test_soundex(self):
+        for name, code in (("Robert", "R163"), ("Rupert", "R163"),
+                           ("Ashcraft", "A261"), ("Tymczak", "T522"),
+                           ("Pfister", "P236"), ("Lee", "L000"),
+                           (u"Müller", "M460"), ("", "")):
+            self.assertEqual(dedup.soundex(name), code, name)
+
+
+class DedupTestCase(test_models.ContactsVersionedModelTestCase):
+    """Duplicate detection unit test class."""
+
+    def setUp(self):
+        super(DedupTestCase, self).setUp()
+        self.a = self.contact("Jon", "Smith", _BIRTH_DATE)
+        self.b = self.contact("John", "Smyth", _BIRTH_DATE)
+        self.c = self.contact("Ann", "Smith", datetime.date(1980, 1, 1))
+        self.d = self.contact("Anne", "Jones")
+        factories.ContactEmailModelFactory(
+            contact=self.a, email=EmailModelFactory(address="jon@example.com"))
+        factories.ContactEmailModelFactory(
+            contact=self.b, email=EmailModelFactory(address="JON@example.com"))
+        factories.ContactPhoneModelFactory(
+            contact=self.c, phone=PhoneModelFactory(number="+1 555 010 2030"))
+        factories.ContactPhoneModelFactory(
+            contact=self.d, phone=PhoneModelFactory(number="(555) 010-2030"))
+
+    def contact(self, given_name, family_name, birth_date=None):
+        return factories.ContactModelFactory(
+            name=NameModelFactory(given_name=given_name,
+                                  family_name=family_name),
+            birth_date=birth_date)
+
+    def candidates(self):
+        return dict(
+            ((candidate.contact_id, candidate.duplicate_id),
+             (candidate.reasons, candidate.score))
+            for candidate in models.DuplicateCandidate.objects.all())
+
+    def test_keys(self):
+        keys = dedup.chunk_keys((self.a.id, self.a.id))
+        self.assertEqual(keys, set([
+            ("email:jon@example.com", self.a.id),
+            ("name:S530J500:1970-05-17", self.a.id)]))
+
+    def test_find_duplicates(self):
+        self.assertEqual(dedup.find_duplicates(chunk_size=2), 2)
+        self.assertEqual(self.candidates(), {
+            (self.a.id, self.b.id): ("email,name", 0.8),
+            (self.c.id, self.d.id): ("phone", 0.4)})
+
+    def test_max_block_size(self):
+        self.assertEqual(dedup.find_duplicates(max_block_size=1), 0)
+        self.assertEqual(self.candidates(), {})
+
+    def test_command(self):
+        out = StringIO()
+        call_command("find_duplicate_contacts", "--chunk-size=3", stdout=out)
+        self.assertIn("Found 2 duplicate candidate pairs.", out.getvalue())
+        self.assertEqual(models.DuplicateKey.objects.filter(
+            contact=self.d).count(), 1)
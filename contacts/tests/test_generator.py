@@ -0,0 +1,65 @@
+"""
+.. module::  contacts.tests.test_generator
+   :synopsis: contacts application bulk data generator unit test module.
+
+*contacts* application bulk data generator unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.utils.six import StringIO
+
+from . import test_models
+from .. import cache
+from .. import generator
+from .. import models
+
+
+class GeneratorTestCase(test_models.ContactsVersionedModelTestCase):
+    """Bulk data generator unit test class."""
+
+    def test_generate(self):
+        contact_ids = generator.generate_contacts(
+            20, batch_size=7, users=3, seed=1)
+        self.assertEqual(len(contact_ids), 20)
+        contacts = models.Contact.objects.filter(pk__in=contact_ids)
+        self.assertEqual(contacts.count(), 20)
+        self.assertEqual(
+            contacts.values("creation_user").distinct().count(), 3)
+        self.assertTrue(models.ContactEmail.objects.filter(
+            contact__in=contact_ids).exists())
+        self.assertEqual(models.ContactSummary.objects.filter(
+            contact__in=contact_ids).count(), 20)
+
+    def generated_uuids(self, count, seed):
+        """Generate contacts, rolled back, return their uuids."""
+        with transaction.atomic():
+            contact_ids = generator.generate_contacts(count, seed=seed)
+            uuids = list(models.Contact.objects.filter(
+                pk__in=contact_ids).order_by("id").values_list(
+                "uuid", flat=True))
+            transaction.set_rollback(True)
+        cache.clear()
+        return uuids
+
+    def test_generate_reproducible(self):
+        self.assertEqual(self.generated_uuids(5, 2),
+                         self.generated_uuids(5, 2))
+
+    def test_generate_permissions(self):
+        with self.settings(USE_OBJECT_PERMISSIONS=True):
+            contact_ids = generator.generate_contacts(5, users=1, seed=3)
+        self.assertEqual(models.ContactObjectPermission.objects.filter(
+            content_object__in=contact_ids).values(
+            "content_object").distinct().count(), 5)
+
+    def test_command(self):
+        output = StringIO()
+        call_command("generate_contacts", "4", "--seed", "4",
+                     "--emails", "0", stdout=output)
+        self.assertIn("Generated 4 contacts", output.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("generate_contacts", "4", "--seed", "4",
+                         stdout=output)
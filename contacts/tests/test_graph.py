@@ -0,0 +1,204 @@
+"""
+.. module::  contacts.tests.test_graph
+   :synopsis: contacts application relationship graph unit test module.
+
+*contacts* application relationship graph unit test module.
+"""
+from __future__ import absolute_import, print_function
+import mock
+
+from django.urls import reverse
+from django.utils.http import urlencode
+from rest_framework import status
+
+from . import factories
+from . import test_models
+from . import test_views
+from .. import graph
+
+
+def _relate(from_contact, to_contact, relationship_type):
+    factories.RelatedContactModelFactory(
+        from_contact=from_contact, to_contact=to_contact,
+        contact_relationship_type=relationship_type)
+
+
+class GraphMixin(object):
+    """Relationship graph test mixin.
+
+    Creates contacts a -> b -> c -> d, a -> e -> d, a colleague of b,
+    and f -> g.
+    """
+
+    def create_graph(self, a=None):
+        self.friend = factories.ContactRelationshipTypeModelFactory(
+            name="friend")
+        self.colleague = factories.ContactRelationshipTypeModelFactory(
+            name="colleague")
+        self.a = a or factories.ContactModelFactory()
+        (self.b, self.c, self.d, self.e, self.f,
+         self.g) = [factories.ContactModelFactory() for _ in range(6)]
+        for from_contact, to_contact in ((self.a, self.b), (self.b, self.c),
+                                         (self.c, self.d), (self.a, self.e),
+                                         (self.e, self.d), (self.f, self.g)):
+            _relate(from_contact, to_contact, self.friend)
+        _relate(self.a, self.b, self.colleague)
+
+
+class GraphTestCase(GraphMixin, test_models.ContactsVersionedModelTestCase):
+    """Relationship graph unit test class."""
+
+    def setUp(self):
+        super(GraphTestCase, self).setUp()
+        self.create_graph()
+
+    def ids(self, *contacts):
+        return [contact.id for contact in contacts]
+
+    def verify_traversals(self):
+        nodes = graph.neighborhood(self.a.id, depth=1)
+        self.assertEqual(nodes.contacts, sorted(
+            [(self.b.id, 1), (self.e.id, 1)]))
+        self.assertFalse(nodes.truncated)
+        nodes = graph.neighborhood(self.d.id, depth=2,
+                                   direction=graph.DIRECTION_IN)
+        self.assertEqual(set(nodes.contacts), set(
+            [(self.c.id, 1), (self.e.id, 1), (self.b.id, 2),
+             (self.a.id, 2)]))
+        nodes = graph.neighborhood(self.a.id, depth=3, max_nodes=2)
+        self.assertEqual(len(nodes.contacts), 2)
+        self.assertTrue(nodes.truncated)
+
+        self.assertEqual(graph.shortest_path(self.a.id, self.d.id),
+                         self.ids(self.a, self.e, self.d))
+        self.assertEqual(
+            graph.shortest_path(self.b.id, self.d.id,
+                                type_ids=[self.friend.id]),
+            self.ids(self.b, self.c, self.d))
+        self.assertIsNone(graph.shortest_path(self.d.id, self.a.id))
+        self.assertIsNone(graph.shortest_path(
+            self.a.id, self.d.id, type_ids=[self.colleague.id]))
+        self.assertIsNone(graph.shortest_path(self.a.id, self.d.id,
+                                              max_depth=1))
+
+        self.assertEqual(graph.component(self.d.id).contacts, sorted(
+            self.ids(self.a, self.b, self.c, self.d, self.e)))
+        self.assertEqual(
+            graph.component(self.a.id, type_ids=[self.colleague.id]).contacts,
+            sorted(self.ids(self.a, self.b)))
+        self.assertEqual(graph.component(self.g.id).contacts,
+                         sorted(self.ids(self.f, self.g)))
+
+    def test_traversals(self):
+        self.verify_traversals()
+
+    def test_traversals_without_recursive_query(self):
+        with mock.patch.object(graph, "recursive_cte_supported",
+                               return_value=False):
+            self.verify_traversals()
+
+    def test_path_readable(self):
+        readable = set(self.ids(self.a, self.b, self.c, self.d))
+        self.assertEqual(
+            graph.shortest_path(
+                self.a.id, self.d.id,
+                readable=lambda ids: readable.intersection(ids)),
+            self.ids(self.a, self.b, self.c, self.d))
+        self.assertIsNone(graph.shortest_path(self.a.id, self.d.id,
+                                              max_nodes=1))
+
+    def test_neighborhood_readable(self):
+        readable = set(self.ids(self.a, self.c, self.d, self.e))
+        nodes = graph.neighborhood(
+            self.a.id, depth=3, direction=graph.DIRECTION_OUT,
+            readable=lambda ids: readable.intersection(ids))
+        # c is only reached through b
+        self.assertEqual(nodes.contacts, [(self.e.id, 1), (self.d.id, 2)])
+
+    def test_component_readable(self):
+        readable = set(self.ids(self.a, self.b, self.c))
+        self.assertEqual(
+            graph.component(
+                self.a.id,
+                readable=lambda ids: readable.intersection(ids)).contacts,
+            sorted(self.ids(self.a, self.b, self.c)))
+
+    def test_fan_out(self):
+        # a has 3 edges, e 2: e reached from d but not traversed.
+        self.assertEqual(
+            graph.component(self.d.id, fan_out=1).contacts,
+            sorted(self.ids(self.c, self.d, self.e)))
+        self.assertEqual(
+            graph.neighborhood(self.a.id, depth=2, fan_out=1).contacts,
+            sorted([(self.b.id, 1), (self.e.id, 1)]))
+
+
+class GraphApiTestCase(GraphMixin, test_views.ContactAssociationApiTestCase):
+    """Relationship graph API unit test class."""
+
+    def setUp(self):
+        super(GraphApiTestCase, self).setUp()
+        self.create_graph(a=self.contact)
+
+    def test_neighbors(self):
+        response = self.client.get(
+            reverse("contact-neighbor-list", kwargs=dict(pk=self.a.id)),
+            dict(depth=1, types=str(self.colleague.id)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["contacts"],
+                         [dict(id=self.b.id, depth=1)])
+        self.assertFalse(response.data["truncated"])
+
+    def test_neighbors_invalid(self):
+        url = reverse("contact-neighbor-list", kwargs=dict(pk=self.a.id))
+        for params in (dict(depth=graph.MAX_DEPTH + 1), dict(types="x"),
+                       dict(direction="up")):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code,
+                             status.HTTP_400_BAD_REQUEST, params)
+
+    def test_path(self):
+        response = self.client.get(reverse(
+            "contact-path-detail",
+            kwargs=dict(pk=self.a.id, to_pk=self.d.id)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["path"],
+                         [self.a.id, self.e.id, self.d.id])
+        response = self.client.get(reverse(
+            "contact-path-detail",
+            kwargs=dict(pk=self.d.id, to_pk=self.a.id)))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_component(self):
+        response = self.client.get(reverse(
+            "contact-component-list", kwargs=dict(pk=self.g.id)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["contacts"],
+                         sorted([self.f.id, self.g.id]))
+
+    def budget_seed_graph(self, count):
+        """Relate count more contacts from a and to d, and f to g."""
+        for _ in range(count):
+            contact = factories.ContactModelFactory()
+            _relate(self.a, contact, self.friend)
+            _relate(contact, self.d, self.friend)
+            _relate(self.f, factories.ContactModelFactory(), self.friend)
+
+    def assert_graph_query_budget(self, url_name, params=None, **kwargs):
+        url = reverse(url_name, kwargs=kwargs)
+        if params:
+            url = "%s?%s" % (url, urlencode(params))
+        self.assert_query_budget(
+            lambda: self.budget_request("get", url), self.budget_seed_graph)
+
+    def test_neighbors_query_budget(self):
+        self.assert_graph_query_budget(
+            "contact-neighbor-list", dict(depth=2), pk=self.a.id)
+
+    def test_path_query_budget(self):
+        self.assert_graph_query_budget(
+            "contact-path-detail", pk=self.a.id, to_pk=self.d.id)
+
+    def test_component_query_budget(self):
+        self.assert_graph_query_budget(
+            "contact-component-list", pk=self.g.id)
@@ -0,0 +1,123 @@
+"""
+.. module::  contacts.tests.test_lookup
+   :synopsis: contacts application reverse lookup unit test module.
+
+*contacts* application reverse lookup unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.utils.six import StringIO
+from rest_framework import status
+
+from django_core_models.social_media.tests.factories import (
+    EmailModelFactory, PhoneModelFactory)
+
+from . import factories
+from . import test_models
+from . import test_views
+from .. import lookup
+from .. import models
+
+_NUMBER = "+1 (555) 010-2030"
+_ADDRESS = "John.Doe@Example.com"
+
+
+class LookupTestCase(test_models.ContactsVersionedModelTestCase):
+    """Contact reverse lookup unit test class."""
+
+    def setUp(self):
+        super(LookupTestCase, self).setUp()
+        self.contact = factories.ContactModelFactory()
+        self.phone = factories.ContactPhoneModelFactory(
+            contact=self.contact, phone=PhoneModelFactory(number=_NUMBER))
+        self.email = factories.ContactEmailModelFactory(
+            contact=self.contact, email=EmailModelFactory(address=_ADDRESS))
+
+    def lookup(self, **kwargs):
+        return list(models.Contact.objects.filter(
+            pk__in=lookup.lookup_contact_ids(**kwargs)))
+
+    def test_normalize(self):
+        self.assertEqual(lookup.normalize_phone(_NUMBER), "15550102030")
+        self.assertEqual(lookup.normalize_email(" A@B.com "), "a@b.com")
+        self.assertIsNone(lookup.lookup_contact_ids(phone="-", email=""))
+
+    def test_lookup(self):
+        self.assertEqual(self.lookup(phone="+15550102030"), [self.contact])
+        self.assertEqual(self.lookup(email="john.doe@example.com"),
+                         [self.contact])
+        self.assertEqual(self.lookup(phone="+15550109999"), [])
+
+    def test_lookup_changed_phone(self):
+        phone = self.phone.phone
+        phone.number = "+1 555 010 9999"
+        phone.save()
+        self.assertEqual(self.lookup(phone=_NUMBER), [])
+        self.assertEqual(self.lookup(phone="15550109999"), [self.contact])
+
+    def test_lookup_deleted(self):
+        self.phone.delete()
+        self.assertEqual(self.lookup(phone=_NUMBER), [])
+        contact_id = self.contact.id
+        self.contact.delete()
+        self.assertFalse(models.ContactLookup.objects.filter(
+            contact_id=contact_id).exists())
+
+    def test_lookup_deleted_contact_queries(self):
+        table = models.ContactLookup._meta.db_table
+        with CaptureQueriesContext(connection) as context:
+            self.contact.delete()
+        # the lookup values are only deleted with the contact
+        self.assertEqual(len([query for query in context.captured_queries
+                              if table in query["sql"]]), 1)
+
+    def test_rebuild_command(self):
+        models.ContactLookup.objects.all().delete()
+        call_command("rebuild_contact_lookups", stdout=StringIO())
+        self.assertEqual(self.lookup(phone=_NUMBER), [self.contact])
+
+    def test_rebuild_command_chunks(self):
+        other = factories.ContactModelFactory()
+        factories.ContactEmailModelFactory(
+            contact=other, email=EmailModelFactory(address=_ADDRESS.upper()))
+        models.ContactLookup.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_contact_lookups", chunk_size=1, stdout=out)
+        self.assertIn("2 contacts", out.getvalue())
+        self.assertEqual(sorted(self.lookup(email=_ADDRESS),
+                                key=lambda contact: contact.pk),
+                         [self.contact, other])
+
+
+class ContactLookupApiTestCase(test_views.ContactAssociationApiTestCase):
+    """Contact reverse lookup API unit test class."""
+    url_lookup = "contact-lookup"
+
+    def test_lookup(self):
+        factories.ContactPhoneModelFactory(
+            contact=self.contact, phone=PhoneModelFactory(number=_NUMBER))
+        response = self.client.get(
+            reverse(self.url_lookup), dict(phone="+15550102030"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["contacts"], [self.contact.id])
+
+    def test_lookup_invalid(self):
+        response = self.client.get(reverse(self.url_lookup))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def budget_seed_phones(self, count):
+        """Create count contacts with the same phone number."""
+        for index in range(count):
+            factories.ContactPhoneModelFactory(
+                phone=PhoneModelFactory(number=_NUMBER + " " * index))
+
+    def test_lookup_query_budget(self):
+        url = "%s?%s" % (reverse(self.url_lookup),
+                         urlencode(dict(phone="+15550102030")))
+        self.assert_query_budget(
+            lambda: self.budget_request("get", url), self.budget_seed_phones)
@@ -0,0 +1,133 @@
+"""
+.. module::  contacts.tests.test_merge
+   :synopsis: contacts application contact merge unit test module.
+
+*contacts* application contact merge unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from guardian.shortcuts import assign_perm
+
+from django_core_utils.tests.factories import UserFactory
+from django_core_models.social_media.tests.factories import (
+    EmailModelFactory)
+
+from . import factories
+from . import test_models
+from .. import lookup
+from .. import models
+
+
+class MergeTestCase(test_models.ContactsVersionedModelTestCase):
+    """Contact merge unit test class."""
+
+    def setUp(self):
+        super(MergeTestCase, self).setUp()
+        self.survivor = factories.ContactModelFactory()
+        self.victims = [factories.ContactModelFactory() for _ in range(2)]
+        self.other = factories.ContactModelFactory()
+
+    def add_email(self, contact, email=None, email_type=None):
+        kwargs = dict(email_type=email_type) if email_type else {}
+        return factories.ContactEmailModelFactory(
+            contact=contact, email=email or EmailModelFactory(), **kwargs)
+
+    def relate(self, from_contact, to_contact, relationship_type):
+        return factories.RelatedContactModelFactory(
+            from_contact=from_contact, to_contact=to_contact,
+            contact_relationship_type=relationship_type)
+
+    def merge(self):
+        return models.Contact.objects.merge(self.survivor, self.victims)
+
+    def test_merge_associations(self):
+        shared = self.add_email(self.survivor)
+        duplicate = self.add_email(
+            self.victims[0], shared.email, shared.email_type)
+        moved = self.add_email(self.victims[0])
+        self.add_email(self.victims[1], moved.email, moved.email_type)
+        version = self.survivor.version
+
+        self.merge()
+
+        self.assertFalse(models.Contact.objects.filter(
+            pk__in=[victim.pk for victim in self.victims]).exists())
+        self.assertEqual(
+            set(models.ContactEmail.objects.filter(
+                contact=self.survivor).values_list("email", flat=True)),
+            set([shared.email_id, moved.email_id]))
+        self.assertEqual(self.survivor.version, version + 1)
+        self.assertEqual(models.ContactEmail.objects.get(
+            pk=moved.pk).version, moved.version + 1)
+        self.assertEqual(
+            list(lookup.lookup_contact_ids(
+                email=moved.email.address).values_list(
+                    "contact", flat=True)),
+            [self.survivor.pk])
+        self.assertEqual(models.ContactSummary.objects.get(
+            contact=self.survivor).email_count, 2)
+        self.assertTrue(models.ContactChange.objects.filter(
+            object_uuid=moved.uuid, action=models.CHANGE_UPDATED,
+            version=moved.version + 1).exists())
+        self.assertTrue(models.ContactChange.objects.filter(
+            object_uuid=duplicate.uuid,
+            action=models.CHANGE_DELETED).exists())
+
+    def test_merge_locks_in_order(self):
+        with CaptureQueriesContext(connection) as context:
+            self.merge()
+        lock = next(query["sql"] for query in context.captured_queries
+                    if query["sql"].startswith("SELECT"))
+        self.assertIn("ORDER BY", lock)
+
+    def test_merge_related_contacts(self):
+        friend = factories.ContactRelationshipTypeModelFactory()
+        self.relate(self.victims[0], self.other, friend)
+        self.relate(self.other, self.victims[1], friend)
+        self.relate(self.survivor, self.victims[0], friend)
+        self.relate(self.victims[1], self.other, friend)
+
+        self.merge()
+
+        self.assertEqual(
+            set(models.RelatedContact.objects.values_list(
+                "from_contact", "to_contact")),
+            set([(self.survivor.pk, self.other.pk),
+                 (self.other.pk, self.survivor.pk)]))
+
+    def test_merge_permissions(self):
+        user = UserFactory()
+        assign_perm(models.PERMISSION_READ, user, self.victims[0])
+        assign_perm(models.PERMISSION_READ, user, self.victims[1])
+
+        self.merge()
+
+        self.assertEqual(
+            models.ContactObjectPermission.objects.filter(
+                user=user).count(), 1)
+        self.assertTrue(user.has_perm(models.PERMISSION_READ, self.survivor))
+
+    def test_merge_invalid(self):
+        with self.assertRaises(ValueError):
+            models.Contact.objects.merge(self.survivor, [self.survivor])
+        with self.assertRaises(ValueError):
+            models.Contact.objects.merge(self.survivor, [])
+
+    def merge_queries(self, count, conflicting=1):
+        self.survivor = factories.ContactModelFactory()
+        self.victims = [factories.ContactModelFactory()]
+        for _ in range(count):
+            self.add_email(self.victims[0])
+        for _ in range(conflicting):
+            shared = self.add_email(self.survivor)
+            self.add_email(self.victims[0], shared.email, shared.email_type)
+        with CaptureQueriesContext(connection) as context:
+            self.merge()
+        return len(context.captured_queries)
+
+    def test_merge_query_count(self):
+        self.assertEqual(self.merge_queries(1), self.merge_queries(10))
+        self.assertEqual(self.merge_queries(1, conflicting=1),
+                         self.merge_queries(1, conflicting=10))
@@ -0,0 +1,85 @@
+"""
+.. module::  contacts.tests.test_metrics
+   :synopsis: contacts application request metrics unit test module.
+
+*contacts* application request metrics unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.db import connection
+from django.test import SimpleTestCase, modify_settings
+from django.urls import reverse
+from rest_framework import status
+
+from django_core_utils.tests.factories import UserFactory
+
+from . import test_views
+from .. import metrics
+
+
+class RegistryTestCase(SimpleTestCase):
+    """Request metrics registry unit test class."""
+
+    def test_prometheus(self):
+        registry = metrics.Registry()
+        request_metrics = metrics.RequestMetrics()
+        request_metrics.queries = 3
+        registry.record(("contact-list", "GET", "2xx"), request_metrics)
+        registry.record(("contact-list", "GET", "2xx"), request_metrics)
+        text = registry.prometheus()
+        labels = 'view="contact-list",method="GET",status="2xx"'
+        self.assertIn("# TYPE contacts_request_queries summary", text)
+        self.assertIn("contacts_request_queries_sum{%s} 6.0" % labels, text)
+        self.assertIn("contacts_request_queries_count{%s} 2" % labels, text)
+
+
+@modify_settings(MIDDLEWARE={"append": "contacts.metrics.MetricsMiddleware"})
+class MetricsMiddlewareTestCase(test_views.ContactAssociationApiTestCase):
+    """Request metrics middleware unit test class."""
+
+    def setUp(self):
+        super(MetricsMiddlewareTestCase, self).setUp()
+        metrics.registry.clear()
+
+    def test_server_timing(self):
+        response = self.client.get(reverse("contact-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        server_timing = response["Server-Timing"]
+        self.assertIn("serialize;dur=", server_timing)
+        if hasattr(connection, "execute_wrapper"):
+            self.assertNotIn('desc="0 queries"', server_timing)
+
+    def test_unknown_methods(self):
+        for method in ("FOO", "BAR"):
+            self.client.generic(method, reverse("contact-list"))
+        text = metrics.registry.prometheus()
+        self.assertIn('method="other"', text)
+        self.assertNotIn('method="FOO"', text)
+        self.assertEqual(len(metrics.registry._totals), 1)
+
+    def test_metrics_view(self):
+        self.client.get(reverse("contact-list"))
+        self.client.force_login(UserFactory(is_staff=True))
+        response = self.client.get(reverse("contact-metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            'contacts_request_duration_seconds_count{view="contact-list",'
+            'method="GET",status="2xx"} 1', response.content.decode("utf-8"))
+
+    def test_metrics_view_forbidden(self):
+        self.client.logout()
+        self.client.force_login(UserFactory())
+        response = self.client.get(reverse("contact-metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_metrics_view_token(self):
+        self.client.logout()
+        url = reverse("contact-metrics")
+        with self.settings(CONTACTS_METRICS_TOKEN="secret"):
+            response = self.client.get(
+                url, HTTP_AUTHORIZATION="Bearer secret")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = self.client.get(
+                url, HTTP_AUTHORIZATION="Bearer other")
+            self.assertEqual(response.status_code,
+                             status.HTTP_403_FORBIDDEN)
@@ -6,8 +6,13 @@
 """
 from __future__ import absolute_import, print_function
 
+import mock
+
 from django.utils import timezone
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import exceptions
 
 from python_core_utils.core import class_name
 from django_core_utils.tests.factories import GroupFactory
@@ -37,7 +42,10 @@ from django_core_models.social_media.tests.factories import (
 
 from . import factories
 
+from .. import cache
+from .. import forms
 from .. import models
+from .. import serializers
 
 
 class PermissionsMixin(object):
@@ -93,6 +101,75 @@ class ContactRelationshipTypeTestCase(ContactsNamedModelTestCase):
             get_by_name="name_1")
 
 
+class TypeCacheTestCase(ContactsNamedModelTestCase):
+    """Type model cache unit test class."""
+
+    def setUp(self):
+        super(TypeCacheTestCase, self).setUp()
+        cache.clear()
+
+    def test_cached_get(self):
+        instance = factories.ContactTypeModelFactory(name="name_1")
+        self.assertEqual(
+            models.ContactType.objects.cached_get(name="name_1"), instance)
+        with CaptureQueriesContext(connection) as context:
+            cached = models.ContactType.objects.cached_get(pk=instance.pk)
+        self.assertEqual(cached, instance)
+        self.assertEqual(len(context), 0, "unexpected queries")
+
+    def test_cached_get_does_not_exist(self):
+        with self.assertRaises(models.ContactType.DoesNotExist):
+            models.ContactType.objects.cached_get(name="name_1")
+
+    def test_cached_get_miss(self):
+        models.ContactType.objects.cached_all()
+        with mock.patch.object(cache, "invalidate"):
+            instance = factories.ContactTypeModelFactory(name="name_1")
+        self.assertEqual(
+            models.ContactType.objects.cached_get(name="name_1"), instance)
+        with CaptureQueriesContext(connection) as context:
+            models.ContactType.objects.cached_get(pk=instance.pk)
+        self.assertEqual(len(context), 0, "unexpected queries")
+
+    def test_cache_invalidation(self):
+        instance = factories.ContactRelationshipTypeModelFactory(name="name_1")
+        models.ContactRelationshipType.objects.cached_all()
+        instance.name = "name_2"
+        instance.save()
+        self.assertEqual(
+            models.ContactRelationshipType.objects.cached_get(
+                name="name_2"), instance)
+        instance.delete()
+        self.assertEqual(models.ContactRelationshipType.objects.cached_all(),
+                         [])
+
+    def test_type_related_field(self):
+        instance = factories.ContactTypeModelFactory(name="name_1")
+        field = serializers.TypeRelatedField(
+            queryset=models.ContactType.objects.all())
+        models.ContactType.objects.cached_all()
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(field.to_internal_value(instance.pk), instance)
+        self.assertEqual(len(context), 0, "unexpected queries")
+        with self.assertRaises(exceptions.ValidationError):
+            field.to_internal_value(instance.pk + 1)
+
+    def test_type_model_choice_field(self):
+        instance = factories.ContactTypeModelFactory(name="name_1")
+        field = forms.TypeModelChoiceField(
+            queryset=models.ContactType.objects.all())
+        models.ContactType.objects.cached_all()
+        with CaptureQueriesContext(connection) as context:
+            choices = list(field.choices)
+            cleaned = field.clean(str(instance.pk))
+        self.assertEqual(len(context), 0, "unexpected queries")
+        self.assertEqual(cleaned, instance)
+        self.assertEqual([value for value, _ in choices],
+                         ["", instance.pk])
+        with self.assertRaises(forms.ValidationError):
+            field.clean(str(instance.pk + 1))
+
+
 class ContactTestCase(ContactsVersionedModelTestCase):
     """Contact model unit test class.
     """
@@ -366,6 +443,22 @@ class ContactEmailTestCase(ContactAssociationTestCase):
         ret = models.Contact.objects.email_remove(contact, email)
         self.assertEqual(ret[0], 1)
 
+    def test_contact_email_associate_dissociate_many(self):
+        contacts = [self.create_contact() for _ in range(3)]
+        email = EmailModelFactory()
+        rows = [(contact, email) for contact in contacts]
+        instances = models.Contact.objects.associate_many(
+            models.ContactEmail, rows + rows[:1])
+        self.assertEqual(len(instances), 3)
+        self.assertEqual(models.ContactEmail.objects.count(), 3)
+        instances = models.Contact.objects.associate_many(
+            models.ContactEmail, rows, ignore_conflicts=True)
+        self.assertEqual(len(instances), 0)
+        count = models.Contact.objects.dissociate_many(
+            models.ContactEmail, rows[:2])
+        self.assertEqual(count, 2)
+        self.assertEqual(contacts[2].emails.count(), 1)
+
 
 class ContactGeographicLocationTestCase(ContactAssociationTestCase):
     """ContactGeographicLocation association model unit test class.
@@ -925,6 +1018,19 @@ class RelatedContactTestCase(ContactAssociationTestCase):
             from_contact, to_contract)
         self.assertEqual(ret[0], 1)
 
+    def test_contact_related_associate_dissociate_many(self):
+        from_contact = self.create_contact()
+        to_contacts = [self.create_contact() for _ in range(2)]
+        rel_type = factories.ContactRelationshipTypeModelFactory()
+        rows = [(from_contact, to_contact, rel_type)
+                for to_contact in to_contacts]
+        models.Contact.objects.associate_many(models.RelatedContact, rows)
+        self.assertEqual(from_contact.related_contacts.count(), 2)
+        count = models.Contact.objects.dissociate_many(
+            models.RelatedContact,
+            [(from_contact, to_contact) for to_contact in to_contacts])
+        self.assertEqual(count, 2)
+
 
 class ContactRoleTestCase(ContactAssociationTestCase):
     """ContactRole association model unit test class.
@@ -1106,6 +1212,43 @@ class ContactUrlTestCase(ContactAssociationTestCase):
         self.assertEqual(ret[0], 1)
 
 
+class ContactChangeTestCase(ContactAssociationTestCase):
+    """ContactChange model unit test class."""
+
+    def actions(self, **kwargs):
+        return list(models.ContactChange.objects.filter(
+            **kwargs).order_by("id").values_list("action", flat=True))
+
+    def test_contact_change_log(self):
+        contact = self.create_contact()
+        contact.priority += 1
+        contact.save()
+        uuid = contact.uuid
+        contact.delete()
+        actions = self.actions(model_name="contact", object_uuid=uuid)
+        self.assertEqual(actions[0], models.CHANGE_CREATED)
+        self.assertEqual(actions[-2:],
+                         [models.CHANGE_UPDATED, models.CHANGE_DELETED])
+
+    def test_contact_change_deleted_flag(self):
+        contact = self.create_contact()
+        contact.deleted = True
+        contact.save()
+        self.assertEqual(
+            self.actions(object_uuid=contact.uuid)[-1], models.CHANGE_DELETED)
+
+    def test_contact_association_change_log(self):
+        instance = factories.ContactEmailModelFactory()
+        contact = instance.contact
+        models.Contact.objects.associate_many(
+            models.ContactEmail, [(contact, EmailModelFactory())])
+        contact.delete()
+        actions = self.actions(
+            model_name="contactemail", contact_id=contact.id)
+        self.assertEqual(actions.count(models.CHANGE_CREATED), 2)
+        self.assertEqual(actions[-2:], [models.CHANGE_DELETED] * 2)
+
+
 class UserProfileTestCase(PermissionsMixin, BaseModelTestCase):
     """UserProfile model unit test class.
     """
@@ -0,0 +1,80 @@
+"""
+.. module::  contacts.tests.test_pagination
+   :synopsis: contacts application pagination unit test module.
+
+*contacts* application pagination unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from . import factories
+from . import test_models
+from .. import models
+from .. import pagination
+
+
+class KeysetPaginationTestCase(test_models.ContactsVersionedModelTestCase):
+    """Keyset pagination unit test class."""
+
+    def setUp(self):
+        super(KeysetPaginationTestCase, self).setUp()
+        for priority in (3, 1, 2, 1, 3):
+            factories.ContactModelFactory(priority=priority)
+        self.factory = APIRequestFactory()
+
+    def paginate(self, url, **params):
+        """Paginate contacts, return page instances and paginator."""
+        paginator = pagination.ContactsPagination()
+        request = Request(self.factory.get(url, params))
+        page = paginator.paginate_queryset(
+            models.Contact.objects.all(), request)
+        return page, paginator
+
+    def walk(self, ordering):
+        """Return contacts following next links."""
+        contacts = []
+        page, paginator = self.paginate(
+            "/contacts/", pagination="cursor", ordering=ordering, limit=2)
+        while True:
+            contacts.extend(page)
+            url = paginator.keyset.get_next_link()
+            if url is None:
+                return contacts
+            page, paginator = self.paginate(url)
+
+    def verify_walk(self, ordering, key):
+        contacts = self.walk(ordering)
+        expected = sorted(models.Contact.objects.all(), key=key)
+        self.assertEqual(contacts, expected)
+
+    def test_walk_priority(self):
+        self.verify_walk(
+            "priority", lambda contact: (contact.priority, contact.id))
+
+    def test_walk_priority_descending(self):
+        self.verify_walk(
+            "-priority", lambda contact: (-contact.priority, -contact.id))
+
+    def test_walk_update_time(self):
+        self.verify_walk(
+            "update_time", lambda contact: (contact.update_time, contact.id))
+
+    def test_previous_link(self):
+        first, paginator = self.paginate(
+            "/contacts/", pagination="cursor", limit=2)
+        second, paginator = self.paginate(paginator.keyset.get_next_link())
+        self.assertNotEqual(first, second)
+        page, _ = self.paginate(paginator.keyset.get_previous_link())
+        self.assertEqual(page, first)
+
+    def test_limit_offset_default(self):
+        page, paginator = self.paginate("/contacts/", limit=2, offset=2)
+        self.assertIsNone(paginator.keyset)
+        self.assertEqual(len(page), 2)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(NotFound):
+            self.paginate("/contacts/", cursor="invalid")
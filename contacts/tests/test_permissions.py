@@ -7,12 +7,16 @@
 
 from django.contrib.auth.models import Permission, User
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from guardian.shortcuts import assign_perm
 from django.shortcuts import get_object_or_404
 from django_core_utils.tests.test_utils import BaseModelTestCase
 from django_core_utils.tests.factories import GroupFactory
+from django_core_models.social_media.tests.factories import NameModelFactory
 from . import factories
 from . import test_models
+from .. import filters
 from .. import models
 
 
@@ -116,3 +120,113 @@ class ContactPermissionTestCase(PermissionsTestCase):
 
         contact.delete()
         self.assertEqual(models.ContactObjectPermission.objects.count(), 0)
+
+    def create_contact_queries(self):
+        """Create contact, return the number of permission queries."""
+        with self.settings(USE_OBJECT_PERMISSIONS=False):
+            contact = self.create_contact()
+        with CaptureQueriesContext(connection) as context:
+            models.assign_contact_permissions([contact])
+        return len(context)
+
+    def test_contact_permission_signal_query_count(self):
+        profile = models.UserProfile.objects.get(user=self.user)
+        profile.users_read.add(factories.UserFactory())
+        profile.groups_write.add(GroupFactory())
+        self.create_contact()
+        expected = self.create_contact_queries()
+        for _ in range(5):
+            profile.users_read.add(factories.UserFactory())
+            profile.users_write.add(factories.UserFactory())
+            profile.groups_read.add(GroupFactory())
+        self.assertEqual(self.create_contact_queries(), expected,
+                         "unexpected query count")
+
+    def test_contact_bulk_create_with_permissions(self):
+        profile = models.UserProfile.objects.get(user=self.user)
+        group = GroupFactory()
+        profile.groups_read.add(group)
+        params = models.create_fields(self.create_contact())
+        contacts = models.Contact.objects.bulk_create_with_permissions(
+            [models.Contact(name=NameModelFactory(), **params)
+             for _ in range(3)])
+        for contact in contacts:
+            self.assertIsNotNone(contact.pk)
+            for permission in models.PERMISSIONS_CONTACT_OBJECT:
+                self.assertTrue(self.user.has_perm(permission, contact))
+        self.assertEqual(
+            models.ContactObjectPermission.objects.count(),
+            4 * len(models.PERMISSIONS_CONTACT_OBJECT))
+        self.assertEqual(
+            models.ContactGroupObjectPermission.objects.count(), 4)
+
+    def test_contact_bulk_create_without_object_permissions(self):
+        params = models.create_fields(self.create_contact())
+        with self.settings(USE_OBJECT_PERMISSIONS=False):
+            models.Contact.objects.bulk_create_with_permissions(
+                [models.Contact(name=NameModelFactory(), **params)])
+        self.assertEqual(models.ContactObjectPermission.objects.count(),
+                         len(models.PERMISSIONS_CONTACT_OBJECT))
+
+    def test_contact_readable_filter(self):
+        contact = self.create_contact()
+        with self.settings(USE_OBJECT_PERMISSIONS=False):
+            other = self.create_contact()
+        queryset = models.Contact.objects.filter(
+            filters.readable_contacts(self.user))
+        self.assertEqual(list(queryset), [contact])
+        group = GroupFactory()
+        self.user.groups.add(group)
+        assign_perm(models.PERMISSION_READ, group, other)
+        queryset = models.Contact.objects.filter(
+            filters.readable_contacts(self.user)).order_by("id")
+        self.assertEqual(list(queryset), [contact, other])
+
+    def test_contact_association_readable_filter(self):
+        association = factories.ContactEmailModelFactory()
+        with self.settings(USE_OBJECT_PERMISSIONS=False):
+            factories.ContactEmailModelFactory()
+        field_name = filters.contact_field_name(models.ContactEmail)
+        queryset = models.ContactEmail.objects.filter(
+            filters.readable_contacts(self.user, field_name))
+        self.assertEqual(list(queryset), [association])
+
+    def test_contact_change_readable_filter(self):
+        contact = self.create_contact()
+        with self.settings(USE_OBJECT_PERMISSIONS=False):
+            other = self.create_contact()
+        factories.ContactEmailModelFactory(contact=other).delete()
+        change_filter = filters.ContactChangeFilter()
+        queryset = models.ContactChange.objects.filter(
+            change_filter.readable(self.user, models.ContactChange))
+        self.assertEqual(set(queryset.values_list("contact_id", flat=True)),
+                         set([contact.id]))
+        contact_id = contact.id
+        contact.delete()
+        other_id = other.id
+        other.delete()
+        queryset = models.ContactChange.objects.filter(
+            change_filter.readable(self.user, models.ContactChange))
+        self.assertEqual(set(queryset.values_list("contact_id", flat=True)),
+                         set([contact_id]))
+        self.assertTrue(queryset.filter(
+            contact_id=contact_id, action=models.CHANGE_DELETED).exists())
+        self.assertFalse(models.ContactChange.objects.filter(
+            change_filter.readable(
+                factories.UserFactory(), models.ContactChange),
+            contact_id__in=[contact_id, other_id]).exists())
+
+    def test_contact_change_group_reader(self):
+        group = GroupFactory()
+        self.user.groups.add(group)
+        with self.settings(USE_OBJECT_PERMISSIONS=False):
+            other = self.create_contact()
+        assign_perm(models.PERMISSION_READ, group, other)
+        other_id = other.id
+        other.delete()
+        change_filter = filters.ContactChangeFilter()
+        queryset = models.ContactChange.objects.filter(
+            change_filter.readable(self.user, models.ContactChange),
+            action=models.CHANGE_DELETED)
+        self.assertEqual(set(queryset.values_list("contact_id", flat=True)),
+                         set([other_id]))
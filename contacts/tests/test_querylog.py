@@ -0,0 +1,109 @@
+"""
+.. module::  contacts.tests.test_querylog
+   :synopsis: contacts application query log unit test module.
+
+*contacts* application query log unit test module.
+"""
+from __future__ import absolute_import, print_function
+import contextlib
+import logging
+import mock
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .. import metrics
+from .. import querylog
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super(_ListHandler, self).__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _execute(sql, params, many, context):
+    return "result"
+
+
+class _Connection(object):
+    """Connection stacking execute wrappers as Django connections do."""
+    def __init__(self):
+        self.execute_wrappers = []
+
+    @contextlib.contextmanager
+    def execute_wrapper(self, wrapper):
+        self.execute_wrappers.append(wrapper)
+        try:
+            yield
+        finally:
+            self.execute_wrappers.pop()
+
+
+class QueryLogTestCase(SimpleTestCase):
+    """Slow and duplicate query log unit test class."""
+
+    def setUp(self):
+        self.handler = _ListHandler()
+        querylog.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        querylog.logger.removeHandler(self.handler)
+        querylog.request_finished()
+
+    def execute(self, sql="SELECT 1"):
+        return querylog.execute(_execute, sql, None, False, {})
+
+    @override_settings(CONTACTS_SLOW_QUERY_SECONDS=0)
+    def test_slow_query(self):
+        self.assertEqual(self.execute(), "result")
+        self.assertEqual(len(self.handler.messages), 1)
+        message = self.handler.messages[0]
+        self.assertTrue(message.startswith("slow_query duration_ms="))
+        self.assertIn("location=tests/test_querylog.py:", message)
+        self.assertIn("sql=SELECT 1", message)
+
+    @override_settings(CONTACTS_SLOW_QUERY_SECONDS=None,
+                       CONTACTS_DUPLICATE_QUERY_COUNT=3)
+    def test_duplicate_query(self):
+        querylog.request_started("/contacts/")
+        for _ in range(3):
+            self.execute()
+        self.execute("SELECT 2")
+        querylog.request_finished()
+        self.assertEqual(len(self.handler.messages), 1)
+        message = self.handler.messages[0]
+        self.assertTrue(message.startswith("duplicate_query count=3"))
+        self.assertIn("path=/contacts/", message)
+        self.assertIn("sql=SELECT 1", message)
+
+    @override_settings(CONTACTS_SLOW_QUERY_SECONDS=None)
+    def test_outside_request(self):
+        for _ in range(20):
+            self.execute()
+        querylog.request_finished()
+        self.assertEqual(self.handler.messages, [])
+
+    def test_install(self):
+        class Connection(object):
+            execute_wrappers = []
+        connection = Connection()
+        querylog.install(connection)
+        querylog.install(connection)
+        self.assertEqual(connection.execute_wrappers, [querylog.execute])
+
+    def test_install_within_metrics_middleware(self):
+        connection = _Connection()
+
+        def get_response(request):
+            # the connection is opened by the request
+            connection_created.send(sender=_Connection, connection=connection)
+            return HttpResponse()
+
+        with mock.patch.object(metrics, "connection", connection):
+            metrics.MetricsMiddleware(get_response)(
+                RequestFactory().get("/"))
+        self.assertEqual(connection.execute_wrappers, [querylog.execute])
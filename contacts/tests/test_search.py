@@ -0,0 +1,105 @@
+"""
+.. module::  contacts.tests.test_search
+   :synopsis: contacts application search unit test module.
+
+*contacts* application search unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils.six import StringIO
+from rest_framework import status
+
+from . import factories
+from . import test_models
+from . import test_views
+from .. import models
+from .. import search
+
+
+class SearchTestCase(test_models.ContactsVersionedModelTestCase):
+    """Contact search unit test class."""
+
+    def setUp(self):
+        super(SearchTestCase, self).setUp()
+        self.contact = factories.ContactModelFactory()
+        self.email = factories.ContactEmailModelFactory(contact=self.contact)
+
+    def document(self, contact):
+        return models.ContactSearchDocument.objects.get(
+            contact=contact).document
+
+    def test_search_terms(self):
+        self.assertEqual(search.search_terms(u"John  Doe-Smith"),
+                         [u"john", u"doe", u"smith"])
+
+    def test_document_created(self):
+        contact = factories.ContactModelFactory()
+        self.assertEqual(self.document(contact),
+                         search.document_text(contact, False))
+
+    def test_document_updated(self):
+        self.assertIn(self.email.email.address.lower(),
+                      self.document(self.contact))
+        phone = factories.ContactPhoneModelFactory(contact=self.contact)
+        self.assertIn(phone.phone.number.lower(),
+                      self.document(self.contact))
+        self.email.delete()
+        self.assertNotIn(self.email.email.address.lower(),
+                         self.document(self.contact))
+
+    def test_document_referenced_update(self):
+        email = self.email.email
+        email.address = u"renamed@example.com"
+        email.save()
+        self.assertIn(u"renamed@example.com", self.document(self.contact))
+        name = self.contact.name
+        name.family_name = u"Renamed"
+        name.save()
+        self.assertIn(u"renamed", self.document(self.contact).split())
+
+    def test_search_contacts(self):
+        other = factories.ContactModelFactory()
+        contacts = search.search_contacts(self.email.email.address)
+        self.assertIn(self.contact, contacts)
+        self.assertNotIn(other, contacts)
+        self.assertFalse(search.search_contacts(u"  ").exists())
+
+    def test_search_prefix(self):
+        term = search.search_terms(self.email.email.address)[0]
+        self.assertIn(self.contact, search.search_contacts(term[:2]))
+
+    def test_contact_delete(self):
+        contact_id = self.contact.id
+        self.contact.delete()
+        self.assertFalse(models.ContactSearchDocument.objects.filter(
+            contact_id=contact_id).exists())
+
+    def test_deferred_updates(self):
+        with search.deferred_updates():
+            phone = factories.ContactPhoneModelFactory(contact=self.contact)
+            self.assertNotIn(phone.phone.number.lower(),
+                             self.document(self.contact))
+        self.assertIn(phone.phone.number.lower(),
+                      self.document(self.contact))
+
+    def test_rebuild_command(self):
+        models.ContactSearchDocument.objects.all().delete()
+        call_command("rebuild_search_documents", stdout=StringIO())
+        self.assertIn(self.contact, search.search_contacts(
+            self.email.email.address))
+
+
+class ContactSearchApiTestCase(test_views.ContactAssociationApiTestCase):
+    """Contact search API unit test class."""
+    url_list = "contact-search-list"
+
+    def test_search(self):
+        email = factories.ContactEmailModelFactory(contact=self.contact)
+        factories.ContactModelFactory()
+        response = self.client.get(
+            reverse(self.url_list), dict(q=email.email.address))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([contact["id"] for contact in
+                          response.data["results"]], [self.contact.id])
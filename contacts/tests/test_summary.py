@@ -0,0 +1,106 @@
+"""
+.. module::  contacts.tests.test_summary
+   :synopsis: contacts application contact summary unit test module.
+
+*contacts* application contact summary unit test module.
+"""
+from __future__ import absolute_import, print_function
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.six import StringIO
+from rest_framework import status
+
+from . import factories
+from . import test_models
+from . import test_views
+from .. import models
+from .. import summary
+
+
+class SummaryTestCase(test_models.ContactsVersionedModelTestCase):
+    """Contact summary unit test class."""
+
+    def setUp(self):
+        super(SummaryTestCase, self).setUp()
+        self.contact = factories.ContactModelFactory()
+
+    def summary(self):
+        return models.ContactSummary.objects.get(contact=self.contact)
+
+    def test_summary_created(self):
+        summary = self.summary()
+        self.assertEqual(summary.display_name,
+                         str(self.contact.display_name))
+        self.assertEqual(summary.version, self.contact.version)
+        self.assertEqual(summary.email_count, 0)
+        self.assertEqual(summary.primary_email, "")
+
+    def test_summary_updated(self):
+        first = factories.ContactEmailModelFactory(
+            contact=self.contact, priority=1)
+        factories.ContactEmailModelFactory(contact=self.contact, priority=2)
+        phone = factories.ContactPhoneModelFactory(contact=self.contact)
+        summary = self.summary()
+        self.assertEqual(summary.email_count, 2)
+        self.assertEqual(summary.primary_email, first.email.address)
+        self.assertEqual(summary.phone_count, 1)
+        self.assertEqual(summary.primary_phone, phone.phone.number)
+        first.delete()
+        self.assertEqual(self.summary().email_count, 1)
+
+    def test_summary_referenced_update(self):
+        email = factories.ContactEmailModelFactory(contact=self.contact).email
+        email.address = u"renamed@example.com"
+        email.save()
+        self.assertEqual(self.summary().primary_email, u"renamed@example.com")
+        name = self.contact.name
+        name.family_name = u"Renamed"
+        name.save()
+        self.assertEqual(self.summary().display_name, str(name))
+
+    def test_deferred_updates(self):
+        with summary.deferred_updates():
+            factories.ContactPhoneModelFactory(contact=self.contact)
+            self.assertEqual(self.summary().phone_count, 0)
+        self.assertEqual(self.summary().phone_count, 1)
+
+    def test_contact_delete(self):
+        factories.ContactEmailModelFactory(contact=self.contact)
+        contact_id = self.contact.id
+        self.contact.delete()
+        self.assertFalse(models.ContactSummary.objects.filter(
+            contact_id=contact_id).exists())
+
+    def test_rebuild_command(self):
+        factories.ContactPhoneModelFactory(contact=self.contact)
+        models.ContactSummary.objects.all().delete()
+        call_command("rebuild_contact_summaries", stdout=StringIO())
+        self.assertEqual(self.summary().phone_count, 1)
+
+
+class ContactSummaryApiTestCase(test_views.ContactAssociationApiTestCase):
+    """Contact summary API unit test class."""
+    url_list = "contact-summary-list"
+
+    def test_get_summaries(self):
+        factories.ContactEmailModelFactory(contact=self.contact)
+        response = self.client.get(reverse(self.url_list))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        summary = response.data["results"][0]
+        self.assertEqual(summary["contact"], self.contact.id)
+        self.assertEqual(summary["email_count"], 1)
+
+    def test_get_summaries_single_table(self):
+        for _ in range(3):
+            factories.ContactModelFactory()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse(self.url_list), dict(pagination="cursor"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 4)
+        selects = [query["sql"] for query in context.captured_queries
+                   if models.ContactSummary._meta.db_table in query["sql"]]
+        self.assertEqual(len(selects), 1)
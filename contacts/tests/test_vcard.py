@@ -0,0 +1,169 @@
+"""
+.. module::  contacts.tests.test_vcard
+   :synopsis: contacts application vCard unit test module.
+
+*contacts* application vCard unit test module.
+"""
+from __future__ import absolute_import, print_function
+import uuid
+
+import mock
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from . import factories
+from . import test_models
+from .. import cache
+from .. import models
+from .. import summary
+from .. import vcard
+
+
+class VCardFormatTestCase(test_models.ContactsVersionedModelTestCase):
+    """vCard formatting unit test class."""
+
+    def test_escape(self):
+        self.assertEqual(vcard.escape("a,b;c\\d\ne"), "a\\,b\\;c\\\\d\\ne")
+
+    def test_fold(self):
+        line = vcard.content_line("NOTE", "x" * 200)
+        parts = line.split("\r\n")
+        self.assertEqual(parts[-1], "")
+        for part in parts[:-1]:
+            self.assertTrue(len(part.encode("utf-8")) <= 75)
+        self.assertEqual(
+            "".join(part[1:] if index else part
+                    for index, part in enumerate(parts[:-1])),
+            "NOTE:" + "x" * 200)
+
+
+class VCardExportTestCase(test_models.ContactsVersionedModelTestCase):
+    """vCard export unit test class."""
+
+    def export(self, **kwargs):
+        """Export all contacts, return text and query count."""
+        with CaptureQueriesContext(connection) as context:
+            text = "".join(vcard.export_contacts(**kwargs))
+        return text, len(context)
+
+    def test_export_contact(self):
+        association = factories.ContactEmailModelFactory()
+        factories.ContactPhoneModelFactory(contact=association.contact)
+        text, _ = self.export()
+        self.assertTrue(text.startswith("BEGIN:VCARD\r\nVERSION:4.0\r\n"))
+        self.assertTrue(text.endswith("END:VCARD\r\n"))
+        self.assertIn("UID:urn:uuid:%s" % association.contact.uuid, text)
+        self.assertEqual(text.count("\r\nEMAIL"), 1)
+        self.assertEqual(text.count("\r\nTEL"), 1)
+        self.assertEqual(text.count("\r\nFN"), 1)
+
+    def test_export_chunks(self):
+        for _ in range(5):
+            factories.ContactModelFactory()
+        text, _ = self.export(chunk_size=2)
+        self.assertEqual(text.count("BEGIN:VCARD"), 5)
+
+    def test_export_query_count(self):
+        factories.ContactEmailModelFactory()
+        _, expected = self.export()
+        for _ in range(3):
+            association = factories.ContactEmailModelFactory()
+            factories.ContactAddressModelFactory(contact=association.contact)
+        _, actual = self.export()
+        self.assertEqual(expected, actual, "unexpected query count")
+
+
+_VCARD = (
+    "BEGIN:VCARD\r\n"
+    "VERSION:4.0\r\n"
+    "UID:urn:uuid:%(uid)s\r\n"
+    "FN:%(name)s\r\n"
+    "N:%(name)s;Jo;;;\r\n"
+    "EMAIL;TYPE=work:%(email)s\r\n"
+    "TEL;TYPE=home:+1 555 0100\r\n"
+    "BDAY:19700102\r\n"
+    "END:VCARD\r\n")
+
+
+def _vcards(count, email="jo@example.com"):
+    """Return vCard lines for count cards sharing an email address."""
+    text = "".join(
+        _VCARD % dict(uid=uuid.uuid4(), name="Smith%d" % index, email=email)
+        for index in range(count))
+    return text.splitlines(True)
+
+
+class VCardParseTestCase(test_models.ContactsVersionedModelTestCase):
+    """vCard parsing unit test class."""
+
+    def test_split_value(self):
+        self.assertEqual(vcard.split_value("a\\;b;c\\,d;"),
+                         ["a;b", "c,d", ""])
+
+    def test_parse_line(self):
+        prop = vcard.parse_line('item1.EMAIL;TYPE="work,home";PREF=1:a@b.c')
+        self.assertEqual(prop.name, "EMAIL")
+        self.assertEqual(prop.params["TYPE"], ["work", "home"])
+        self.assertEqual(prop.value, "a@b.c")
+
+    def test_parse_folded(self):
+        line = vcard.content_line("NOTE", "x" * 200)
+        lines = ("BEGIN:VCARD\r\n" + line + "END:VCARD\r\n").splitlines(True)
+        cards = list(vcard.parse_vcards(lines))
+        self.assertEqual(len(cards), 1)
+        self.assertEqual(cards[0][0].value, "x" * 200)
+
+
+class VCardImportTestCase(test_models.ContactsVersionedModelTestCase):
+    """vCard import unit test class."""
+
+    def setUp(self):
+        super(VCardImportTestCase, self).setUp()
+        cache.clear()
+
+    def import_contacts(self, lines, **kwargs):
+        """Import lines, return contact count and query count."""
+        with CaptureQueriesContext(connection) as context:
+            count = vcard.import_contacts(lines, self.user, **kwargs)
+        return count, len(context)
+
+    def test_import(self):
+        count, _ = self.import_contacts(_vcards(3), batch_size=2)
+        self.assertEqual(count, 3)
+        self.assertEqual(models.Contact.objects.count(), 3)
+        self.assertEqual(models.ContactEmail.objects.count(), 3)
+        self.assertEqual(models.ContactPhone.objects.count(), 3)
+        # reference instances are shared across contacts
+        self.assertEqual(models.Email.objects.count(), 1)
+        self.assertEqual(models.Phone.objects.count(), 1)
+
+    def test_import_summaries(self):
+        with mock.patch.object(summary._updates, "update_function",
+                               wraps=summary._update_summaries) as update:
+            self.import_contacts(_vcards(3))
+        self.assertEqual(update.call_count, 1)
+        self.assertEqual(models.ContactSummary.objects.filter(
+            email_count=1, phone_count=1).count(), 3)
+
+    def test_import_existing_uid(self):
+        lines = _vcards(2)
+        self.import_contacts(lines)
+        count, _ = self.import_contacts(lines)
+        self.assertEqual(count, 0)
+        self.assertEqual(models.Contact.objects.count(), 2)
+
+    def test_import_query_count(self):
+        # create the shared reference and type instances, load the type cache
+        self.import_contacts(_vcards(1))
+        self.import_contacts(_vcards(1))
+        _, expected = self.import_contacts(_vcards(2))
+        _, actual = self.import_contacts(_vcards(10))
+        self.assertEqual(expected, actual, "unexpected query count")
+
+    def test_export_import(self):
+        factories.ContactEmailModelFactory()
+        lines = "".join(vcard.export_contacts()).splitlines(True)
+        models.Contact.objects.all().delete()
+        count, _ = self.import_contacts(lines)
+        self.assertEqual(count, 1)
+        self.assertEqual(models.ContactEmail.objects.count(), 1)
@@ -5,6 +5,13 @@
 *social_media*  application views unit test module.
 """
 from __future__ import absolute_import, print_function
+import mock
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from django_core_utils.tests.factories import UserFactory
 from django_core_utils.tests.api_test_utils import (
     NamedModelApiTestCase,
     VersionedModelApiTestCase)
@@ -46,11 +53,14 @@ from django_core_models.social_media.tests.factories import (
 
 
 from . import factories
+from .query_budget import NamedQueryBudgetMixin, QueryBudgetMixin
+from .. import cache
 from .. import models
 from .. import serializers
+from .. import views
 
 
-class ConctactTypeApiTestCase(NamedModelApiTestCase):
+class ConctactTypeApiTestCase(NamedQueryBudgetMixin, NamedModelApiTestCase):
     """ContactType API unit test class."""
     factory_class = factories.ContactTypeModelFactory
     model_class = models.ContactType
@@ -79,7 +89,8 @@ class ConctactTypeApiTestCase(NamedModelApiTestCase):
         self.verify_delete_default()
 
 
-class ConctactRelationshipTypeApiTestCase(NamedModelApiTestCase):
+class ConctactRelationshipTypeApiTestCase(NamedQueryBudgetMixin,
+                                          NamedModelApiTestCase):
     """Contact  API unit test class."""
     factory_class = factories.ContactRelationshipTypeModelFactory
     model_class = models.ContactRelationshipType
@@ -108,11 +119,17 @@ class ConctactRelationshipTypeApiTestCase(NamedModelApiTestCase):
         self.verify_delete_default()
 
 
-class ContactApiTestCase(VersionedModelApiTestCase):
+class ContactApiTestCase(QueryBudgetMixin, VersionedModelApiTestCase):
     """Contact  API unit test class."""
     factory_class = factories.ContactModelFactory
     model_class = models.Contact
     serializer_class = serializers.ContactSerializer
+    related_factory_classes = (
+        factories.ContactEmailModelFactory,
+        factories.ContactPhoneModelFactory,
+        factories.ContactOrganizationModelFactory,
+        factories.ContactNameModelFactory,
+        factories.RelatedContactModelFactory)
 
     url_detail = "contact-detail"
     url_list = "contact-list"
@@ -172,6 +189,16 @@ class ContactApiTestCase(VersionedModelApiTestCase):
             ref_instance=instance,
             data=data)
 
+    def test_create_contact_uncached_type(self):
+        cache.clear()
+        models.ContactType.objects.cached_all()
+        with mock.patch.object(cache, "invalidate"):
+            contact_type = factories.ContactTypeModelFactory()
+        data = self.post_required_data(self.create_instance_default())
+        data["contact_type"] = contact_type.id
+        _, instance = self.verify_create_contact(data=data)
+        self.assertEqual(instance.contact_type, contact_type)
+
     def test_get_contact(self):
         self.verify_get_defaults()
 
@@ -187,7 +214,8 @@ class ContactApiTestCase(VersionedModelApiTestCase):
         self.verify_delete_default()
 
 
-class ContactAssociationApiTestCase(VersionedModelApiTestCase):
+class ContactAssociationApiTestCase(QueryBudgetMixin,
+                                    VersionedModelApiTestCase):
     """Base class for contact association test cases."""
     def setUp(self):
         super(ContactAssociationApiTestCase, self).setUp()
@@ -199,6 +227,112 @@ class ContactAssociationApiTestCase(VersionedModelApiTestCase):
             self.assertEqual(value, attr.id, "unexpected attr value")
 
 
+class ContactFullApiTestCase(ContactAssociationApiTestCase):
+    """Contact full API unit test class."""
+    url_full_detail = "contact-full-detail"
+
+    def get_full(self, contact):
+        """Retrieve full contact, return response and query count."""
+        url = reverse(self.url_full_detail, kwargs=dict(pk=contact.id))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(context)
+
+    def test_get_contact_full(self):
+        factories.ContactEmailModelFactory(contact=self.contact)
+        factories.ContactPhoneModelFactory(contact=self.contact)
+        response, _ = self.get_full(self.contact)
+        self.assertEqual(response.data["id"], self.contact.id)
+        self.assertEqual(len(response.data["emails"]), 1)
+        self.assertEqual(len(response.data["phones"]), 1)
+        self.assertEqual(response.data["addresses"], [])
+
+    def test_get_contact_full_not_readable(self):
+        self.client.force_login(UserFactory())
+        with self.settings(USE_OBJECT_PERMISSIONS=True):
+            response = self.client.get(reverse(
+                self.url_full_detail, kwargs=dict(pk=self.contact.id)))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_contact_full_query_count(self):
+        factories.ContactEmailModelFactory(contact=self.contact)
+        _, expected = self.get_full(self.contact)
+        rel_type = factories.ContactRelationshipTypeModelFactory()
+        for _ in range(5):
+            factories.ContactAddressModelFactory(contact=self.contact)
+            factories.ContactPhoneModelFactory(contact=self.contact)
+            factories.RelatedContactModelFactory(
+                from_contact=self.contact,
+                contact_relationship_type=rel_type)
+        _, actual = self.get_full(self.contact)
+        self.assertEqual(expected, actual, "unexpected query count")
+
+
+@override_settings(CONTACTS_CHANGE_FEED_LAG=0)
+class ContactChangeApiTestCase(ContactAssociationApiTestCase):
+    """Contact change feed API unit test class."""
+    url_list = "contact-change-list"
+
+    def get_changes(self, **params):
+        response = self.client.get(reverse(self.url_list), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_get_changes(self):
+        email = factories.ContactEmailModelFactory(contact=self.contact)
+        data = self.get_changes()
+        change = data["results"][-1]
+        self.assertEqual(change["model_name"], "contactemail")
+        self.assertEqual(change["data"]["id"], email.id)
+        cursor = data["cursor"]
+        uuid = str(email.uuid)
+        email.delete()
+        data = self.get_changes(cursor=cursor)
+        self.assertEqual(len(data["results"]), 1)
+        change = data["results"][0]
+        self.assertEqual(change["action"], models.CHANGE_DELETED)
+        self.assertEqual(str(change["object_uuid"]), uuid)
+        self.assertIsNone(change["data"])
+        self.assertEqual(self.get_changes(cursor=data["cursor"])["results"],
+                         [])
+
+    def test_get_changes_next(self):
+        for _ in range(3):
+            factories.ContactModelFactory()
+        data = self.get_changes(limit=2)
+        ids = [change["id"] for change in data["results"]]
+        while data["next"]:
+            data = self.client.get(data["next"]).data
+            ids.extend(change["id"] for change in data["results"])
+        self.assertEqual(
+            ids, list(models.ContactChange.objects.order_by(
+                "id").values_list("id", flat=True)))
+
+    def test_get_changes_lag(self):
+        data = self.get_changes()
+        with self.settings(CONTACTS_CHANGE_FEED_LAG=60):
+            factories.ContactEmailModelFactory(contact=self.contact)
+            lagging = self.get_changes(cursor=data["cursor"])
+        self.assertEqual(lagging["results"], [])
+        self.assertEqual(lagging["cursor"], data["cursor"])
+        self.assertEqual(len(self.get_changes(
+            cursor=data["cursor"])["results"]), 1)
+
+    def budget_seed_changes(self, count):
+        """Create, update and delete count contacts and associations."""
+        for _ in range(count):
+            contact = factories.ContactModelFactory()
+            factories.ContactEmailModelFactory(contact=contact)
+            contact.save()
+            factories.ContactPhoneModelFactory(contact=self.contact).delete()
+
+    def test_changes_query_budget(self):
+        url = reverse(self.url_list)
+        self.assert_query_budget(
+            lambda: self.budget_request("get", url), self.budget_seed_changes)
+
+
 class ContactAddressApiTestCase(ContactAssociationApiTestCase):
     """ContactAddress  API unit test class."""
     factory_class = factories.ContactAddressModelFactory
@@ -1642,3 +1776,46 @@ class RelatedContactApiTestCase(ContactAssociationApiTestCase):
 
     def test_delete_related_contact(self):
         self.verify_delete_default()
+
+
+class ApiRootTestCase(TestCase):
+    """Api root end points unit test class."""
+
+    def setUp(self):
+        super(ApiRootTestCase, self).setUp()
+        views.clear_api_root_cache()
+
+    def test_api_root(self):
+        response = self.client.get(reverse("api-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["contacts"],
+                         "http://testserver" + reverse("contact-list"))
+        self.assertEqual(list(response.data), sorted(response.data))
+        self.assertTrue(response["ETag"])
+
+    def test_api_root_relative(self):
+        response = self.client.get(reverse("api-list"), {"relative": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["contacts"], reverse("contact-list"))
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "api.example.com"])
+    def test_api_root_cached(self):
+        self.client.get(reverse("api-list"))
+        with mock.patch.object(views, "_api_root_end_points") as end_points:
+            response = self.client.get(reverse("api-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        end_points.assert_not_called()
+        response = self.client.get(reverse("api-list"),
+                                   HTTP_HOST="api.example.com")
+        self.assertTrue(response.data["contacts"].startswith(
+            "http://api.example.com/"))
+
+    def test_api_root_not_modified(self):
+        etag = self.client.get(reverse("api-list"))["ETag"]
+        response = self.client.get(reverse("api-list"),
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        response = self.client.get(reverse("api-list"),
+                                   HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -7,6 +7,7 @@
 """
 from __future__ import absolute_import
 from django.conf.urls import url
+from . import metrics
 from . import views
 
 urlpatterns = [
@@ -31,6 +32,37 @@ urlpatterns = [
     url(r'^contacts/(?P<pk>[0-9]+)/$',
         views.ContactDetail.as_view(),
         name='contact-detail'),
+    url(r'^contacts/(?P<pk>[0-9]+)/full/$',
+        views.ContactFullDetail.as_view(),
+        name='contact-full-detail'),
+    url(r'^contacts/(?P<pk>[0-9]+)/neighbors/$',
+        views.ContactNeighborList.as_view(),
+        name='contact-neighbor-list'),
+    url(r'^contacts/(?P<pk>[0-9]+)/paths/(?P<to_pk>[0-9]+)/$',
+        views.ContactPathDetail.as_view(),
+        name='contact-path-detail'),
+    url(r'^contacts/(?P<pk>[0-9]+)/component/$',
+        views.ContactComponentList.as_view(),
+        name='contact-component-list'),
+    url(r'^contacts/vcards/$',
+        views.ContactVCardList.as_view(),
+        name='contact-vcard-list'),
+
+    url(r'^contacts/search/$',
+        views.ContactSearchList.as_view(),
+        name='contact-search-list'),
+    url(r'^contacts/summaries/$',
+        views.ContactSummaryList.as_view(),
+        name='contact-summary-list'),
+    url(r'^contacts/lookup/$',
+        views.ContactLookupView.as_view(),
+        name='contact-lookup'),
+    url(r'^metrics/$',
+        metrics.metrics_view,
+        name='contact-metrics'),
+    url(r'^changes/$',
+        views.ContactChangeList.as_view(),
+        name='contact-change-list'),
 
     url(r'^contact-addresses/$',
         views.ContactAddressList.as_view(),
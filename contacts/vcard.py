@@ -0,0 +1,780 @@
+"""
+.. module::  contacts.vcard
+   :synopsis:  contacts application vCard module.
+
+*contacts* application vCard module.
+
+Implements export of Contact instances in vCard 4.0 format as per
+rfc6350 "vCard Format Specification".  Contacts are read in primary key
+ordered chunks, with the associations of each chunk prefetched, such that
+the number of queries is independent of the number of associations, and
+memory usage is bound by the chunk size.
+
+Implements import of vCard streams.  Parsed cards are staged in batches;
+per batch, the shared reference instances (i.e. Email, Phone, Name,
+Address) are resolved against existing instances or created in bulk, after
+which the contacts and their associations are created in bulk, all within
+a single transaction.
+"""
+from __future__ import absolute_import
+import collections
+import datetime
+import logging
+import uuid
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Prefetch
+from django.db.models.functions import Lower
+from django.utils.encoding import force_text
+from django_core_utils.utils import current_site
+
+from . import cache
+from . import models
+from . import search
+from . import summary
+
+logger = logging.getLogger(__name__)
+
+VCARD_VERSION = "4.0"
+VCARD_CONTENT_TYPE = "text/vcard; charset=utf-8"
+VCARD_FILE_EXTENSION = "vcf"
+
+DEFAULT_CHUNK_SIZE = 500
+
+_CRLF = "\r\n"
+_FOLD_LENGTH = 75
+
+_KINDS = ("individual", "group", "org", "location")
+
+# Address components, in rfc6350 ADR order.
+_ADDRESS_COMPONENTS = (
+    "post_office_box", "extended_address", "street_address",
+    "locality", "region", "postal_code", "country")
+
+# Name components, in rfc6350 N order.
+_NAME_COMPONENTS = (
+    "family_name", "given_name", "additional_name",
+    "honorific_prefix", "honorific_suffix")
+
+
+def escape(value):
+    """Escape vCard text value."""
+    value = force_text(value)
+    return (value.replace("\\", "\\\\").
+            replace(",", "\\,").
+            replace(";", "\\;").
+            replace("\r\n", "\\n").
+            replace("\n", "\\n"))
+
+
+def fold(line):
+    """Fold content line to lines of at most 75 octets."""
+    if len(line.encode("utf-8")) <= _FOLD_LENGTH:
+        return line
+    parts = []
+    current, size, limit = [], 0, _FOLD_LENGTH
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > limit:
+            parts.append("".join(current))
+            # continuation lines start with a space
+            current, size, limit = [], 0, _FOLD_LENGTH - 1
+        current.append(char)
+        size += char_size
+    parts.append("".join(current))
+    return (_CRLF + " ").join(parts)
+
+
+def _text(instance, attr_name):
+    """Return instance attribute text, defaulting to instance text."""
+    value = getattr(instance, attr_name, None)
+    return force_text(instance if value is None else value)
+
+
+def _components(instance, attr_names):
+    """Return escaped structured value components."""
+    values = []
+    for attr_name in attr_names:
+        value = getattr(instance, attr_name, None)
+        values.append(escape(value) if value is not None else "")
+    return ";".join(values)
+
+
+def _param_value(value):
+    """Return parameter value, quoted when required."""
+    value = force_text(value).replace('"', "'")
+    if any(char in value for char in ",;:"):
+        return '"%s"' % value
+    return value
+
+
+def content_line(name, value, type_instance=None, **params):
+    """Return folded content line for property name and escaped value."""
+    if type_instance is not None:
+        params["type"] = force_text(type_instance).lower()
+    line = name
+    for key in sorted(params):
+        line += ";%s=%s" % (key.upper(), _param_value(params[key]))
+    return fold("%s:%s" % (line, value)) + _CRLF
+
+
+def _uuid_uri(instance):
+    return "urn:uuid:%s" % instance.uuid
+
+
+def _timestamp(value):
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _date(value):
+    return value.strftime("%Y%m%d")
+
+
+def _related_fields(model_class, field_names):
+    """Return the subset of field names which are relations of model class."""
+    names = []
+    for field_name in field_names:
+        try:
+            field = model_class._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            continue
+        if field.is_relation and field.many_to_one:
+            names.append(field_name)
+    return names
+
+
+def _prefetch(association_class, field_name, *select_related):
+    """Return Prefetch for association class instances of a contact."""
+    queryset = association_class.objects.select_related(*select_related)
+    return Prefetch(
+        models.association_accessor(association_class, field_name),
+        queryset=queryset)
+
+
+def export_queryset(queryset=None):
+    """Return contact queryset prefetching the data required for export."""
+    queryset = (models.Contact.objects.all()
+                if queryset is None else queryset)
+    address_related = ["address__%s" % name for name in _related_fields(
+        models.Address, _ADDRESS_COMPONENTS)]
+    return queryset.select_related(
+        "name", "formatted_name", "gender", "contact_type").prefetch_related(
+        _prefetch(models.ContactAddress, "contact",
+                  "address", "address_type", *address_related),
+        _prefetch(models.ContactAnnotation, "contact", "annotation"),
+        _prefetch(models.ContactCategory, "contact", "category"),
+        _prefetch(models.ContactEmail, "contact", "email", "email_type"),
+        _prefetch(models.ContactFormattedName, "contact", "name"),
+        _prefetch(models.ContactGeographicLocation, "contact",
+                  "geographic_location", "geographic_location_type"),
+        _prefetch(models.ContactInstantMessaging, "contact",
+                  "instant_messaging", "instant_messaging_type"),
+        _prefetch(models.ContactLanguage, "contact",
+                  "language", "language_type"),
+        _prefetch(models.ContactLogo, "contact",
+                  "image_reference", "logo_type"),
+        _prefetch(models.ContactName, "contact", "name"),
+        _prefetch(models.ContactNickname, "contact", "name", "nickname_type"),
+        _prefetch(models.ContactOrganization, "contact",
+                  "organization", "unit"),
+        _prefetch(models.ContactPhone, "contact", "phone", "phone_type"),
+        _prefetch(models.ContactPhoto, "contact",
+                  "image_reference", "photo_type"),
+        _prefetch(models.ContactRole, "contact", "role"),
+        _prefetch(models.ContactTimezone, "contact",
+                  "timezone", "timezone_type"),
+        _prefetch(models.ContactTitle, "contact", "title"),
+        _prefetch(models.ContactUrl, "contact", "url", "url_type"),
+        _prefetch(models.RelatedContact, "from_contact",
+                  "to_contact", "contact_relationship_type"))
+
+
+def iter_chunks(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of queryset instances, in primary key order.
+
+    Uses keyset pagination such that each chunk is an indexed range scan,
+    and prefetching is performed per chunk.
+    """
+    last_pk = None
+    queryset = queryset.order_by("pk")
+    while True:
+        chunk_queryset = (queryset if last_pk is None
+                          else queryset.filter(pk__gt=last_pk))
+        chunk = list(chunk_queryset[:chunk_size])
+        if not chunk:
+            break
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def _associations(contact, association_class, field_name="contact"):
+    return getattr(
+        contact,
+        models.association_accessor(association_class, field_name)).all()
+
+
+def contact_lines(contact):
+    """Yield vCard content lines for contact."""
+    yield content_line("BEGIN", "VCARD")
+    yield content_line("VERSION", VCARD_VERSION)
+    yield content_line("UID", _uuid_uri(contact))
+
+    kind = (force_text(contact.contact_type).lower()
+            if contact.contact_type else None)
+    if kind in _KINDS:
+        yield content_line("KIND", kind)
+
+    formatted_names = [contact.formatted_name] if contact.formatted_name else []
+    formatted_names.extend(
+        association.name for association in
+        _associations(contact, models.ContactFormattedName))
+    if not formatted_names:
+        # FN is required, derive it from the name
+        formatted_names.append(contact.display_name)
+    for index, formatted_name in enumerate(formatted_names, 1):
+        yield content_line("FN", escape(_text(formatted_name, "name")),
+                           pref=index)
+
+    names = [contact.name] if contact.name else []
+    names.extend(association.name for association in
+                 _associations(contact, models.ContactName))
+    for name in names:
+        yield content_line("N", _components(name, _NAME_COMPONENTS))
+
+    for association in _associations(contact, models.ContactNickname):
+        yield content_line("NICKNAME", escape(_text(association.name, "name")),
+                           association.nickname_type)
+
+    if contact.birth_date:
+        yield content_line("BDAY", _date(contact.birth_date))
+    if contact.anniversary:
+        yield content_line("ANNIVERSARY", _date(contact.anniversary))
+    if contact.gender:
+        yield content_line("GENDER", escape(_text(contact.gender, "name")))
+
+    for association in _associations(contact, models.ContactAddress):
+        yield content_line(
+            "ADR", _components(association.address, _ADDRESS_COMPONENTS),
+            association.address_type)
+    for association in _associations(contact, models.ContactPhone):
+        yield content_line("TEL", escape(_text(association.phone, "number")),
+                           association.phone_type)
+    for association in _associations(contact, models.ContactEmail):
+        yield content_line(
+            "EMAIL", escape(_text(association.email, "address")),
+            association.email_type)
+    for association in _associations(contact, models.ContactInstantMessaging):
+        yield content_line(
+            "IMPP", _text(association.instant_messaging, "address"),
+            association.instant_messaging_type)
+    for association in _associations(contact, models.ContactLanguage):
+        yield content_line(
+            "LANG", escape(_text(association.language, "iso_code")),
+            association.language_type)
+    for association in _associations(contact, models.ContactTimezone):
+        yield content_line(
+            "TZ", escape(_text(association.timezone, "timezone")),
+            association.timezone_type)
+    for association in _associations(contact,
+                                     models.ContactGeographicLocation):
+        location = association.geographic_location
+        yield content_line(
+            "GEO", "geo:%s,%s" % (location.latitude, location.longitude),
+            association.geographic_location_type)
+
+    for association in _associations(contact, models.ContactTitle):
+        yield content_line("TITLE", escape(_text(association.title, "name")))
+    for association in _associations(contact, models.ContactRole):
+        yield content_line("ROLE", escape(_text(association.role, "name")))
+    for association in _associations(contact, models.ContactOrganization):
+        components = [escape(_text(association.organization, "name"))]
+        if association.unit:
+            components.append(escape(_text(association.unit, "name")))
+        yield content_line("ORG", ";".join(components))
+    for association in _associations(contact, models.ContactLogo):
+        yield content_line("LOGO", _text(association.image_reference, "url"),
+                           association.logo_type)
+    for association in _associations(contact, models.ContactPhoto):
+        yield content_line("PHOTO", _text(association.image_reference, "url"),
+                           association.photo_type)
+
+    # ContactGroup has no rfc6350 counterpart and is not exported.
+    categories = [escape(_text(association.category, "name"))
+                  for association in
+                  _associations(contact, models.ContactCategory)]
+    if categories:
+        yield content_line("CATEGORIES", ",".join(categories))
+    for association in _associations(contact, models.ContactAnnotation):
+        yield content_line(
+            "NOTE", escape(_text(association.annotation, "annotation")))
+    for association in _associations(contact, models.RelatedContact,
+                                     "from_contact"):
+        yield content_line(
+            "RELATED", _uuid_uri(association.to_contact),
+            association.contact_relationship_type)
+    for association in _associations(contact, models.ContactUrl):
+        yield content_line("URL", _text(association.url, "address"),
+                           association.url_type)
+
+    yield content_line("REV", _timestamp(contact.update_time))
+    yield content_line("END", "VCARD")
+
+
+def export_contacts(queryset=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield vCard text, one chunk of contacts at a time."""
+    queryset = export_queryset(queryset)
+    for chunk in iter_chunks(queryset, chunk_size):
+        yield "".join(
+            line for contact in chunk for line in contact_lines(contact))
+
+
+DEFAULT_BATCH_SIZE = 500
+
+_DATE_FORMATS = ("%Y%m%d", "%Y-%m-%d")
+
+Property = collections.namedtuple("Property", "name params value")
+
+
+def unescape(value):
+    """Unescape vCard text value."""
+    chars, escaped = [], False
+    for char in value:
+        if escaped:
+            chars.append("\n" if char in "nN" else char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def split_value(value, separator=";"):
+    """Split value on unescaped separator, returning unescaped parts."""
+    parts, current, escaped = [], [], False
+    for char in value:
+        if escaped:
+            current.append("\\" + char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == separator:
+            parts.append(unescape("".join(current)))
+            current = []
+        else:
+            current.append(char)
+    parts.append(unescape("".join(current)))
+    return parts
+
+
+def _split_unquoted(text, separators):
+    """Split text on first unquoted separator, return head, sep, tail."""
+    quoted = False
+    for index, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif char in separators and not quoted:
+            return text[:index], char, text[index + 1:]
+    return text, "", ""
+
+
+def parse_line(line):
+    """Parse unfolded content line, return Property or None if invalid."""
+    head, separator, value = _split_unquoted(line, ":")
+    if not separator:
+        return None
+    name, separator, rest = _split_unquoted(head, ";")
+    # drop property group prefix
+    name = name.rsplit(".", 1)[-1].upper()
+    params = {}
+    while separator:
+        param, separator, rest = _split_unquoted(rest, ";")
+        key, _, param_value = param.partition("=")
+        values = [part.strip('"') for part in param_value.split(",")]
+        params.setdefault(key.upper(), []).extend(values)
+    return Property(name, params, value)
+
+
+def unfold(lines):
+    """Yield logical content lines from physical lines."""
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def parse_vcards(lines):
+    """Yield list of properties for each vCard in lines."""
+    card = None
+    for line in unfold(lines):
+        prop = parse_line(line)
+        if prop is None:
+            continue
+        if prop.name == "BEGIN" and prop.value.upper() == "VCARD":
+            card = []
+        elif prop.name == "END" and prop.value.upper() == "VCARD":
+            if card is not None:
+                yield card
+            card = None
+        elif card is not None:
+            card.append(prop)
+
+
+def _value_fields(model_class, field_names):
+    """Return the subset of field names which are model class values."""
+    names = []
+    for field_name in field_names:
+        try:
+            field = model_class._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            continue
+        if not field.is_relation:
+            names.append(field_name)
+    return tuple(names)
+
+
+def _parse_date(value):
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    return None
+
+
+def _parse_uid(value):
+    try:
+        return uuid.UUID(value.split(":")[-1])
+    except ValueError:
+        return None
+
+
+def _key(values, size=1):
+    """Return normalized text tuple of size values."""
+    values = [force_text(value) if value is not None else ""
+              for value in values]
+    return tuple(values[:size] + [""] * (size - len(values)))
+
+
+class ReferenceResolver(object):
+    """Map reference values to instance ids, creating missing instances.
+
+    Keys are tuples of values for each of the field names.  Existing
+    instances are looked up in bulk, missing instances are created in bulk,
+    and their ids retrieved using their uuid.
+    """
+    def __init__(self, model_class, field_names, params, owned=True):
+        self.model_class = model_class
+        self.field_names = _value_fields(model_class, field_names)
+        self._indexes = [field_names.index(field_name)
+                         for field_name in self.field_names]
+        self.params = params
+        self.owned = owned
+
+    def _values(self, key):
+        return tuple(key[index] for index in self._indexes)
+
+    def _existing(self, values):
+        ids = {}
+        manager = self.model_class.objects
+        queryset = (manager.filter(creation_user=self.params["creation_user"])
+                    if self.owned else manager.all())
+        first_values = set(value[0] for value in values)
+        for chunk in models.chunked(first_values):
+            rows = queryset.filter(
+                **{self.field_names[0] + "__in": chunk}).values_list(
+                "id", *self.field_names)
+            for row in rows:
+                value = _key(row[1:], len(self.field_names))
+                if value in values:
+                    ids.setdefault(value, row[0])
+        return ids
+
+    def resolve(self, keys):
+        """Return dict of key to instance id."""
+        keys = set(keys)
+        if not (keys and self.field_names):
+            return {}
+        values = set(self._values(key) for key in keys)
+        ids = self._existing(values)
+        missing = [value for value in values if value not in ids]
+        if missing:
+            instances = [
+                self.model_class(
+                    **dict(zip(self.field_names, value), **self.params))
+                for value in missing]
+            self.model_class.objects.bulk_create(instances)
+            ids.update(zip(
+                missing, models.uuid_ids(self.model_class, instances)))
+        return dict((key, ids[self._values(key)]) for key in keys)
+
+
+class TypeResolver(object):
+    """Map type names to type instance ids, creating missing instances.
+
+    Type tables are small, all instances are read from the type cache
+    on first use.  Names missing from the cache are queried before the
+    missing instances are created.
+    """
+    def __init__(self, model_class, params):
+        self.model_class = model_class
+        self.params = params
+        self._ids = None
+
+    def resolve(self, names):
+        """Return dict of lower case type name to type instance id."""
+        if self._ids is None:
+            self._ids = dict(
+                (instance.name.lower(), instance.pk) for instance in
+                cache.type_cache(self.model_class).instances())
+        missing = dict((name.lower(), name) for name in names
+                       if name and name.lower() not in self._ids)
+        if missing:
+            # created by another process since the cache load
+            found = dict(self.model_class.objects.annotate(
+                lower_name=Lower("name")).filter(
+                    lower_name__in=list(missing)).values_list(
+                        "lower_name", "pk"))
+            self._ids.update(found)
+            for name in found:
+                del missing[name]
+        if missing:
+            instances = [self.model_class(name=name, **self.params)
+                         for name in missing.values()]
+            self.model_class.objects.bulk_create(instances)
+            cache.invalidate(self.model_class)
+            self._ids.update(zip(missing, models.uuid_ids(
+                self.model_class, instances)))
+        return self._ids
+
+
+def _first_type(prop):
+    types = prop.params.get("TYPE")
+    return types[0] if types and types[0] else None
+
+
+class _Card(object):
+    """Values of a parsed vCard required for import."""
+    def __init__(self, properties):
+        self.uuid = None
+        self.birth_date = None
+        self.anniversary = None
+        self.formatted_names = []
+        self.names = []
+        self.nicknames = []
+        self.emails = []
+        self.phones = []
+        self.addresses = []
+        self.urls = []
+        for prop in properties:
+            self._add(prop)
+
+    def _add(self, prop):
+        name, value = prop.name, prop.value
+        if name == "UID":
+            self.uuid = _parse_uid(value)
+        elif name == "BDAY":
+            self.birth_date = _parse_date(value)
+        elif name == "ANNIVERSARY":
+            self.anniversary = _parse_date(value)
+        elif name == "FN":
+            self.formatted_names.append(_key([unescape(value)]))
+        elif name == "N":
+            self.names.append(
+                _key(split_value(value), len(_NAME_COMPONENTS)))
+        elif name == "NICKNAME":
+            self.nicknames.extend(
+                (_key([nickname]), _first_type(prop))
+                for nickname in split_value(value, ","))
+        elif name == "EMAIL":
+            self.emails.append((_key([unescape(value)]), _first_type(prop)))
+        elif name == "TEL":
+            number = unescape(value)
+            if number.lower().startswith("tel:"):
+                number = number[4:]
+            self.phones.append((_key([number]), _first_type(prop)))
+        elif name == "ADR":
+            self.addresses.append(
+                (_key(split_value(value), len(_ADDRESS_COMPONENTS)),
+                 _first_type(prop)))
+        elif name == "URL":
+            self.urls.append((_key([value]), _first_type(prop)))
+
+
+# Card attribute, association class, association reference field,
+# association type field
+_CARD_ASSOCIATIONS = (
+    ("nicknames", models.ContactNickname, "name", "nickname_type"),
+    ("emails", models.ContactEmail, "email", "email_type"),
+    ("phones", models.ContactPhone, "phone", "phone_type"),
+    ("addresses", models.ContactAddress, "address", "address_type"),
+    ("urls", models.ContactUrl, "url", "url_type"),
+)
+
+
+class Importer(object):
+    """Bulk vCard importer.
+
+    Reference instance lookups are bound to a batch, such that memory
+    usage is bound by the batch size.
+    """
+    def __init__(self, user, site=None):
+        self.params = dict(
+            creation_user=user, effective_user=user,
+            update_user=user, site=site or current_site())
+        self.references = dict(
+            formatted_names=ReferenceResolver(
+                models.FormattedName, ("name",), self.params),
+            names=ReferenceResolver(
+                models.Name, _NAME_COMPONENTS, self.params),
+            nicknames=ReferenceResolver(
+                models.Nickname, ("name",), self.params),
+            emails=ReferenceResolver(
+                models.Email, ("address",), self.params),
+            phones=ReferenceResolver(
+                models.Phone, ("number",), self.params),
+            addresses=ReferenceResolver(
+                models.Address, _ADDRESS_COMPONENTS, self.params),
+            urls=ReferenceResolver(
+                models.Url, ("address",), self.params))
+        self.types = {}
+
+    def _type_ids(self, association_class, type_field_name, names):
+        type_class = association_class._meta.get_field(
+            type_field_name).remote_field.model
+        if type_class not in self.types:
+            self.types[type_class] = TypeResolver(type_class, self.params)
+        return self.types[type_class].resolve(names)
+
+    def _new_cards(self, cards):
+        """Return cards whose uid does not match an existing contact."""
+        uuids = [card.uuid for card in cards if card.uuid]
+        existing = set()
+        for values in models.chunked(uuids):
+            existing.update(models.Contact.objects.filter(
+                uuid__in=values).values_list("uuid", flat=True))
+        new_cards, seen = [], set()
+        for card in cards:
+            if card.uuid in existing or card.uuid in seen:
+                logger.info("skipping existing contact uid %s", card.uuid)
+                continue
+            if card.uuid:
+                seen.add(card.uuid)
+            else:
+                card.uuid = uuid.uuid4()
+            if card.names or card.formatted_names:
+                new_cards.append(card)
+        return new_cards
+
+    def _resolve(self, cards, attr_name, typed=True):
+        keys = [value[0] if typed else value
+                for card in cards for value in getattr(card, attr_name)]
+        return self.references[attr_name].resolve(keys)
+
+    def _create_contacts(self, cards, name_ids, formatted_name_ids):
+        contacts = []
+        for card in cards:
+            contacts.append(models.Contact(
+                uuid=card.uuid,
+                name_id=(name_ids.get(card.names[0])
+                         if card.names else None),
+                formatted_name_id=(formatted_name_ids.get(
+                    card.formatted_names[0])
+                    if card.formatted_names else None),
+                birth_date=card.birth_date,
+                anniversary=card.anniversary,
+                **self.params))
+        return models.Contact.objects.bulk_create_with_permissions(contacts)
+
+    def _associations(self, cards, contacts, attr_name, association_class,
+                      field_name, type_field_name):
+        ids = self._resolve(cards, attr_name)
+        type_ids = self._type_ids(
+            association_class, type_field_name,
+            set(value[1] for card in cards
+                for value in getattr(card, attr_name)))
+        associations = []
+        for card, contact in zip(cards, contacts):
+            keys = set()
+            for key, type_name in getattr(card, attr_name):
+                if key not in ids:
+                    continue
+                unique_key = (ids[key], type_ids.get(
+                    type_name.lower() if type_name else None))
+                if unique_key in keys:
+                    continue
+                keys.add(unique_key)
+                associations.append(association_class(**dict({
+                    "contact_id": contact.pk,
+                    field_name + "_id": unique_key[0],
+                    type_field_name + "_id": unique_key[1]},
+                    **self.params)))
+        return associations
+
+    def _name_associations(self, cards, contacts, attr_name, ids,
+                           association_class):
+        """Return associations for names other than the contact name."""
+        associations = []
+        for card, contact in zip(cards, contacts):
+            keys = getattr(card, attr_name)
+            if not keys:
+                continue
+            name_ids = set(ids[key] for key in keys if key in ids)
+            name_ids.discard(ids.get(keys[0]))
+            associations.extend(
+                association_class(contact_id=contact.pk, name_id=name_id,
+                                  **self.params)
+                for name_id in name_ids)
+        return associations
+
+    def import_batch(self, cards):
+        """Import batch of parsed cards, return number of contacts created."""
+        cards = self._new_cards(cards)
+        if not cards:
+            return 0
+        with search.deferred_updates(), summary.deferred_updates():
+            name_ids = self._resolve(cards, "names", typed=False)
+            formatted_name_ids = self._resolve(
+                cards, "formatted_names", typed=False)
+            contacts = self._create_contacts(
+                cards, name_ids, formatted_name_ids)
+
+            associations = collections.OrderedDict()
+            associations[models.ContactName] = self._name_associations(
+                cards, contacts, "names", name_ids, models.ContactName)
+            associations[models.ContactFormattedName] = (
+                self._name_associations(
+                    cards, contacts, "formatted_names", formatted_name_ids,
+                    models.ContactFormattedName))
+            for (attr_name, association_class,
+                 field_name, type_field_name) in _CARD_ASSOCIATIONS:
+                associations[association_class] = self._associations(
+                    cards, contacts, attr_name, association_class,
+                    field_name, type_field_name)
+            for association_class, instances in associations.items():
+                association_class.objects.bulk_create(instances)
+                models.post_bulk_create.send(
+                    sender=association_class, instances=instances)
+        return len(contacts)
+
+
+def import_contacts(lines, user, batch_size=DEFAULT_BATCH_SIZE, site=None):
+    """Import vCards from lines, return number of contacts created.
+
+    Each batch of cards is imported within its own transaction.
+    """
+    importer = Importer(user, site)
+    count = 0
+    cards = (_Card(properties) for properties in parse_vcards(lines))
+    for batch in models.chunked(cards, batch_size):
+        with transaction.atomic():
+            count += importer.import_batch(batch)
+    return count
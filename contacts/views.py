@@ -6,15 +6,36 @@
 """
 from __future__ import absolute_import
 import collections
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, pre_save
+from django.http import StreamingHttpResponse
+from django.urls import get_urlconf
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
 from rest_framework.reverse import reverse
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework import permissions
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import (APIException, NotFound,
+                                       ValidationError)
 
 from django_core_utils.views import ObjectListView, ObjectDetailView
 import django_core_models.views as core_model_views
+from . import filters
+from . import graph
+from . import lookup
+from . import metrics
 from . import models
+from . import pagination
+from . import search
 from . import serializers
+from . import vcard
 
 
 class ContactRelationshipTypeMixin(object):
@@ -57,38 +78,371 @@ class ContactTypeDetail(ContactTypeMixin, ObjectDetailView):
     pass
 
 
+class ContactsListView(metrics.MetricsMixin, ObjectListView):
+    """Base class to list contact instances readable by the user."""
+    filter_backends = (filters.ContactPermissionFilter,)
+    pagination_class = pagination.ContactsPagination
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The instance version does not match If-Match."
+    default_code = "precondition_failed"
+
+
+def version_etag(instance):
+    """Return ETag of instance version."""
+    return quote_etag(str(instance.version))
+
+
+class ContactsDetailView(metrics.MetricsMixin, ObjectDetailView):
+    """Base class to retrieve, update or delete contact instance.
+
+    Responses carry the instance version as ETag.  Requests with an
+    If-Match header not matching it fail with 412 precondition failed.
+    Updates and deletes are conditional on the version read, or given by
+    If-Match, still being stored: updates are a single UPDATE ... WHERE
+    id = %s AND version = %s writing the validated data and the next
+    version, deletes lock the row of that version first.
+    """
+    instance = None
+
+    def check_if_match(self, instance):
+        if_match = self.request.META.get("HTTP_IF_MATCH")
+        if (if_match and if_match.strip() != "*" and
+                version_etag(instance) not in parse_etags(if_match)):
+            raise PreconditionFailed()
+
+    def check_version(self, instance):
+        """Lock instance row if its stored version is the version read.
+
+        Raise PreconditionFailed if no row matches.
+        """
+        if not list(type(instance).objects.select_for_update().filter(
+                pk=instance.pk, version=instance.version).values_list("pk")):
+            raise PreconditionFailed()
+
+    def save_version(self, instance, many_to_many):
+        """Save instance with one conditional UPDATE, bumping its version.
+
+        The UPDATE only matches the row of the version read; raise
+        PreconditionFailed if no row matches.  The pre_save and post_save
+        signals are sent as Model.save does.
+        """
+        model_class = type(instance)
+        using = router.db_for_write(model_class, instance=instance)
+        instance.update_time = timezone.now()
+        instance.update_user = self.request.user
+        pre_save.send(sender=model_class, instance=instance, raw=False,
+                      using=using, update_fields=None)
+        values = dict((field.attname, getattr(instance, field.attname))
+                      for field in model_class._meta.concrete_fields
+                      if not field.primary_key)
+        values["version"] = F("version") + 1
+        if not model_class.objects.using(using).filter(
+                pk=instance.pk, version=instance.version).update(**values):
+            raise PreconditionFailed()
+        instance.version += 1
+        for name, value in many_to_many.items():
+            getattr(instance, name).set(value)
+        post_save.send(sender=model_class, instance=instance, created=False,
+                       raw=False, using=using, update_fields=None)
+
+    def get_object(self):
+        instance = super(ContactsDetailView, self).get_object()
+        self.check_if_match(instance)
+        self.instance = instance
+        return instance
+
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        meta = type(instance)._meta
+        many_to_many = {}
+        for name, value in serializer.validated_data.items():
+            if meta.get_field(name).many_to_many:
+                many_to_many[name] = value
+            else:
+                setattr(instance, name, value)
+        with transaction.atomic():
+            self.save_version(instance, many_to_many)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            self.check_version(instance)
+            super(ContactsDetailView, self).perform_destroy(instance)
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super(ContactsDetailView, self).retrieve(
+            request, *args, **kwargs)
+        response["ETag"] = version_etag(self.instance)
+        return response
+
+    def update(self, request, *args, **kwargs):
+        response = super(ContactsDetailView, self).update(
+            request, *args, **kwargs)
+        response["ETag"] = version_etag(self.instance)
+        return response
+
+
 class ContactMixin(object):
     """Contact mixin class."""
     queryset = models.Contact.objects.all()
     serializer_class = serializers.ContactSerializer
 
 
-class ContactList(ContactMixin, ObjectListView):
+class ContactList(ContactMixin, ContactsListView):
     """Class to list all Contact instances,
     or create new Contact instance."""
-    pass
+    queryset = models.Contact.objects.with_list_related()
 
 
-class ContactDetail(ContactMixin, ObjectDetailView):
+class ContactDetail(ContactMixin, ContactsDetailView):
     """
     Class to retrieve, update or delete Contact instance.
     """
     pass
 
 
+class ContactFullDetail(metrics.MetricsMixin, generics.RetrieveAPIView):
+    """
+    Class to retrieve Contact instance including all its associations.
+    """
+    queryset = models.Contact.objects.with_associations()
+    serializer_class = serializers.ContactFullSerializer
+    filter_backends = ContactsListView.filter_backends
+
+
+class ContactVCardList(ContactMixin, generics.GenericAPIView):
+    """
+    Class to export Contact instances in vCard format.
+
+    The response is streamed, one chunk of contacts at a time.
+    """
+    filter_backends = ContactsListView.filter_backends
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            vcard.export_contacts(queryset),
+            content_type=vcard.VCARD_CONTENT_TYPE)
+        response["Content-Disposition"] = (
+            'attachment; filename="contacts.%s"' % vcard.VCARD_FILE_EXTENSION)
+        return response
+
+
+class ContactSearchList(ContactMixin, metrics.MetricsMixin,
+                        generics.ListAPIView):
+    """
+    Class to list Contact instances matching the 'q' search text.
+
+    Names, formatted names, nicknames, emails, phones and organizations
+    are searched, see search.search_contacts.
+    """
+    search_query_param = "q"
+    filter_backends = ContactsListView.filter_backends
+    pagination_class = ContactsListView.pagination_class
+
+    def get_queryset(self):
+        text = self.request.query_params.get(self.search_query_param, "")
+        return search.search_contacts(
+            text, super(ContactSearchList, self).get_queryset())
+
+
+class ContactSummaryList(metrics.MetricsMixin, generics.ListAPIView):
+    """
+    Class to list ContactSummary instances, one per contact.
+
+    Summaries are listed from a single table, see summary module.
+    """
+    queryset = models.ContactSummary.objects.all()
+    serializer_class = serializers.ContactSummarySerializer
+    filter_backends = ContactsListView.filter_backends
+    pagination_class = ContactsListView.pagination_class
+
+
+class ContactLookupView(ContactMixin, metrics.MetricsMixin,
+                        generics.GenericAPIView):
+    """
+    Class to look up the ids of contacts with a phone number or email.
+
+    The 'phone' and 'email' query parameters are normalized as the
+    lookup values are, see lookup module.
+    """
+    filter_backends = ContactsListView.filter_backends
+
+    def get(self, request, *args, **kwargs):
+        contact_ids = lookup.lookup_contact_ids(
+            phone=request.query_params.get("phone"),
+            email=request.query_params.get("email"))
+        if contact_ids is None:
+            raise ValidationError(
+                {"detail": "A phone or email query parameter is required."})
+        queryset = self.filter_queryset(
+            self.get_queryset().filter(pk__in=contact_ids))
+        return Response(dict(
+            contacts=list(queryset.order_by("id").values_list(
+                "id", flat=True))))
+
+
+class ContactGraphView(ContactMixin, metrics.MetricsMixin,
+                       generics.GenericAPIView):
+    """
+    Base class to traverse the RelatedContact graph from a contact.
+
+    The 'types' query parameter restricts the traversal to the comma
+    separated relationship type ids, see graph module.  Contacts not
+    readable by the user are neither returned nor traversed.
+    """
+    filter_backends = ContactsListView.filter_backends
+
+    def int_param(self, name, default, maximum):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            value = 0
+        if not 0 < value <= maximum:
+            raise ValidationError({name: "An integer between 1 and %d "
+                                         "is required." % maximum})
+        return value
+
+    def type_ids(self):
+        value = self.request.query_params.get("types")
+        if not value:
+            return None
+        try:
+            return [int(type_id) for type_id in value.split(",")]
+        except ValueError:
+            raise ValidationError(
+                {"types": "Comma separated integers are required."})
+
+    def direction(self, default):
+        value = self.request.query_params.get("direction", default)
+        if value not in graph.DIRECTIONS:
+            raise ValidationError({"direction": "One of %s is required." % (
+                ", ".join(graph.DIRECTIONS))})
+        return value
+
+    def readable_ids(self, contact_ids):
+        """Return set of contact ids readable by the user."""
+        readable = set()
+        for chunk in models.chunked(contact_ids):
+            readable.update(self.filter_queryset(
+                self.get_queryset().filter(pk__in=chunk)).values_list(
+                    "id", flat=True))
+        return readable
+
+    def readable(self):
+        """Return readable_ids, None if the user reads all contacts."""
+        if any(backend().restricts(self.request)
+               for backend in self.filter_backends):
+            return self.readable_ids
+        return None
+
+
+class ContactNeighborList(ContactGraphView):
+    """
+    Class to list contacts within 'depth' hops of a contact.
+
+    Edges are followed in 'direction', one of out, in or both.
+    """
+
+    def get(self, request, *args, **kwargs):
+        contact = self.get_object()
+        nodes = graph.neighborhood(
+            contact.pk,
+            depth=self.int_param(
+                "depth", graph.DEFAULT_DEPTH, graph.MAX_DEPTH),
+            direction=self.direction(graph.DIRECTION_BOTH),
+            type_ids=self.type_ids(), readable=self.readable())
+        return Response(dict(
+            contacts=[dict(id=contact_id, depth=depth)
+                      for contact_id, depth in nodes.contacts],
+            truncated=nodes.truncated))
+
+
+class ContactPathDetail(ContactGraphView):
+    """
+    Class to retrieve the shortest path between two contacts.
+
+    Edges are followed in 'direction', one of out, in or both, for at
+    most 'depth' hops.  Paths only go through contacts readable by the
+    user.
+    """
+
+    def get(self, request, *args, **kwargs):
+        contact = self.get_object()
+        target = generics.get_object_or_404(
+            self.filter_queryset(self.get_queryset()),
+            pk=self.kwargs["to_pk"])
+        path = graph.shortest_path(
+            contact.pk, target.pk,
+            max_depth=self.int_param(
+                "depth", graph.MAX_DEPTH, graph.MAX_DEPTH),
+            direction=self.direction(graph.DIRECTION_OUT),
+            type_ids=self.type_ids(), readable=self.readable())
+        if path is None:
+            raise NotFound("No path between the contacts.")
+        return Response(dict(path=path))
+
+
+class ContactComponentList(ContactGraphView):
+    """
+    Class to list the contacts connected to a contact.
+
+    Edges are followed in both directions.
+    """
+
+    def get(self, request, *args, **kwargs):
+        contact = self.get_object()
+        nodes = graph.component(contact.pk, type_ids=self.type_ids(),
+                                readable=self.readable())
+        return Response(dict(contacts=nodes.contacts,
+                             truncated=nodes.truncated))
+
+
+class ContactChangeList(metrics.MetricsMixin, generics.GenericAPIView):
+    """
+    Class to list contact and contact association changes.
+
+    Changes are listed in change order, including deleted instance
+    tombstones, see pagination.ChangePagination and
+    filters.ContactChangeFilter.
+    """
+    queryset = models.ContactChange.objects.all()
+    serializer_class = serializers.ContactChangeSerializer
+    filter_backends = (filters.ContactChangeFilter,)
+    pagination_class = pagination.ChangePagination
+    instances = {}
+
+    def get(self, request, *args, **kwargs):
+        page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset()))
+        self.instances = models.changed_instances(page)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def get_serializer_context(self):
+        context = super(ContactChangeList, self).get_serializer_context()
+        context["instances"] = self.instances
+        return context
+
+
 class ContactAddressMixin(object):
     """ContactAddress mixin class."""
     queryset = models.ContactAddress.objects.all()
     serializer_class = serializers.ContactAddressSerializer
 
 
-class ContactAddressList(ContactAddressMixin, ObjectListView):
+class ContactAddressList(ContactAddressMixin, ContactsListView):
     """Class to list all ContactAddress instances,
     or create new ContactAddress instance."""
     pass
 
 
-class ContactAddressDetail(ContactAddressMixin, ObjectDetailView):
+class ContactAddressDetail(ContactAddressMixin, ContactsDetailView):
     """
     Class to retrieve, update or delete ContactAddress instance.
     """
@@ -101,13 +455,13 @@ class ContactAnnotationMixin(object):
     serializer_class = serializers.ContactAnnotationSerializer
 
 
-class ContactAnnotationList(ContactAnnotationMixin, ObjectListView):
+class ContactAnnotationList(ContactAnnotationMixin, ContactsListView):
     """Class to list all ContactAnnotation instances,
     or create new ContactAnnotation instance."""
     pass
 
 
-class ContactAnnotationDetail(ContactAnnotationMixin, ObjectDetailView):
+class ContactAnnotationDetail(ContactAnnotationMixin, ContactsDetailView):
     """
     Class to retrieve, update or delete ContactAnnotation instance.
     """
@@ -120,13 +474,13 @@ class ContactCategoryMixin(object):
     serializer_class = serializers.ContactCategorySerializer
 
 
-class ContactCategoryList(ContactCategoryMixin, ObjectListView):
+class ContactCategoryList(ContactCategoryMixin, ContactsListView):
     """Class to list all ContactCategory instances,
     or create new ContactCategory instance."""
     pass
 
 
-class ContactCategoryDetail(ContactCategoryMixin, ObjectDetailView):
+class ContactCategoryDetail(ContactCategoryMixin, ContactsDetailView):
     """
     Class to retrieve, update or delete ContactCategory instance.
     """
@@ -139,13 +493,13 @@ class ContactEmailMixin(object):
     serializer_class = serializers.ContactEmailSerializer
 
 
-class ContactEmailList(ContactEmailMixin, ObjectListView):
+class ContactEmailList(ContactEmailMixin, ContactsListView):
     """Class to list all ContactEmail instances,
     or create new ContactEmail instance."""
     pass
 
 
-class ContactEmailDetail(ContactEmailMixin, ObjectDetailView):
+class ContactEmailDetail(ContactEmailMixin, ContactsDetailView):
     """
     Class to retrieve, update or delete ContactEmail instance.
     """
@@ -158,13 +512,14 @@ class ContactFormattedNameMixin(object):
     serializer_class = serializers.ContactFormattedNameSerializer
 
 
-class ContactFormattedNameList(ContactFormattedNameMixin, ObjectListView):
+class ContactFormattedNameList(ContactFormattedNameMixin, ContactsListView):
     """Class to list all ContactFormattedName instances,
     or create new ContactFormattedName instance."""
     pass
 
 
-class ContactFormattedNameDetail(ContactFormattedNameMixin, ObjectDetailView):
+class ContactFormattedNameDetail(ContactFormattedNameMixin,
+                                 ContactsDetailView):
     """
     Class to retrieve, update or delete ContactFormattedName instance.
     """
@@ -178,14 +533,14 @@ class ContactGeographicLocationMixin(object):
 
 
 class ContactGeographicLocationList(ContactGeographicLocationMixin,
-                                    ObjectListView):
+                                    ContactsListView):
     """Class to list all ContactGeographicLocation instances,
     or create new ContactGeographicLocation instance."""
     pass
 
 
 class ContactGeographicLocationDetail(ContactGeographicLocationMixin,
-                                      ObjectDetailView):
+                                      ContactsDetailView):
     """
     Class to retrieve, update or delete ContactGeographicLocation instance.
     """
@@ -198,13 +553,13 @@ class ContactGroupMixin(object):
     serializer_class = serializers.ContactGroupSerializer
 
 
-class ContactGroupList(ContactGroupMixin, ObjectListView):
+class ContactGroupList(ContactGroupMixin, ContactsListView):
     """Class to list all ContactGroup instances,
     or create new ContactGroup instance."""
     pass
 
 
-class ContactGroupDetail(ContactGroupMixin, ObjectDetailView):
+class ContactGroupDetail(ContactGroupMixin, ContactsDetailView):
     """
     Class to retrieve, update or delete ContactGroup instance.
     """
@@ -217,13 +572,13 @@ class ContactLogoMixin(object):
     serializer_class = serializers.ContactLogoSerializer
 
 
-class ContactLogoList(ContactLogoMixin, ObjectListView):
+class ContactLogoList(ContactLogoMixin, ContactsListView):
     """Class to list all ContactLogo instances,
     or create new ContactLogo instance."""
     pass
 
 
-class ContactLogoDetail(ContactLogoMixin, ObjectDetailView):
+class ContactLogoDetail(ContactLogoMixin, ContactsDetailView):
     """
     Class to retrieve, update or delete ContactLogo instance.
     """
@@ -236,13 +591,13 @@ class ContactPhotoMixin(object):
     serializer_class = serializers.ContactPhotoSerializer
 
 
-class ContactPhotoList(ContactPhotoMixin, ObjectListView):
+class ContactPhotoList(ContactPhotoMixin, ContactsListView):
     """Class to list all ContactPhoto instances,
     or create new ContactPhoto instance."""
     pass
 
 
-class ContactPhotoDetail(ContactPhotoMixin, ObjectDetailView):
+class ContactPhotoDetail(ContactPhotoMixin, ContactsDetailView):
     """
     Class to retrieve, update or delete ContactPhoto instance.
     """
@@ -256,14 +611,14 @@ class ContactInstantMessagingMixin(object):
 
 
 class ContactInstantMessagingList(ContactInstantMessagingMixin,
-                                  ObjectListView):
+                                  ContactsListView):
     """Class to list all ContactInstantMessaging instances,
     or create new ContactInstantMessaging instance."""
     pass
 
 
 class ContactInstantMessagingDetail(ContactInstantMessagingMixin,
-                                    ObjectDetailView):
+                                    ContactsDetailView):
     """
     Class to retrieve, update or delete ContactInstantMessaging instance.
     """
@@ -277,14 +632,14 @@ class ContactLanguageMixin(object):
 
 
 class ContactLanguageList(ContactLanguageMixin,
-                          ObjectListView):
+                          ContactsListView):
     """Class to list all ContactLanguageinstances,
     or create new ContactLanguage instance."""
     pass
 
 
 class ContactLanguageDetail(ContactLanguageMixin,
-                            ObjectDetailView):
+                            ContactsDetailView):
     """
     Class to retrieve, update or delete ContactLanguage instance.
     """
@@ -298,14 +653,14 @@ class ContactNameMixin(object):
 
 
 class ContactNameList(ContactNameMixin,
-                      ObjectListView):
+                      ContactsListView):
     """Class to list all ContactNameinstances,
     or create new ContactName instance."""
     pass
 
 
 class ContactNameDetail(ContactNameMixin,
-                        ObjectDetailView):
+                        ContactsDetailView):
     """
     Class to retrieve, update or delete ContactName instance.
     """
@@ -319,14 +674,14 @@ class ContactNicknameMixin(object):
 
 
 class ContactNicknameList(ContactNicknameMixin,
-                          ObjectListView):
+                          ContactsListView):
     """Class to list all ContactNickname instances,
     or create new ContactNickname instance."""
     pass
 
 
 class ContactNicknameDetail(ContactNicknameMixin,
-                            ObjectDetailView):
+                            ContactsDetailView):
     """
     Class to retrieve, update or delete ContactNickname instance.
     """
@@ -340,14 +695,14 @@ class ContactOrganizationMixin(object):
 
 
 class ContactOrganizationList(ContactOrganizationMixin,
-                              ObjectListView):
+                              ContactsListView):
     """Class to list all ContactOrganization instances,
     or create new ContactOrganization instance."""
     pass
 
 
 class ContactOrganizationDetail(ContactOrganizationMixin,
-                                ObjectDetailView):
+                                ContactsDetailView):
     """
     Class to retrieve, update or delete ContactOrganization instance.
     """
@@ -361,14 +716,14 @@ class ContactPhoneMixin(object):
 
 
 class ContactPhoneList(ContactPhoneMixin,
-                       ObjectListView):
+                       ContactsListView):
     """Class to list all ContactPhone instances,
     or create new ContactPhone instance."""
     pass
 
 
 class ContactPhoneDetail(ContactPhoneMixin,
-                         ObjectDetailView):
+                         ContactsDetailView):
     """
     Class to retrieve, update or delete ContactPhone instance.
     """
@@ -382,14 +737,14 @@ class ContactRoleMixin(object):
 
 
 class ContactRoleList(ContactRoleMixin,
-                      ObjectListView):
+                      ContactsListView):
     """Class to list all ContactRole instances,
     or create new ContactRole instance."""
     pass
 
 
 class ContactRoleDetail(ContactRoleMixin,
-                        ObjectDetailView):
+                        ContactsDetailView):
     """
     Class to retrieve, update or delete ContactRole instance.
     """
@@ -403,14 +758,14 @@ class ContactTimezoneMixin(object):
 
 
 class ContactTimezoneList(ContactTimezoneMixin,
-                          ObjectListView):
+                          ContactsListView):
     """Class to list all ContactTimezone instances,
     or create new ContactRole instance."""
     pass
 
 
 class ContactTimezoneDetail(ContactTimezoneMixin,
-                            ObjectDetailView):
+                            ContactsDetailView):
     """
     Class to retrieve, update or delete ContactTimezone instance.
     """
@@ -424,14 +779,14 @@ class ContactTitleMixin(object):
 
 
 class ContactTitleList(ContactTitleMixin,
-                       ObjectListView):
+                       ContactsListView):
     """Class to list all ContactTitle instances,
     or create new ContactTitle instance."""
     pass
 
 
 class ContactTitleDetail(ContactTitleMixin,
-                         ObjectDetailView):
+                         ContactsDetailView):
     """
     Class to retrieve, update or delete ContactTitle instance.
     """
@@ -445,14 +800,14 @@ class ContactUrlMixin(object):
 
 
 class ContactUrlList(ContactUrlMixin,
-                     ObjectListView):
+                     ContactsListView):
     """Class to list all ContactUrl instances,
     or create new ContactUrl instance."""
     pass
 
 
 class ContactUrlDetail(ContactUrlMixin,
-                       ObjectDetailView):
+                       ContactsDetailView):
     """
     Class to retrieve, update or delete ContactUrl instance.
     """
@@ -466,14 +821,14 @@ class RelatedContactMixin(object):
 
 
 class RelatedContactList(RelatedContactMixin,
-                         ObjectListView):
+                         ContactsListView):
     """Class to list all RelatedContact instances,
     or create new ContactUrl instance."""
     pass
 
 
 class RelatedContactDetail(RelatedContactMixin,
-                           ObjectDetailView):
+                           ContactsDetailView):
     """
     Class to retrieve, update or delete RelatedContact instance.
     """
@@ -495,6 +850,22 @@ def contacts_urls(request, content_format):
             'contact-annotation-list',
             request=request,
             format=content_format),
+        'contact-search': reverse(
+            'contact-search-list',
+            request=request,
+            format=content_format),
+        'contact-summaries': reverse(
+            'contact-summary-list',
+            request=request,
+            format=content_format),
+        'contact-lookup': reverse(
+            'contact-lookup',
+            request=request,
+            format=content_format),
+        'contact-changes': reverse(
+            'contact-change-list',
+            request=request,
+            format=content_format),
         'contact-categories': reverse(
             'contact-category-list',
             request=request,
@@ -578,19 +949,85 @@ def contacts_urls(request, content_format):
     }
 
 
-@api_view(['GET'])
-@permission_classes((permissions.AllowAny,))
-def api_root(request, content_format=None):
+API_ROOT_URL_FUNCTIONS = (
+    core_model_views.core_urls,
+    core_model_views.demographics_urls,
+    core_model_views.images_urls,
+    core_model_views.locations_urls,
+    core_model_views.organizations_urls,
+    core_model_views.social_media_urls,
+    core_model_views.root_urls,
+    contacts_urls)
+
+# Bound of the api root end points cache, cleared when reached.
+API_ROOT_CACHE_SIZE = 64
+
+_api_root_cache = {}
+_api_root_cache_lock = threading.Lock()
+
+
+def _api_root_end_points(request, content_format):
+    """Return api root end points and their ETag.
+
+    End point urls are relative paths without request.
+    """
     end_points = {}
-    base_url_functions = (
-        core_model_views.core_urls,
-        core_model_views.demographics_urls,
-        core_model_views.images_urls,
-        core_model_views.locations_urls,
-        core_model_views.organizations_urls,
-        core_model_views.social_media_urls,
-        core_model_views.root_urls)
-    contacts_url_functions = (contacts_urls, )
-    for url_function in base_url_functions + contacts_url_functions:
+    for url_function in API_ROOT_URL_FUNCTIONS:
         end_points.update(url_function(request, content_format))
-    return Response(collections.OrderedDict(sorted(end_points.items())))
+    end_points = collections.OrderedDict(sorted(end_points.items()))
+    etag = quote_etag(hashlib.md5(
+        json.dumps(end_points).encode("utf-8")).hexdigest())
+    return end_points, etag
+
+
+def api_root_end_points(request, content_format=None, relative=False):
+    """Return cached api root end points and their ETag.
+
+    The end points are computed once per url configuration, host, scheme
+    and format.
+    """
+    key = (settings.ROOT_URLCONF, get_urlconf(), content_format)
+    if not relative:
+        key += (request.get_host(), request.scheme)
+    try:
+        return _api_root_cache[key]
+    except KeyError:
+        pass
+    value = _api_root_end_points(
+        None if relative else request, content_format)
+    with _api_root_cache_lock:
+        if len(_api_root_cache) >= API_ROOT_CACHE_SIZE:
+            _api_root_cache.clear()
+        _api_root_cache[key] = value
+    return value
+
+
+def clear_api_root_cache():
+    """Clear the cached api root end points."""
+    with _api_root_cache_lock:
+        _api_root_cache.clear()
+
+
+@api_view(['GET'])
+@permission_classes((permissions.AllowAny,))
+def api_root(request, content_format=None, **kwargs):
+    """Return the api end points.
+
+    With the relative query parameter set, the end points are paths
+    without scheme and host.  Responds not modified to a request with
+    If-None-Match matching the end points ETag.
+    """
+    content_format = content_format or kwargs.get("format")
+    relative = request.query_params.get("relative", "").lower() in (
+        "1", "true", "yes")
+    end_points, etag = api_root_end_points(
+        request, content_format, relative)
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match and (
+            if_none_match.strip() == "*" or
+            etag in parse_etags(if_none_match)):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(end_points)
+    response["ETag"] = etag
+    return response
@@ -39,7 +39,8 @@ setup(
         'Programming Language :: Python :: 3.7',
         'Topic :: Software Development :: Libraries :: Python Modules'
     ],
-    packages=find_packages(exclude=['contrib', 'docs', 'tests']),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*',
+                                    'contrib', 'docs', 'tests']),
     install_requires=[
         'python-core-utils',
         'django-core-utils',